@@ -0,0 +1,35 @@
+import numpy as np
+
+SAMPLE_RATE = 16000
+
+
+def synthetic_speech(duration_s: float, seed: int = 0) -> np.ndarray:
+    """
+    Generates speech-like test audio without needing recordings: bursts of
+    syllable-rate modulated harmonic noise separated by pauses of room-noise level.
+
+    Returns:
+        np.ndarray: Float32 mono audio at 16kHz.
+    """
+    rng = np.random.default_rng(seed)
+    total_samples = int(duration_s * SAMPLE_RATE)
+    audio = (rng.standard_normal(total_samples) * 0.002).astype(np.float32)
+
+    position = int(rng.uniform(0.2, 1.0) * SAMPLE_RATE)
+    while position < total_samples:
+        burst_samples = min(int(rng.uniform(1.0, 4.0) * SAMPLE_RATE), total_samples - position)
+        t = np.arange(burst_samples) / SAMPLE_RATE
+        pitch = rng.uniform(100, 220)
+        voiced = sum(np.sin(2 * np.pi * pitch * harmonic * t) / harmonic for harmonic in range(1, 6))
+        syllables = 0.5 * (1 + np.sin(2 * np.pi * rng.uniform(3, 6) * t))
+        noise = rng.standard_normal(burst_samples) * 0.05
+        audio[position : position + burst_samples] += (0.2 * voiced * syllables + noise).astype(np.float32)
+        position += burst_samples + int(rng.uniform(0.6, 2.0) * SAMPLE_RATE)
+
+    return np.clip(audio, -1.0, 1.0)
+
+
+def iter_chunks(audio: np.ndarray, chunk_samples: int):
+    """Yields the audio as raw Float32 PCM byte chunks, like the browser client sends them."""
+    for start in range(0, len(audio), chunk_samples):
+        yield audio[start : start + chunk_samples].tobytes()
@@ -0,0 +1,93 @@
+"""
+Compares the CPU acceleration modes of `TranslatorEngine` (float32, dynamic int8,
+bfloat16, torch.compile): load time, resident memory, serialized weight size and
+translation latency, with speedup and memory reduction relative to float32.
+
+Each mode runs in a fresh process so that memory numbers don't include the
+previous mode. Requires the SeamlessM4T model (downloaded on first use).
+
+Usage (from the project root):
+    python -m benchmarks.bench_cpu_modes --modes float32 int8 bfloat16 int8+compile --seconds 4 --runs 3
+"""
+
+import argparse
+import io
+import json
+import multiprocessing
+import resource
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import torch
+
+from benchmarks.audio_fixtures import synthetic_speech
+
+MODES = {
+    "float32": {},
+    "int8": {"quantization": "int8"},
+    "bfloat16": {"bfloat16": True},
+    "compile": {"compile": True},
+    "int8+compile": {"quantization": "int8", "compile": True},
+}
+
+
+def measure_mode(mode: str, seconds: float, runs: int, threads: int) -> dict:
+    """Runs in a child process: loads the engine in `mode` and times translations."""
+    from src.core.config import config
+    from src.core.device_manager import DeviceManager
+    from src.core.translator_engine import TranslatorEngine
+
+    if threads:
+        torch.set_num_threads(threads)
+    config.setdefault("models", {}).setdefault("translation", {})["cpu_acceleration"] = {
+        **MODES[mode],
+        "self_check": True,
+    }
+
+    started = time.perf_counter()
+    engine = TranslatorEngine(DeviceManager())
+    load_s = time.perf_counter() - started
+    weights = io.BytesIO()
+    torch.save(engine.model.state_dict(), weights)
+
+    audio = synthetic_speech(seconds, seed=1)
+    engine.translate(audio)  # First call pays for lazy initialization and compilation
+    latencies = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        engine.translate(audio)
+        latencies.append(time.perf_counter() - started)
+
+    return {
+        "mode": mode,
+        "load_s": round(load_s, 2),
+        "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "weights_mb": round(weights.tell() / 2**20, 1),
+        "latency_s": round(min(latencies), 3),
+        "real_time_factor": round(min(latencies) / seconds, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modes", nargs="+", choices=list(MODES), default=["float32", "int8", "bfloat16"])
+    parser.add_argument("--seconds", type=float, default=4.0, help="Duration of the translated input.")
+    parser.add_argument("--runs", type=int, default=3, help="Timed translations per mode (the best one counts).")
+    parser.add_argument("--threads", type=int, default=0, help="torch threads (0 keeps the default).")
+    args = parser.parse_args()
+
+    baseline = None
+    for mode in args.modes:
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+            result = pool.submit(measure_mode, mode, args.seconds, args.runs, args.threads).result()
+        if mode == "float32":
+            baseline = result
+        if baseline is not None:
+            result["speedup"] = round(baseline["latency_s"] / result["latency_s"], 2)
+            result["memory_reduction"] = round(1 - result["max_rss_mb"] / baseline["max_rss_mb"], 3)
+            result["weights_reduction"] = round(1 - result["weights_mb"] / baseline["weights_mb"], 3)
+        print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Measures event-loop lag while N simulated clients stream audio at real-time pace,
+with VAD run inline in the client coroutine (previous behaviour) vs. in the
+`VADEngine` worker thread.
+
+Usage (from the project root):
+    python -m benchmarks.bench_event_loop_lag --clients 10 50 --seconds 10
+"""
+
+import argparse
+import asyncio
+import json
+
+from benchmarks.audio_fixtures import SAMPLE_RATE, iter_chunks, synthetic_speech
+from src.core.loop_monitor import EventLoopMonitor
+from src.core.vad_engine import VADEngine
+from src.core.vad_processor import SileroVADModel, VADProcessor
+
+
+async def stream_client(chunks, chunk_seconds, handle_chunk):
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    for index, chunk_bytes in enumerate(chunks):
+        # Pace like a microphone: chunk i is available at start + i * chunk duration
+        await asyncio.sleep(max(0.0, start + index * chunk_seconds - loop.time()))
+        await handle_chunk(chunk_bytes)
+
+
+async def run_mode(mode, model, client_count, seconds, chunk_samples):
+    monitor = EventLoopMonitor(interval_ms=10)
+    monitor.start()
+    engine = VADEngine(model)
+    sessions = [VADProcessor(model) for _ in range(client_count)]
+    sentences = []
+
+    def make_handler(session):
+        async def inline(chunk_bytes):
+            sentence_audio = session.process(chunk_bytes)
+            if sentence_audio is not None:
+                sentences.append(sentence_audio)
+
+        async def worker(chunk_bytes):
+            await engine.submit(session, chunk_bytes)
+
+        return inline if mode == "inline" else worker
+
+    for session in sessions:
+        engine.register(session, sentences.append)
+
+    chunk_seconds = chunk_samples / SAMPLE_RATE
+    await asyncio.gather(
+        *(
+            stream_client(
+                list(iter_chunks(synthetic_speech(seconds, seed=index), chunk_samples)), chunk_seconds, handler
+            )
+            for index, handler in enumerate(make_handler(session) for session in sessions)
+        )
+    )
+    for session in sessions:
+        await engine.unregister(session)
+    engine.close()
+    await monitor.stop()
+    return {"mode": mode, "clients": client_count, "sentences": len(sentences), **monitor.snapshot()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, nargs="+", default=[10, 50])
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--chunk-samples", type=int, default=1365, help="Samples per client message (~85 ms).")
+    args = parser.parse_args()
+
+    model = SileroVADModel()
+    for client_count in args.clients:
+        for mode in ("inline", "worker"):
+            result = asyncio.run(run_mode(mode, model, client_count, args.seconds, args.chunk_samples))
+            print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
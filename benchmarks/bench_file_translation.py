@@ -0,0 +1,111 @@
+"""
+Translates a long synthetic recording with `FileTranslationJob` (the engine behind
+`POST /translate/file` and `python -m src.translate_file`) and reports its speed as a
+multiple of real time and the process's peak memory. Running it for several durations
+shows that memory does not grow with the length of the file.
+
+`--translator stub` (the default) uses `StubTranslator`; `--workers N` runs it in N
+worker processes, like `models.translation.workers`.
+
+Usage (from the project root):
+    python -m benchmarks.bench_file_translation --minutes 5 30 --workers 0 4
+"""
+
+import argparse
+import asyncio
+import functools
+import json
+import logging
+import os
+import resource
+import tempfile
+import time
+from contextlib import aclosing
+
+import soundfile as sf
+
+from benchmarks.audio_fixtures import SAMPLE_RATE, synthetic_speech
+from benchmarks.stub_translator import StubTranslator
+from src.core.file_translation import FileSegmenter, FileTranslationJob, SpeechTimeline
+from src.core.inference_scheduler import InferenceScheduler
+from src.core.vad_processor import SileroVADModel
+
+
+def write_recording(path: str, minutes: float):
+    """Writes the synthetic recording minute by minute, so the benchmark itself stays small."""
+    with sf.SoundFile(path, "w", SAMPLE_RATE, 1, "PCM_16") as recording:
+        for minute in range(int(minutes)):
+            recording.write(synthetic_speech(60.0, seed=minute))
+
+
+def create_translator(args, workers: int):
+    if workers:
+        from src.core.inference_workers import InferenceWorkerPool, engine_factory
+
+        factory = engine_factory
+        if args.translator == "stub":
+            factory = functools.partial(StubTranslator, real_time_factor=args.stub_rtf)
+        pool = InferenceWorkerPool(workers, factory=factory)
+        pool.start()
+        return pool
+    if args.translator == "stub":
+        return StubTranslator(real_time_factor=args.stub_rtf)
+    from src.core.device_manager import DeviceManager
+    from src.core.translator_engine import TranslatorEngine
+
+    return TranslatorEngine(DeviceManager())
+
+
+async def run(path: str, translator, model: SileroVADModel, speech: bool) -> dict:
+    scheduler = InferenceScheduler(translator)
+    scheduler.start()
+    job = FileTranslationJob(FileSegmenter(path, model), scheduler, "eng", speech)
+    timeline = SpeechTimeline()
+    output_samples = 0
+    async with aclosing(job.results()) as results:
+        async for result in results:
+            # Consume the speech like the endpoint does, without keeping it
+            output_samples += sum(len(piece) for piece in timeline.place(result))
+    await scheduler.stop()
+    return {**job.snapshot(), "output_s": round(output_samples / SAMPLE_RATE, 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=float, nargs="+", default=[5])
+    parser.add_argument("--workers", type=int, nargs="+", default=[0])
+    parser.add_argument("--translator", choices=["stub", "seamless"], default="stub")
+    parser.add_argument("--stub-rtf", type=float, default=0.2, help="Simulated real-time factor of the stub.")
+    parser.add_argument("--output", choices=["text", "wav"], default="wav")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    model = SileroVADModel()
+    for workers in args.workers:
+        translator = create_translator(args, workers)
+        for minutes in args.minutes:
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, "recording.wav")
+                write_recording(path, minutes)
+                started = time.perf_counter()
+                result = asyncio.run(run(path, translator, model, speech=args.output == "wav"))
+            result = {
+                "translator": args.translator,
+                "workers": workers,
+                "output": args.output,
+                "minutes": minutes,
+                "wall_s": round(time.perf_counter() - started, 2),
+                "speed_x_real_time": result["speed"],
+                "segments": result["segments"],
+                "failed_segments": result["failed_segments"],
+                "output_s": result["output_s"],
+                # Peak of the whole process so far (ru_maxrss is in kB on Linux)
+                "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+            }
+            print(json.dumps(result))
+        if workers:
+            translator.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,434 @@
+"""
+Replays recorded or synthetic audio through the full pipeline (VAD, batching
+scheduler, translator) with N concurrent clients streaming at real-time pace,
+either in-process (`VADEngine` + `InferenceScheduler`) or over `/ws/translate`.
+
+Latencies are measured per utterance from the moment the client has sent the
+audio that completes the sentence (found by a reference VAD pass over the same
+audio) to the first speech byte (`ttfb`) and to the complete reply (`e2e`).
+`real_time_factor` is translator busy time divided by the replayed audio
+duration (not available against an external `--url`).
+
+`--translator stub` (the default) replaces SeamlessM4T with `StubTranslator`,
+so the suite runs on a CPU-only machine without downloading the model. Without
+`--url`, the websocket mode serves the app in-process on a free local port.
+
+Usage (from the project root):
+    python -m benchmarks.bench_replay --clients 1 4 --seconds 20 --output replay.json
+    python -m benchmarks.bench_replay --wav-dir recordings/ --translator seamless --mode websocket
+    python -m benchmarks.bench_replay --clients 1 4 --baseline replay.json --tolerance 0.2
+    python -m benchmarks.bench_replay --clients 8 --workers 4 --mode in-process
+    python -m benchmarks.bench_replay --mode websocket --input-format pcm16 --output-format opus
+"""
+
+import argparse
+import asyncio
+import functools
+import json
+import logging
+import socket
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+import soundfile as sf
+
+from benchmarks.audio_fixtures import SAMPLE_RATE, iter_chunks, synthetic_speech
+from benchmarks.stub_translator import StubTranslator
+from src.api.audio_formats import get_format
+from src.api.stream_protocol import FRAME_AUDIO, FRAME_END, decode_frame, decode_timed_frame, encode_timed_frame
+from src.core.inference_scheduler import InferenceScheduler
+from src.core.translator_engine import TranslationAudio
+from src.core.vad_engine import VADEngine
+from src.core.vad_processor import SileroVADModel, VADProcessor
+
+# Lower is better for all of these; they are checked against `--baseline`
+REGRESSION_METRICS = ("ttfb_p95_ms", "e2e_p95_ms", "e2e_p99_ms", "real_time_factor")
+
+# Results with the same values of these are compared against each other (see `run_key`)
+RUN_KEY_FIELDS = ("mode", "translator", "output_mode", "workers", "input_format", "output_format", "clients")
+
+# Appended to every input so that its last sentence ends within the replay
+TRAILING_SILENCE_S = 1.5
+
+
+@dataclass
+class UtteranceTiming:
+    """Reply times of one utterance, in seconds since the client started streaming."""
+
+    first_byte_s: float
+    done_s: float
+
+
+class TimedTranslator:
+    """Wraps a translator and adds up the time spent in its calls."""
+
+    def __init__(self, translator):
+        self.translator = translator
+        self.busy_s = 0.0
+
+    def __getattr__(self, name):
+        method = getattr(self.translator, name)
+        if not callable(method):
+            return method
+
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.busy_s += time.perf_counter() - started
+
+        return timed
+
+
+def load_inputs(wav_dir: Optional[str], client_count: int, seconds: float) -> List[np.ndarray]:
+    """Returns one input per client: the WAV files round-robin, or synthetic speech."""
+    silence = np.zeros(int(TRAILING_SILENCE_S * SAMPLE_RATE), dtype=np.float32)
+    if wav_dir is None:
+        recordings = [synthetic_speech(seconds, seed=index) for index in range(client_count)]
+    else:
+        paths = sorted(Path(wav_dir).glob("*.wav"))
+        if not paths:
+            raise FileNotFoundError(f"No .wav files found in {wav_dir}")
+        recordings = [read_wav(paths[index % len(paths)]) for index in range(client_count)]
+    return [np.concatenate((audio, silence)) for audio in recordings]
+
+
+def read_wav(path: Path) -> np.ndarray:
+    """Reads a WAV file as 16kHz mono float32, resampling linearly if needed."""
+    audio, sample_rate = sf.read(path, dtype="float32", always_2d=True)
+    audio = audio.mean(axis=1)
+    if sample_rate != SAMPLE_RATE:
+        positions = np.arange(int(len(audio) * SAMPLE_RATE / sample_rate)) * sample_rate / SAMPLE_RATE
+        audio = np.interp(positions, np.arange(len(audio)), audio)
+    return audio.astype(np.float32)
+
+
+def reference_timeline(model: SileroVADModel, audio: np.ndarray, chunk_samples: int) -> List[float]:
+    """
+    Runs the VAD over the chunks a client would send and returns, per sentence, the
+    time (since streaming started) at which the chunk completing it is sent.
+    """
+    session = VADProcessor(model)
+    timeline = []
+    for index, chunk_bytes in enumerate(iter_chunks(audio, chunk_samples)):
+        session.append_audio(chunk_bytes)
+        while session.has_window():
+            if session.step() is not None:
+                timeline.append(index * chunk_samples / SAMPLE_RATE)
+    return timeline
+
+
+async def stream_paced(audio: np.ndarray, chunk_samples: int, send):
+    """Sends chunk i at start + i * chunk duration, like a microphone."""
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    for index, chunk_bytes in enumerate(iter_chunks(audio, chunk_samples)):
+        await asyncio.sleep(max(0.0, start + index * chunk_samples / SAMPLE_RATE - loop.time()))
+        await send(chunk_bytes)
+
+
+async def replay_in_process(audio, chunk_samples, args, vad_engine, model, scheduler) -> List[UtteranceTiming]:
+    """One simulated client: VAD engine session plus a sequential translation loop."""
+    loop = asyncio.get_running_loop()
+    session = VADProcessor(model)
+    sentences: asyncio.Queue = asyncio.Queue()
+    vad_engine.register(session, sentences.put_nowait)
+    timings: List[UtteranceTiming] = []
+    start = loop.time()
+
+    async def translate_all():
+        while (sentence_audio := await sentences.get()) is not None:
+            first_byte_s = None
+            if args.output_mode == "stream":
+                async for piece in scheduler.translate_stream(sentence_audio, args.tgt_lang):
+                    if first_byte_s is None and isinstance(piece, TranslationAudio):
+                        first_byte_s = loop.time() - start
+            elif args.output_mode == "text":
+                await scheduler.translate_text(sentence_audio, args.tgt_lang)
+            else:
+                await scheduler.translate(sentence_audio, args.tgt_lang)
+            done_s = loop.time() - start
+            timings.append(UtteranceTiming(first_byte_s if first_byte_s is not None else done_s, done_s))
+
+    translation = asyncio.create_task(translate_all())
+    await stream_paced(audio, chunk_samples, lambda chunk: vad_engine.submit(session, chunk))
+    await asyncio.sleep(0.5)  # Let the VAD worker finish the last chunks
+    await vad_engine.unregister(session)
+    sentences.put_nowait(None)
+    await translation
+    return timings
+
+
+async def replay_websocket(url, audio, chunk_samples, args, expected: int, traffic: dict) -> List[UtteranceTiming]:
+    """One simulated client over the WebSocket API; adds the bytes it sent and received to `traffic`."""
+    import websockets
+
+    loop = asyncio.get_running_loop()
+    timings: List[UtteranceTiming] = []
+    first_bytes = {}
+    framed_input = args.input_format != "float32"
+    framed_output = args.output_format != "wav"
+    query = f"tgt_lang={args.tgt_lang}&output_mode={args.output_mode}"
+    query += f"&input_format={args.input_format}&output_format={args.output_format}"
+
+    async with websockets.connect(f"{url}?{query}") as websocket:
+        start = loop.time()
+        sequence = 0
+        # Set while admission control has the session on text output (`degraded` or `shedding`)
+        text_replies = False
+
+        async def send(chunk_bytes):
+            nonlocal sequence
+            if framed_input:
+                audio_format = get_format(args.input_format)
+                payload = audio_format.encode(np.frombuffer(chunk_bytes, dtype=np.float32))
+                timestamp_ms = int((loop.time() - start) * 1000)
+                chunk_bytes = encode_timed_frame(FRAME_AUDIO, audio_format.code, sequence, 0, timestamp_ms, payload)
+                sequence += 1
+            traffic["sent"] += len(chunk_bytes)
+            await websocket.send(chunk_bytes)
+
+        async def receive_all():
+            nonlocal text_replies
+            while len(timings) < expected:
+                message = await websocket.recv()
+                now = loop.time() - start
+                traffic["received"] += len(message)
+                if isinstance(message, str):
+                    payload = json.loads(message)
+                    if payload.get("type") == "admission":
+                        text_replies = payload["status"] in ("degraded", "shedding")
+                    elif payload.get("type") == "translation_text" and (args.output_mode == "text" or text_replies):
+                        timings.append(UtteranceTiming(now, now))
+                    continue
+                if args.output_mode != "stream" and not framed_output:
+                    timings.append(UtteranceTiming(now, now))
+                    continue
+                if framed_output:
+                    frame_type, _, _, utterance_id, _, _ = decode_timed_frame(message)
+                else:
+                    frame_type, _, utterance_id, _ = decode_frame(message)
+                if frame_type == FRAME_AUDIO:
+                    first_bytes.setdefault(utterance_id, now)
+                elif frame_type == FRAME_END:
+                    timings.append(UtteranceTiming(first_bytes.get(utterance_id, now), now))
+
+        receiver = asyncio.create_task(receive_all())
+        try:
+            await stream_paced(audio, chunk_samples, send)
+            await asyncio.wait_for(receiver, timeout=args.drain_s)
+        except asyncio.TimeoutError:
+            logging.warning(f"Client received {len(timings)} of {expected} replies before the drain timeout.")
+        except websockets.ConnectionClosed as e:
+            # E.g. refused by admission control (1013)
+            logging.warning(f"Connection closed by the server ({e.rcvd.code if e.rcvd else '-'}): {e}")
+            receiver.cancel()
+    return timings
+
+
+def percentile_ms(values: List[float], percentile: float) -> Optional[float]:
+    return round(float(np.percentile(values, percentile)) * 1000, 1) if values else None
+
+
+def summarize(mode, args, inputs, timelines, client_timings, wall_s, busy_s, traffic: Optional[dict] = None) -> dict:
+    ttfb, e2e = [], []
+    for timeline, timings in zip(timelines, client_timings):
+        for ready_s, timing in zip(timeline, timings):
+            ttfb.append(timing.first_byte_s - ready_s)
+            e2e.append(timing.done_s - ready_s)
+
+    audio_s = sum(len(audio) for audio in inputs) / SAMPLE_RATE
+    result = {
+        "mode": mode,
+        "translator": args.translator,
+        "output_mode": args.output_mode,
+        "workers": args.workers,
+        "clients": len(inputs),
+        "utterances": len(e2e),
+        "expected_utterances": sum(len(timeline) for timeline in timelines),
+        "audio_s": round(audio_s, 2),
+        "wall_s": round(wall_s, 2),
+        "throughput_utt_per_s": round(len(e2e) / wall_s, 3),
+        "real_time_factor": round(busy_s / audio_s, 4) if busy_s is not None else None,
+    }
+    if traffic is not None:
+        # Per client, over the whole replay
+        result["input_format"], result["output_format"] = args.input_format, args.output_format
+        result["sent_bytes_per_s"] = round(traffic["sent"] / wall_s / len(inputs), 1)
+        result["received_bytes_per_s"] = round(traffic["received"] / wall_s / len(inputs), 1)
+    for name, values in (("ttfb", ttfb), ("e2e", e2e)):
+        for percentile in (50, 95, 99):
+            result[f"{name}_p{percentile}_ms"] = percentile_ms(values, percentile)
+    return result
+
+
+async def run_in_process(args, model, translator, inputs, timelines) -> dict:
+    timed = TimedTranslator(translator)
+    scheduler = InferenceScheduler(timed)
+    scheduler.start()
+    vad_engine = VADEngine(model)
+    started = time.perf_counter()
+    client_timings = await asyncio.gather(
+        *(replay_in_process(audio, args.chunk_samples, args, vad_engine, model, scheduler) for audio in inputs)
+    )
+    wall_s = time.perf_counter() - started
+    await scheduler.stop()
+    vad_engine.close()
+    return summarize("in-process", args, inputs, timelines, client_timings, wall_s, timed.busy_s)
+
+
+async def run_websocket(args, model, translator, inputs, timelines) -> dict:
+    timed = None
+    server = None
+    url = args.url
+    if url is None:
+        import uvicorn
+        from src.api import main as api
+
+        timed = TimedTranslator(translator)
+        api.start_pipeline(timed, model)
+        port = free_port()
+        server = uvicorn.Server(
+            uvicorn.Config(api.app, host="127.0.0.1", port=port, lifespan="off", log_level="warning")
+        )
+        serving = asyncio.create_task(server.serve())
+        while not server.started:
+            await asyncio.sleep(0.05)
+        url = f"ws://127.0.0.1:{port}/ws/translate"
+
+    traffic = {"sent": 0, "received": 0}
+    started = time.perf_counter()
+    client_timings = await asyncio.gather(
+        *(
+            replay_websocket(url, audio, args.chunk_samples, args, len(timeline), traffic)
+            for audio, timeline in zip(inputs, timelines)
+        )
+    )
+    wall_s = time.perf_counter() - started
+
+    if server is not None:
+        server.should_exit = True
+        await serving
+        await api.stop_pipeline()
+    return summarize("websocket", args, inputs, timelines, client_timings, wall_s, timed and timed.busy_s, traffic)
+
+
+def free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def compare(results: List[dict], baseline_path: str, tolerance: float) -> bool:
+    """Prints the change of each regression metric; returns False if one got worse by more than `tolerance`."""
+    with open(baseline_path) as f:
+        baseline = {run_key(result): result for result in json.load(f)}
+
+    passed = True
+    for result in results:
+        previous = baseline.get(run_key(result))
+        if previous is None:
+            continue
+        for metric in REGRESSION_METRICS:
+            before, after = previous.get(metric), result.get(metric)
+            if not before or after is None:
+                continue
+            change = after / before - 1
+            regressed = change > tolerance
+            passed = passed and not regressed
+            print(
+                json.dumps(
+                    {
+                        "compare": dict(zip(RUN_KEY_FIELDS, run_key(result))),
+                        "metric": metric,
+                        "baseline": before,
+                        "current": after,
+                        "change": round(change, 3),
+                        "regressed": regressed,
+                    }
+                )
+            )
+    return passed
+
+
+def run_key(result: dict):
+    return (
+        result["mode"],
+        result["translator"],
+        result["output_mode"],
+        result.get("workers", 0),
+        result.get("input_format", "float32"),
+        result.get("output_format", "wav"),
+        result["clients"],
+    )
+
+
+def create_translator(args):
+    if args.workers:
+        # Model replicas in worker processes, like `models.translation.workers`
+        from src.core.inference_workers import InferenceWorkerPool, engine_factory
+
+        factory = engine_factory
+        if args.translator == "stub":
+            factory = functools.partial(StubTranslator, real_time_factor=args.stub_rtf)
+        pool = InferenceWorkerPool(args.workers, factory=factory)
+        pool.start()
+        return pool
+    if args.translator == "stub":
+        return StubTranslator(real_time_factor=args.stub_rtf)
+    from src.core.device_manager import DeviceManager
+    from src.core.translator_engine import TranslatorEngine
+
+    return TranslatorEngine(DeviceManager())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", nargs="+", choices=["in-process", "websocket"], default=["in-process", "websocket"])
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--seconds", type=float, default=20.0, help="Synthetic audio per client.")
+    parser.add_argument("--wav-dir", help="Replay these WAV files (round-robin over clients) instead.")
+    parser.add_argument("--translator", choices=["stub", "seamless"], default="stub")
+    parser.add_argument("--stub-rtf", type=float, default=0.2, help="Simulated real-time factor of the stub.")
+    parser.add_argument("--workers", type=int, default=0, help="Run the translator in N worker processes.")
+    parser.add_argument("--output-mode", choices=["wav", "stream", "text"], default="wav")
+    parser.add_argument("--tgt-lang", default="eng")
+    parser.add_argument("--input-format", default="float32", help="Audio format the websocket clients send.")
+    parser.add_argument("--output-format", default="wav", help="Audio format the websocket clients ask for.")
+    parser.add_argument("--url", help="Replay against a running server, e.g. ws://localhost:8000/ws/translate.")
+    parser.add_argument("--chunk-samples", type=int, default=1365, help="Samples per client message (~85 ms).")
+    parser.add_argument("--drain-s", type=float, default=30.0, help="How long to wait for replies after streaming.")
+    parser.add_argument("--output", help="Write all results to this JSON file.")
+    parser.add_argument("--baseline", help="Results file of an earlier run to compare against.")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative increase before failing.")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    model = SileroVADModel()
+    translator = create_translator(args)
+    runners = {"in-process": run_in_process, "websocket": run_websocket}
+    results = []
+    for client_count in args.clients:
+        inputs = load_inputs(args.wav_dir, client_count, args.seconds)
+        timelines = [reference_timeline(model, audio, args.chunk_samples) for audio in inputs]
+        for mode in args.mode:
+            result = asyncio.run(runners[mode](args, model, translator, inputs, timelines))
+            print(json.dumps(result))
+            results.append(result)
+
+    if args.workers:
+        translator.close()
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.baseline and not compare(results, args.baseline, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Load test for broadcast rooms: one speaker publishes streamed translations at
+real-time pace while N local listeners (a share of them deliberately slow)
+receive them. Reports, for each listener count, the time the speaker spends in
+`BroadcastRoom.publish` per output piece, the time until the piece is sent on the
+speaker's own socket (which shares the event loop with all listener senders),
+event-loop lag and the outputs dropped by slow listeners.
+
+No model is involved; the outputs are the framed PCM pieces a speaker in
+`output_mode=stream` would send.
+
+Usage (from the project root):
+    python -m benchmarks.bench_room_fanout --listeners 0 100 300 --seconds 10
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+import numpy as np
+
+from benchmarks.audio_fixtures import SAMPLE_RATE, synthetic_speech
+from src.api.broadcast import BroadcastRoom, send_message
+from src.api.stream_protocol import encode_audio_frames, encode_end_frame
+from src.core.loop_monitor import EventLoopMonitor
+
+
+class LocalSocket:
+    """Stands in for a listener connection; `delay_s` per message simulates a slow network."""
+
+    def __init__(self, delay_s: float = 0.0):
+        self.delay_s = delay_s
+        self.received = 0
+
+    async def send_bytes(self, data):
+        await asyncio.sleep(self.delay_s)
+        self.received += 1
+
+    async def send_text(self, data):
+        await asyncio.sleep(self.delay_s)
+        self.received += 1
+
+
+async def speak(room, speaker_socket, pieces, piece_seconds, frame_samples):
+    """Publishes one piece per `piece_seconds`, like the vocoder does, and times each delivery."""
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    publish_ms, delivery_ms = [], []
+    sequence = 0
+    for index, samples in enumerate(pieces):
+        await asyncio.sleep(max(0.0, start + index * piece_seconds - loop.time()))
+        began = time.perf_counter()
+        frames = encode_audio_frames(samples, 1, sequence, frame_samples)
+        sequence += len(frames)
+        room.publish("eng", frames)
+        publish_ms.append((time.perf_counter() - began) * 1000)
+        for frame in frames:
+            await send_message(speaker_socket, frame)
+        delivery_ms.append((time.perf_counter() - began) * 1000)
+    room.publish("eng", [encode_end_frame(1, sequence)])
+    return np.asarray(publish_ms), np.asarray(delivery_ms)
+
+
+async def run(listener_count, seconds, piece_ms, slow_share, queue_size):
+    monitor = EventLoopMonitor(interval_ms=10)
+    monitor.start()
+    room = BroadcastRoom("bench", queue_size)
+    slow_count = int(listener_count * slow_share)
+    sockets = [LocalSocket(delay_s=0.2 if index < slow_count else 0.0) for index in range(listener_count)]
+    listeners = [room.subscribe(websocket, "eng") for websocket in sockets]
+    senders = [asyncio.create_task(listener.run()) for listener in listeners]
+
+    piece_samples = int(SAMPLE_RATE * piece_ms / 1000)
+    audio = synthetic_speech(seconds)
+    pieces = [audio[offset : offset + piece_samples] for offset in range(0, len(audio), piece_samples)]
+    publish_ms, delivery_ms = await speak(room, LocalSocket(), pieces, piece_ms / 1000, SAMPLE_RATE // 10)
+
+    await asyncio.sleep(0.5)  # Let fast listeners drain
+    for sender in senders:
+        sender.cancel()
+    await monitor.stop()
+
+    fast_received = [websocket.received for websocket in sockets[slow_count:]]
+    return {
+        "listeners": listener_count,
+        "slow_listeners": slow_count,
+        "publish_p99_ms": round(float(np.percentile(publish_ms, 99)), 3),
+        "delivery_p50_ms": round(float(np.percentile(delivery_ms, 50)), 3),
+        "delivery_p99_ms": round(float(np.percentile(delivery_ms, 99)), 3),
+        "fast_listener_min_received": min(fast_received, default=0),
+        **room.snapshot(),
+        "event_loop_lag": monitor.snapshot(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--listeners", type=int, nargs="+", default=[0, 100, 300])
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--piece-ms", type=float, default=500.0, help="Speech per published piece.")
+    parser.add_argument("--slow-share", type=float, default=0.1, help="Share of listeners that lag behind.")
+    parser.add_argument("--queue-size", type=int, default=8, help="Per-listener queue (small, to show drops).")
+    args = parser.parse_args()
+
+    for listener_count in args.listeners:
+        result = asyncio.run(run(listener_count, args.seconds, args.piece_ms, args.slow_share, args.queue_size))
+        print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Compares latency under concurrent load with torch's default threading vs. the
+`DeviceManager` thread plan (`threads` in config.yaml).
+
+N clients stream synthetic speech at real-time pace through `VADEngine`, and every
+detected sentence is translated through `InferenceScheduler`, so the VAD worker
+thread and the translator compete for the cores like in the server. The stand-in
+translator runs a fixed amount of transformer compute per second of audio (or use
+`--translator seamless` for the real model). Each configuration runs in a fresh
+process, since torch thread settings are process-wide.
+
+Usage (from the project root):
+    python -m benchmarks.bench_thread_plan --clients 4 16 --seconds 20
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+import numpy as np
+import torch
+
+from benchmarks.audio_fixtures import SAMPLE_RATE, iter_chunks, synthetic_speech
+
+CONFIGURATIONS = ("default", "planned")
+
+
+class ComputeTranslator:
+    """Runs `layers` transformer encoder layers over 50 frames per second of audio, like a speech encoder."""
+
+    def __init__(self, layers: int = 6, width: int = 512):
+        torch.manual_seed(0)
+        layer = torch.nn.TransformerEncoderLayer(width, nhead=8, dim_feedforward=4 * width, batch_first=True)
+        self.model = torch.nn.TransformerEncoder(layer, num_layers=layers).eval()
+        self.width = width
+
+    def translate_batch(
+        self, audio_batch: List[np.ndarray], tgt_lang: Optional[str] = None, encoded=None
+    ) -> List[bytes]:
+        frames = max(1, max(len(audio) for audio in audio_batch) * 50 // SAMPLE_RATE)
+        with torch.no_grad():
+            self.model(torch.randn(len(audio_batch), frames, self.width))
+        return [b"" for _ in audio_batch]
+
+
+def measure(configuration: str, clients: int, seconds: float, translator_name: str) -> dict:
+    """Runs in a child process: applies `configuration`, then replays `clients` streams."""
+    from src.core.device_manager import DeviceManager
+    from src.core.inference_scheduler import InferenceScheduler
+    from src.core.vad_engine import VADEngine
+    from src.core.vad_processor import SileroVADModel, VADProcessor
+
+    plan = DeviceManager.apply_thread_plan() if configuration == "planned" else None
+    model = SileroVADModel()
+    if translator_name == "seamless":
+        from src.core.translator_engine import TranslatorEngine
+
+        translator = TranslatorEngine(DeviceManager())
+    else:
+        translator = ComputeTranslator()
+
+    vad_pass_s: List[float] = []
+    infer = model.infer
+
+    def timed_infer(streams, windows):
+        started = time.perf_counter()
+        try:
+            return infer(streams, windows)
+        finally:
+            vad_pass_s.append(time.perf_counter() - started)
+
+    model.infer = timed_infer
+
+    async def run() -> List[float]:
+        loop = asyncio.get_running_loop()
+        scheduler = InferenceScheduler(translator)
+        scheduler.start()
+        engine = VADEngine(model, threads=plan.vad_threads if plan is not None else None)
+        latencies, tasks = [], []
+
+        async def translate(sentence_audio):
+            started = loop.time()
+            await scheduler.translate(sentence_audio, "eng")
+            latencies.append(loop.time() - started)
+
+        async def client(index):
+            session = VADProcessor(model)
+            engine.register(session, lambda sentence: tasks.append(asyncio.ensure_future(translate(sentence))))
+            start = loop.time()
+            chunk_samples = 1365
+            for position, chunk in enumerate(iter_chunks(synthetic_speech(seconds, seed=index), chunk_samples)):
+                await asyncio.sleep(max(0.0, start + position * chunk_samples / SAMPLE_RATE - loop.time()))
+                await engine.submit(session, chunk)
+            await engine.unregister(session)
+
+        await asyncio.gather(*(client(index) for index in range(clients)))
+        await asyncio.gather(*tasks)
+        await scheduler.stop()
+        engine.close()
+        return latencies
+
+    latencies = asyncio.run(run())
+
+    def percentile_ms(values, percentile):
+        return round(float(np.percentile(values, percentile)) * 1000, 1) if values else None
+
+    return {
+        "configuration": configuration,
+        "clients": clients,
+        "translator": translator_name,
+        "translation_threads": torch.get_num_threads(),
+        "plan": plan.snapshot() if plan is not None else None,
+        "utterances": len(latencies),
+        "translation_p50_ms": percentile_ms(latencies, 50),
+        "translation_p95_ms": percentile_ms(latencies, 95),
+        "vad_pass_p50_ms": percentile_ms(vad_pass_s, 50),
+        "vad_pass_p99_ms": percentile_ms(vad_pass_s, 99),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, nargs="+", default=[4, 16])
+    parser.add_argument("--seconds", type=float, default=20.0, help="Synthetic audio per client.")
+    parser.add_argument("--translator", choices=["compute", "seamless"], default="compute")
+    args = parser.parse_args()
+
+    for clients in args.clients:
+        for configuration in CONFIGURATIONS:
+            with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+                result = pool.submit(measure, configuration, clients, args.seconds, args.translator).result()
+            print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
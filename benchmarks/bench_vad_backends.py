@@ -0,0 +1,98 @@
+"""
+Compares the VAD backends (`models.vad.backend`): Silero through PyTorch (JIT model
+from the silero-vad package) and through ONNX Runtime (local model file). Reports startup time, the memory the
+loaded model adds to the process, and per-window latency for one stream and for a
+batch of streams, as `VADEngine` runs them.
+
+Each backend runs in a fresh process so that startup and memory numbers don't include
+the previous one. Both backends run with `--threads` intra-op threads, like the VAD
+worker with `threads.vad_intra_op`.
+
+Usage (from the project root):
+    python -m benchmarks.bench_vad_backends --backends torch onnx --batch 32
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from benchmarks.audio_fixtures import synthetic_speech
+
+WINDOW = 512
+
+
+def current_rss_mb() -> float:
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def measure_backend(backend: str, seconds: float, batch: int, threads: int) -> dict:
+    """Runs in a child process: loads the model on `backend` and times windows."""
+    import torch
+
+    from src.core.config import config
+    from src.core.vad_processor import SileroVADModel
+
+    torch.set_num_threads(threads)
+    config.setdefault("threads", {})["vad_intra_op"] = threads
+
+    rss_before = current_rss_mb()
+    started = time.perf_counter()
+    model = SileroVADModel(backend)
+    load_s = time.perf_counter() - started
+    model_rss_mb = current_rss_mb() - rss_before
+
+    audio = synthetic_speech(seconds, seed=1)
+    windows = audio[: len(audio) // WINDOW * WINDOW].reshape(-1, WINDOW)
+    stream = model.create_stream()
+    model.infer([stream], windows[:1])  # First call pays for lazy initialization
+    latencies = []
+    for window in windows:
+        started = time.perf_counter()
+        model.infer([stream], window[np.newaxis])
+        latencies.append(time.perf_counter() - started)
+
+    streams = [model.create_stream() for _ in range(batch)]
+    started = time.perf_counter()
+    for window in windows:
+        model.infer(streams, np.repeat(window[np.newaxis], batch, axis=0))
+    batched_s = time.perf_counter() - started
+
+    return {
+        "backend": backend,
+        "load_s": round(load_s, 3),
+        "model_rss_mb": round(model_rss_mb, 1),
+        "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "window_p50_us": round(float(np.percentile(latencies, 50)) * 1e6, 1),
+        "window_p99_us": round(float(np.percentile(latencies, 99)) * 1e6, 1),
+        f"batch{batch}_us_per_window": round(batched_s / (len(windows) * batch) * 1e6, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", nargs="+", choices=["torch", "onnx"], default=["torch", "onnx"])
+    parser.add_argument("--seconds", type=float, default=30.0, help="Audio timed per backend.")
+    parser.add_argument("--batch", type=int, default=32, help="Streams per batched forward pass.")
+    parser.add_argument("--threads", type=int, default=1, help="Intra-op threads (like threads.vad_intra_op).")
+    args = parser.parse_args()
+
+    baseline = None
+    for backend in args.backends:
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+            result = pool.submit(measure_backend, backend, args.seconds, args.batch, args.threads).result()
+        if backend == "torch":
+            baseline = result
+        if baseline is not None:
+            result["speedup"] = round(baseline["window_p50_us"] / result["window_p50_us"], 2)
+        print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
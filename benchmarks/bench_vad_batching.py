@@ -0,0 +1,80 @@
+"""
+Compares the per-stream VAD path (`VADProcessor.process` per client) with the batched
+`VADEngine`, which evaluates the ready windows of all clients in one forward pass.
+
+Usage (from the project root):
+    python -m benchmarks.bench_vad_batching --streams 1 10 50 100 --seconds 20
+"""
+
+import argparse
+import json
+import time
+
+import torch
+
+from benchmarks.audio_fixtures import SAMPLE_RATE, iter_chunks, synthetic_speech
+from src.core.vad_engine import VADEngine
+from src.core.vad_processor import SileroVADModel, VADProcessor
+
+
+def run_per_stream(model, streams_audio, chunk_samples):
+    sessions = [VADProcessor(model) for _ in streams_audio]
+    chunked = [list(iter_chunks(audio, chunk_samples)) for audio in streams_audio]
+    for chunk_index in range(max(len(chunks) for chunks in chunked)):
+        for session, chunks in zip(sessions, chunked):
+            if chunk_index < len(chunks):
+                # process() returns after a sentence ends; drain the rest like a client's next message would
+                session.process(chunks[chunk_index])
+                while session.has_window():
+                    session.process(b"")
+
+
+def run_batched(model, streams_audio, chunk_samples):
+    engine = VADEngine(model)
+    sessions = [VADProcessor(model) for _ in streams_audio]
+    chunked = [list(iter_chunks(audio, chunk_samples)) for audio in streams_audio]
+    for chunk_index in range(max(len(chunks) for chunks in chunked)):
+        for session, chunks in zip(sessions, chunked):
+            if chunk_index < len(chunks):
+                session.append_audio(chunks[chunk_index])
+        engine.run(sessions)
+
+
+def measure(label, runner, model, streams_audio, chunk_samples, audio_seconds):
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    runner(model, streams_audio, chunk_samples)
+    wall, cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+    total_audio_s = audio_seconds * len(streams_audio)
+    return {
+        "path": label,
+        "streams": len(streams_audio),
+        "wall_s": round(wall, 3),
+        "cpu_s": round(cpu, 3),
+        "windows_per_s": round(total_audio_s * SAMPLE_RATE / 512 / wall, 1),
+        # Processing time per second of audio per stream; below 1/streams keeps up in real time
+        "real_time_factor": round(wall / audio_seconds, 4),
+        "max_realtime_streams": int(total_audio_s / wall),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--streams", type=int, nargs="+", default=[1, 10, 50, 100])
+    parser.add_argument("--seconds", type=float, default=20.0, help="Audio duration per stream.")
+    parser.add_argument("--chunk-samples", type=int, default=1365, help="Samples per client message (~85 ms).")
+    parser.add_argument("--threads", type=int, default=None, help="torch intra-op threads (default: torch default).")
+    args = parser.parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    model = SileroVADModel()
+    for stream_count in args.streams:
+        streams_audio = [synthetic_speech(args.seconds, seed=index) for index in range(stream_count)]
+        for label, runner in (("per_stream", run_per_stream), ("batched", run_batched)):
+            result = measure(label, runner, model, streams_audio, args.chunk_samples, args.seconds)
+            print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
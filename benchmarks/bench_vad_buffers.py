@@ -0,0 +1,145 @@
+"""
+Micro-benchmark of the VAD audio buffering alone (no neural inference): the previous
+`np.concatenate`-based buffers vs. the preallocated `AudioFifo`/`SentenceBuffer`.
+
+Allocation figures come from tracemalloc, which tracks numpy's data buffers. For every
+client chunk the transient memory growth is recorded; `allocating_chunks_per_s` counts
+chunks that allocated at least one window of sample memory and `allocated_bytes_per_s`
+sums that growth (a lower bound of the true allocation volume). "cold" runs on a fresh
+session, "warm" on a reused one, as handed out by the session pool.
+
+Usage (from the project root):
+    python -m benchmarks.bench_vad_buffers --seconds 60 --chunk-samples 1365
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+
+import numpy as np
+
+from benchmarks.audio_fixtures import SAMPLE_RATE, iter_chunks, synthetic_speech
+from src.core.vad_processor import WINDOW_SIZE_SAMPLES, VADProcessor, VADStream
+
+
+class BufferOnlyModel:
+    """Stands in for the Silero model; speech probabilities come from window energy instead."""
+
+    SAMPLE_RATE = SAMPLE_RATE
+    STATE_SHAPE = (2, 1, 128)
+    context_size = 64
+    restart_after_windows = 4
+    priming_windows = 2
+
+    def create_stream(self):
+        return VADStream(self)
+
+
+class LegacyBufferingVADProcessor(VADProcessor):
+    """The buffering of the previous implementation: concatenate per chunk, list of windows per sentence."""
+
+    def __init__(self, model):
+        super().__init__(model)
+        self.reset()
+
+    def append_audio(self, chunk_bytes):
+        self.processing_buffer = np.concatenate([self.processing_buffer, np.frombuffer(chunk_bytes, np.float32)])
+
+    def has_window(self):
+        return len(self.processing_buffer) >= WINDOW_SIZE_SAMPLES
+
+    def next_window(self):
+        window = self.processing_buffer[:WINDOW_SIZE_SAMPLES]
+        self.processing_buffer = self.processing_buffer[WINDOW_SIZE_SAMPLES:]
+        return window
+
+    def reset(self):
+        self.iterator.reset_states()
+        self.is_recording = False
+        self.processing_buffer = np.array([], dtype=np.float32)
+        self.sentence_buffer = []
+
+    def _finish_sentence(self):
+        if not self.sentence_buffer:
+            return None
+        full_audio = np.concatenate(self.sentence_buffer)
+        self.sentence_buffer = []
+        pad_samples = int((self.padding_ms / 1000.0) * self.sample_rate)
+        if pad_samples > 0:
+            silence = np.zeros(pad_samples, dtype=np.float32)
+            full_audio = np.concatenate([silence, full_audio, silence])
+        return full_audio
+
+
+def speech_probs_for(audio):
+    """Window-energy stand-in for Silero, precomputed so it doesn't pollute the allocation figures."""
+    windows = audio[: len(audio) // WINDOW_SIZE_SAMPLES * WINDOW_SIZE_SAMPLES].reshape(-1, WINDOW_SIZE_SAMPLES)
+    return np.where(np.sqrt(np.mean(windows * windows, axis=1)) > 0.02, 0.9, 0.0).tolist()
+
+
+def feed_chunk(session, chunk_bytes, speech_probs):
+    session.append_audio(chunk_bytes)
+    while session.has_window():
+        session.advance(session.next_window(), speech_probs.pop())
+
+
+def run_pass(session, chunks, speech_probs, traced: bool):
+    """Feeds all chunks once; with `traced`, records per-chunk transient memory growth."""
+    speech_probs = speech_probs[::-1]
+    allocating_chunks, allocated_bytes = 0, 0
+    for chunk_bytes in chunks:
+        if not traced:
+            feed_chunk(session, chunk_bytes, speech_probs)
+            continue
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        feed_chunk(session, chunk_bytes, speech_probs)
+        growth = tracemalloc.get_traced_memory()[1] - before
+        # Ignore small Python object churn; count only allocations of sample data
+        if growth >= WINDOW_SIZE_SAMPLES * 4:
+            allocating_chunks += 1
+            allocated_bytes += growth
+    return allocating_chunks, allocated_bytes
+
+
+def measure(label, session_class, model, chunks, speech_probs, audio_seconds):
+    wall_start = time.perf_counter()
+    run_pass(session_class(model), chunks, speech_probs, traced=False)
+    wall = time.perf_counter() - wall_start
+
+    result = {"buffers": label, "wall_ms_per_audio_s": round(1000 * wall / audio_seconds, 3)}
+    # "cold" is a fresh session; "warm" is the same session reused, as the session pool does
+    session = session_class(model)
+    tracemalloc.start()
+    for phase in ("cold", "warm"):
+        session.reset()
+        allocating_chunks, allocated_bytes = run_pass(session, chunks, speech_probs, traced=True)
+        result[f"{phase}_allocating_chunks_per_s"] = round(allocating_chunks / audio_seconds, 2)
+        result[f"{phase}_allocated_bytes_per_s"] = int(allocated_bytes / audio_seconds)
+    tracemalloc.stop()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=60.0)
+    parser.add_argument("--chunk-samples", type=int, default=1365, help="Samples per client message (~85 ms).")
+    args = parser.parse_args()
+
+    model = BufferOnlyModel()
+    scenarios = {
+        "conversation": synthetic_speech(args.seconds, seed=1),
+        # One uninterrupted utterance: the worst case for sentence accumulation
+        "monologue": np.full(int(args.seconds * SAMPLE_RATE), 0.1, dtype=np.float32),
+    }
+    for scenario, audio in scenarios.items():
+        chunks = list(iter_chunks(audio, args.chunk_samples))
+        speech_probs = speech_probs_for(audio)
+        for label, session_class in (("concatenate", LegacyBufferingVADProcessor), ("preallocated", VADProcessor)):
+            result = measure(label, session_class, model, chunks, speech_probs, args.seconds)
+            print(json.dumps({"scenario": scenario, **result}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Measures the silence pre-gate (`SilenceGate`, `models.vad.pre_gate`) in front of the
+Silero network: the share of windows that skip the network and the CPU time saved,
+for N live sessions through the batched `VADEngine`, with the gate off and on.
+
+Each synthetic session alternates turns of speech with longer stretches of listening,
+like a participant of a conversation; `--noise-dbfs` sets the background level of the
+listening stretches (-120 is practically digital silence, as with a browser noise
+suppressor). `--wav-dir` replays recordings instead.
+
+Every run also compares the sentences with and without the gate. The network's
+recurrent state does not advance over skipped windows but is restarted at the next
+onset (see `SileroVADModel._resume`), so its probabilities there differ: a restarted
+network can catch onsets that one which listened to all of the silence misses.
+`boundary_shift_p95_ms` is how far the sentence starts and ends moved, and
+`unmatched_sentences` how many have no counterpart within 1 s.
+
+Usage (from the project root):
+    python -m benchmarks.bench_vad_gate --streams 1 10 --noise-dbfs -120 -60 -50 -40
+    python -m benchmarks.bench_vad_gate --wav-dir recordings/
+"""
+
+import argparse
+import json
+import logging
+import time
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+import torch
+
+from benchmarks.audio_fixtures import SAMPLE_RATE, iter_chunks, synthetic_speech
+from benchmarks.bench_replay import read_wav
+from src.core.vad_engine import VADEngine
+from src.core.vad_processor import SileroVADModel, VADProcessor
+
+
+def session_recording(seconds: float, seed: int, noise_dbfs: float) -> np.ndarray:
+    """Turns of 3-10 s of speech between 5-20 s of listening at `noise_dbfs`."""
+    rng = np.random.default_rng(seed)
+    noise_level = 10 ** (noise_dbfs / 20)
+    parts, total = [], 0
+    while total < seconds * SAMPLE_RATE:
+        listening = (rng.standard_normal(int(rng.uniform(5, 20) * SAMPLE_RATE)) * noise_level).astype(np.float32)
+        speech = synthetic_speech(rng.uniform(3, 10), seed=seed * 1000 + len(parts))
+        parts += [listening, speech]
+        total += len(listening) + len(speech)
+    return np.concatenate(parts)[: int(seconds * SAMPLE_RATE)]
+
+
+def run(model: SileroVADModel, streams_audio: List[np.ndarray], chunk_samples: int, gated: bool):
+    """
+    Feeds all streams chunk by chunk through one engine, like `VADEngine.run` but step by
+    step, so that each sentence is known with the sample it was completed at.
+
+    Returns:
+        Per stream, the (start, end) sample of every sentence.
+    """
+    engine = VADEngine(model)
+    sessions = [VADProcessor(model) for _ in streams_audio]
+    for session in sessions:
+        session.gate.enabled = gated
+    chunked = [list(iter_chunks(audio, chunk_samples)) for audio in streams_audio]
+    boundaries = {session: [] for session in sessions}
+    for chunk_index in range(max(len(chunks) for chunks in chunked)):
+        for session, chunks in zip(sessions, chunked):
+            if chunk_index < len(chunks):
+                session.append_audio(chunks[chunk_index])
+        while True:
+            ready = [session for session in sessions if session.has_window()]
+            if not ready:
+                break
+            for start in range(0, len(ready), engine.max_batch_size):
+                sentences = {}
+                engine.step(ready[start : start + engine.max_batch_size], sentences)
+                for session, session_sentences in sentences.items():
+                    end = session.iterator.current_sample
+                    boundaries[session] += [(end - len(sentence), end) for sentence in session_sentences]
+    engine.close()
+    return [boundaries[session] for session in sessions]
+
+
+def compare(reference: List[List[tuple]], gated: List[List[tuple]]):
+    """Start and end shifts (ms) of the gated sentences matched to the reference ones, and the unmatched count."""
+    shifts, unmatched = [], 0
+    for reference_sentences, gated_sentences in zip(reference, gated):
+        unmatched += abs(len(reference_sentences) - len(gated_sentences))
+        for start, end in gated_sentences:
+            nearest = min(reference_sentences, key=lambda sentence: abs(sentence[1] - end), default=None)
+            if nearest is None or abs(nearest[1] - end) > SAMPLE_RATE:
+                unmatched += 1
+                continue
+            shifts += [abs(nearest[0] - start) * 1000 / SAMPLE_RATE, abs(nearest[1] - end) * 1000 / SAMPLE_RATE]
+    return shifts, unmatched
+
+
+def measure(model, streams_audio, chunk_samples, noise_dbfs: Optional[float]) -> dict:
+    result = {"streams": len(streams_audio), "noise_dbfs": noise_dbfs}
+    boundaries = {}
+    for gated in (False, True):
+        model.windows_inferred = model.windows_skipped = 0
+        cpu_start = time.process_time()
+        boundaries[gated] = run(model, streams_audio, chunk_samples, gated)
+        cpu = time.process_time() - cpu_start
+        result[f"cpu_s_{'gated' if gated else 'ungated'}"] = round(cpu, 3)
+    total_windows = model.windows_inferred + model.windows_skipped
+    shifts, unmatched = compare(boundaries[False], boundaries[True])
+    result.update(
+        {
+            "audio_s": round(sum(len(audio) for audio in streams_audio) / SAMPLE_RATE, 1),
+            "windows": total_windows,
+            "skipped_ratio": round(model.windows_skipped / total_windows, 3),
+            "cpu_saved": round(1 - result["cpu_s_gated"] / result["cpu_s_ungated"], 3),
+            "sentences_ungated": sum(len(session) for session in boundaries[False]),
+            "sentences_gated": sum(len(session) for session in boundaries[True]),
+            "boundary_shift_p95_ms": round(float(np.percentile(shifts, 95)), 1) if shifts else None,
+            "unmatched_sentences": unmatched,
+        }
+    )
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--streams", type=int, nargs="+", default=[1, 10])
+    parser.add_argument("--seconds", type=float, default=120.0, help="Audio per synthetic session.")
+    parser.add_argument("--noise-dbfs", type=float, nargs="+", default=[-120, -60, -50, -40])
+    parser.add_argument("--wav-dir", help="Replay these WAV files (round-robin over streams) instead.")
+    parser.add_argument("--chunk-samples", type=int, default=1365, help="Samples per client message (~85 ms).")
+    parser.add_argument("--threads", type=int, default=1, help="torch intra-op threads (like threads.vad_intra_op).")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    torch.set_num_threads(args.threads)
+    model = SileroVADModel()
+    for stream_count in args.streams:
+        if args.wav_dir is not None:
+            paths = sorted(Path(args.wav_dir).glob("*.wav"))
+            if not paths:
+                raise FileNotFoundError(f"No .wav files found in {args.wav_dir}")
+            streams_audio = [read_wav(paths[index % len(paths)]) for index in range(stream_count)]
+            print(json.dumps(measure(model, streams_audio, args.chunk_samples, None)))
+            continue
+        for noise_dbfs in args.noise_dbfs:
+            streams_audio = [session_recording(args.seconds, index, noise_dbfs) for index in range(stream_count)]
+            print(json.dumps(measure(model, streams_audio, args.chunk_samples, noise_dbfs)))
+
+
+if __name__ == "__main__":
+    main()
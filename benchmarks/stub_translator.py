@@ -0,0 +1,81 @@
+import io
+import time
+from typing import Callable, List, Optional
+
+import numpy as np
+import soundfile as sf
+
+from benchmarks.audio_fixtures import SAMPLE_RATE
+from src.core.translator_engine import TranslationAudio, TranslationOutput, TranslationText
+
+
+class StubTranslator:
+    """
+    Stands in for `TranslatorEngine` without downloading or running SeamlessM4T.
+
+    Every call blocks its (executor) thread for `real_time_factor` times the duration of
+    the audio it was given, like the real model occupies the CPU, and answers with a tone
+    as long as the input.
+    """
+
+    speech_enabled = True
+
+    def __init__(self, real_time_factor: float = 0.2, vocoder_piece_s: float = 0.5):
+        self.real_time_factor = real_time_factor
+        self.vocoder_piece_samples = int(SAMPLE_RATE * vocoder_piece_s)
+
+    def supports_speech(self, tgt_lang: str) -> bool:
+        return True
+
+    def translate_batch(
+        self, audio_batch: List[np.ndarray], tgt_lang: Optional[str] = None, encoded=None
+    ) -> List[bytes]:
+        self._compute(audio_batch)
+        return [self._encode_wav(self._speech(len(audio))) for audio in audio_batch]
+
+    def translate_text_batch(
+        self, audio_batch: List[np.ndarray], tgt_lang: Optional[str] = None, encoded=None
+    ) -> List[str]:
+        # Text is about half of the compute, as in `translate_batch_streaming`
+        self._compute(audio_batch, share=0.5)
+        return [f"[{tgt_lang}] {len(audio) / SAMPLE_RATE:.2f} s" for audio in audio_batch]
+
+    def translate_batch_streaming(
+        self,
+        audio_batch: List[np.ndarray],
+        tgt_lang: str,
+        emit: Callable[[int, TranslationOutput], None],
+        encoded=None,
+    ):
+        # Text first (about half of the compute), then the speech piece by piece
+        self._compute(audio_batch, share=0.5)
+        for index, audio in enumerate(audio_batch):
+            emit(index, TranslationText(text=f"[{tgt_lang}] {len(audio) / SAMPLE_RATE:.2f} s"))
+        for index, audio in enumerate(audio_batch):
+            speech = self._speech(len(audio))
+            for offset in range(0, len(speech), self.vocoder_piece_samples):
+                piece = speech[offset : offset + self.vocoder_piece_samples]
+                self._compute([piece], share=0.5)
+                emit(index, TranslationAudio(samples=piece))
+
+    def encode_batch(self, audio_batch: List[np.ndarray]) -> List[Optional[object]]:
+        self._compute(audio_batch, share=0.2)
+        return [None for _ in audio_batch]
+
+    def warmup(self):
+        pass
+
+    def _compute(self, audio_batch: List[np.ndarray], share: float = 1.0):
+        duration_s = sum(len(audio) for audio in audio_batch) / SAMPLE_RATE * self.real_time_factor * share
+        time.sleep(duration_s)
+
+    @staticmethod
+    def _speech(length: int) -> np.ndarray:
+        t = np.arange(length) / SAMPLE_RATE
+        return (0.3 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+    @staticmethod
+    def _encode_wav(samples: np.ndarray) -> bytes:
+        wav_buffer = io.BytesIO()
+        sf.write(wav_buffer, samples, SAMPLE_RATE, format="WAV")
+        return wav_buffer.getvalue()
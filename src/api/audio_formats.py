@@ -0,0 +1,109 @@
+import io
+import struct
+from dataclasses import dataclass
+from typing import Dict, List
+
+import numpy as np
+import soundfile as sf
+
+SAMPLE_RATE = 16000
+
+
+@dataclass(frozen=True)
+class AudioFormat:
+    """
+    A wire encoding of 16kHz mono audio, implemented with libsndfile.
+
+    Raw formats (`framewise`) can be cut at any sample, so every frame carries a slice
+    of a continuous stream. Compressed formats are containers: every frame is a
+    complete file of its own, so they pay off with frames of a second or more.
+    """
+
+    name: str
+    # Sample format byte of the frame header (see `stream_protocol`)
+    code: int
+    sf_format: str
+    sf_subtype: str
+    framewise: bool
+
+    def encode(self, samples: np.ndarray) -> bytes:
+        buffer = io.BytesIO()
+        sf.write(
+            buffer, np.asarray(samples, dtype=np.float32), SAMPLE_RATE, format=self.sf_format, subtype=self.sf_subtype
+        )
+        return buffer.getvalue()
+
+    def decode(self, payload: bytes) -> np.ndarray:
+        if self.framewise:
+            samples, _ = sf.read(
+                io.BytesIO(payload),
+                samplerate=SAMPLE_RATE,
+                channels=1,
+                format=self.sf_format,
+                subtype=self.sf_subtype,
+                dtype="float32",
+            )
+            return samples
+        samples, sample_rate = sf.read(io.BytesIO(payload), dtype="float32", always_2d=True)
+        if sample_rate != SAMPLE_RATE:
+            raise ValueError(f"{self.name} audio must be {SAMPLE_RATE} Hz, got {sample_rate} Hz")
+        return samples.mean(axis=1, dtype=np.float32)
+
+
+FLOAT32 = AudioFormat("float32", 1, "RAW", "FLOAT", framewise=True)
+PCM16 = AudioFormat("pcm16", 2, "RAW", "PCM_16", framewise=True)
+ULAW = AudioFormat("ulaw", 3, "RAW", "ULAW", framewise=True)
+FLAC = AudioFormat("flac", 4, "FLAC", "PCM_16", framewise=False)
+OPUS = AudioFormat("opus", 5, "OGG", "OPUS", framewise=False)
+
+AUDIO_FORMATS: Dict[str, AudioFormat] = {
+    audio_format.name: audio_format for audio_format in (FLOAT32, PCM16, ULAW, FLAC, OPUS)
+}
+# Formats the local libsndfile supports (Opus needs libsndfile 1.0.29 or later)
+_AVAILABLE: Dict[int, AudioFormat] = {
+    audio_format.code: audio_format
+    for audio_format in AUDIO_FORMATS.values()
+    if audio_format.sf_subtype in sf.available_subtypes(audio_format.sf_format)
+}
+
+
+def available_formats() -> List[str]:
+    return [audio_format.name for audio_format in _AVAILABLE.values()]
+
+
+def get_format(name: str) -> AudioFormat:
+    """
+    Raises:
+        ValueError: If `name` is unknown or not supported by the local libsndfile.
+    """
+    audio_format = AUDIO_FORMATS.get(name)
+    if audio_format is None or audio_format.code not in _AVAILABLE:
+        raise ValueError(f"Unsupported audio format '{name}', expected one of {', '.join(available_formats())}")
+    return audio_format
+
+
+def format_for_code(code: int) -> AudioFormat:
+    """
+    Raises:
+        ValueError: If no available format has this header code.
+    """
+    audio_format = _AVAILABLE.get(code)
+    if audio_format is None:
+        raise ValueError(f"Unsupported audio format code {code}")
+    return audio_format
+
+
+def streaming_wav_header() -> bytes:
+    """
+    Header of a 16kHz mono PCM16 WAV stream whose length is not known yet: the RIFF and
+    data sizes are set to the maximum, which players read as "until the end of the stream".
+    Follow it with `PCM16.encode` output.
+    """
+    return (
+        b"RIFF"
+        + struct.pack("<I", 0xFFFFFFFF)
+        + b"WAVEfmt "
+        + struct.pack("<IHHIIHH", 16, 1, 1, SAMPLE_RATE, SAMPLE_RATE * 2, 2, 16)
+        + b"data"
+        + struct.pack("<I", 0xFFFFFFFF)
+    )
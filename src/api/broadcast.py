@@ -0,0 +1,123 @@
+import asyncio
+import logging
+from typing import Dict, List, Set, Union
+
+from src.core.config import config
+
+logger = logging.getLogger(__name__)
+
+# One WebSocket message: JSON text or a binary frame/WAV
+Message = Union[str, bytes]
+
+
+async def send_message(websocket, message: Message):
+    if isinstance(message, str):
+        await websocket.send_text(message)
+    else:
+        await websocket.send_bytes(message)
+
+
+class RoomListener:
+    """
+    One listener WebSocket subscribed to a room in a single target language.
+
+    Published outputs wait in a bounded queue that the listener's own sender task drains.
+    A listener that can't keep up loses its oldest queued outputs instead of slowing down
+    the speaker or the other listeners.
+    """
+
+    def __init__(self, websocket, tgt_lang: str, queue_size: int):
+        self.websocket = websocket
+        self.tgt_lang = tgt_lang
+        self.dropped = 0
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, queue_size))
+
+    def offer(self, messages: List[Message]):
+        """Queues the messages of one output; they are sent back to back or dropped together."""
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped += 1
+        self._queue.put_nowait(messages)
+
+    async def run(self):
+        """Sends queued outputs until cancelled or the socket fails."""
+        try:
+            while True:
+                for message in await self._queue.get():
+                    await send_message(self.websocket, message)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.info(f"Listener ({self.tgt_lang}) stopped receiving: {e}")
+
+
+class BroadcastRoom:
+    """
+    A channel from one or more speaker sessions to any number of listener sockets.
+
+    Speakers publish every translated output once per language; the same message objects
+    are handed to each listener of that language, so nothing is re-encoded per listener.
+    """
+
+    def __init__(self, name: str, queue_size: int):
+        self.name = name
+        self.queue_size = queue_size
+        self._listeners: Dict[str, Set[RoomListener]] = {}
+
+    def subscribe(self, websocket, tgt_lang: str) -> RoomListener:
+        listener = RoomListener(websocket, tgt_lang, self.queue_size)
+        self._listeners.setdefault(tgt_lang, set()).add(listener)
+        logger.info(f"Listener joined room '{self.name}' ({tgt_lang}). Listeners: {self.listener_count()}")
+        return listener
+
+    def unsubscribe(self, listener: RoomListener):
+        listeners = self._listeners.get(listener.tgt_lang, set())
+        listeners.discard(listener)
+        if not listeners:
+            self._listeners.pop(listener.tgt_lang, None)
+
+    def languages(self) -> List[str]:
+        """Returns the languages that currently have at least one listener."""
+        return list(self._listeners)
+
+    def listener_count(self) -> int:
+        return sum(len(listeners) for listeners in self._listeners.values())
+
+    def publish(self, tgt_lang: str, messages: List[Message]):
+        """Hands one output to every listener of `tgt_lang` without waiting for any of them."""
+        for listener in self._listeners.get(tgt_lang, ()):
+            listener.offer(messages)
+
+    def snapshot(self) -> Dict[str, int]:
+        listeners = [listener for group in self._listeners.values() for listener in group]
+        return {"listeners": len(listeners), "dropped": sum(listener.dropped for listener in listeners)}
+
+
+class RoomRegistry:
+    """
+    Looks up rooms by name. A room exists while a speaker or listener is in it, so either
+    side may connect first.
+    """
+
+    def __init__(self):
+        broadcast_cfg = config.get("broadcast", {})
+        self.queue_size = int(broadcast_cfg.get("listener_queue_size", 32))
+        self._rooms: Dict[str, BroadcastRoom] = {}
+        self._members: Dict[str, int] = {}
+
+    def join(self, name: str) -> BroadcastRoom:
+        if name not in self._rooms:
+            self._rooms[name] = BroadcastRoom(name, self.queue_size)
+            self._members[name] = 0
+        self._members[name] += 1
+        return self._rooms[name]
+
+    def leave(self, room: BroadcastRoom):
+        self._members[room.name] -= 1
+        if self._members[room.name] <= 0:
+            del self._rooms[room.name]
+            del self._members[room.name]
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        """Returns listener and drop counts per room."""
+        return {name: room.snapshot() for name, room in self._rooms.items()}
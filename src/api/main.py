@@ -1,19 +1,36 @@
 import logging
-import os
-import time
 import asyncio
 import json
-from contextlib import asynccontextmanager
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import aclosing, asynccontextmanager
+from dataclasses import replace
+from typing import Annotated, Callable, Dict, Optional
 
-import soundfile as sf
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi import Depends, FastAPI, Request, WebSocket
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse, StreamingResponse
 
 from src.core.device_manager import DeviceManager
-from src.core.vad_processor import VADProcessor
+from src.core.vad_processor import SileroVADModel, VADSessionPool
+from src.core.vad_engine import VADEngine
+from src.core.config import config
 from src.core.translator_engine import TranslatorEngine
+from src.core.inference_scheduler import InferenceScheduler
+from src.core.inference_workers import InferenceWorkerPool
+from src.core.admission import POLICY_QUEUE, STATE_FULL, Admission, AdmissionController
+from src.core.debug_recorder import DebugRecorder
+from src.core.file_translation import FileJobRegistry, FileSegmenter, FileTranslationJob, SpeechTimeline
+from src.core.loop_monitor import EventLoopMonitor
+from src.core.utterance_queue import UtteranceQueueMonitor
+from src.core.metrics import metrics
+from src.api.audio_formats import PCM16, streaming_wav_header
+from src.api.translation_session import SessionOptions, TranslationSession, parse_target_languages
+from src.api.wire_session import WireMonitor
+from src.api.broadcast import RoomRegistry
+from src.api.startup import PHASE_READY, PHASE_WARMUP, StartupReport
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
@@ -21,20 +38,113 @@ logger = logging.getLogger(__name__)
 
 # Global state to hold models
 models = {}
+# Progress and timings of the background model loading (see `load_pipeline`)
+startup_report = StartupReport()
+
+
+def start_pipeline(translator, vad_model: SileroVADModel):
+    """
+    Sets up the components shared by all sessions around the given models. Runs on the
+    server's event loop; the replay benchmark calls it with a stub translator.
+    """
+    models["translator"] = translator
+    # Sessions report their first utterance's latency here
+    models["startup_report"] = startup_report
+    # All sessions share one batching scheduler in front of the translator
+    models["scheduler"] = InferenceScheduler(models["translator"])
+    models["scheduler"].start()
+    # Silero weights are loaded once; each connection gets its own lightweight VAD session
+    # and the engine evaluates the windows of all sessions in batched forward passes
+    models["vad_pool"] = VADSessionPool(vad_model)
+    plan = DeviceManager.thread_plan
+    models["vad_engine"] = VADEngine(vad_model, threads=plan.vad_threads if plan is not None else None)
+    # Watches for anything blocking the event loop (all inference runs in worker threads)
+    models["loop_monitor"] = EventLoopMonitor()
+    models["loop_monitor"].start()
+    # Broadcast rooms: one speaker session, many listener sockets
+    models["rooms"] = RoomRegistry()
+    # Creates the bounded per-session translation queues and aggregates their statistics
+    models["queues"] = UtteranceQueueMonitor()
+    # Admits, degrades or refuses sessions from the measured load of the translator
+    models["admission"] = AdmissionController(models["scheduler"], models["queues"])
+    # Audio formats and traffic of the connections
+    models["wire"] = WireMonitor()
+    # Running and recently finished `/translate/file` jobs
+    models["file_jobs"] = FileJobRegistry(history=int(config.get("file_translation", {}).get("history", 20)))
+    # Optional sampled capture of utterances; None (and no cost) unless enabled
+    models["debug_recorder"] = DebugRecorder.from_config()
+    if models["debug_recorder"] is not None:
+        models["debug_recorder"].start()
+    register_gauges()
+
+
+async def stop_pipeline():
+    await models["loop_monitor"].stop()
+    await models["scheduler"].stop()
+    models["vad_engine"].close()
+    if hasattr(models["translator"], "close"):
+        # Stops worker processes or saves the engine's speech cache
+        models["translator"].close()
+    if models["debug_recorder"] is not None:
+        models["debug_recorder"].close()
+    models.clear()
+
+
+def pipeline_ready() -> bool:
+    return "scheduler" in models
+
+
+def speech_cache_snapshot() -> Optional[dict]:
+    translator = models["translator"]
+    if isinstance(translator, InferenceWorkerPool):
+        return translator.speech_cache_snapshot()
+    speech_cache = getattr(translator, "speech_cache", None)
+    return speech_cache.snapshot() if speech_cache is not None else None
+
+
+async def load_pipeline():
+    """
+    Loads and warms up the models in worker threads, then starts the pipeline. Runs in
+    the background so the server answers liveness probes (and reports its progress)
+    while this takes minutes.
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        # Either N model replicas in worker processes or one engine in this process
+        translator = InferenceWorkerPool.from_config()
+        if translator is not None:
+            await loop.run_in_executor(None, translator.start)
+        else:
+            translator = await loop.run_in_executor(None, TranslatorEngine, DeviceManager())
+        vad_model = await loop.run_in_executor(None, SileroVADModel)
+        startup_report.loaded_from_cache = translator.loaded_from_cache
+        startup_report.enter(PHASE_WARMUP)
+        if config.get("models", {}).get("translation", {}).get("warmup", True):
+            await loop.run_in_executor(None, translator.warmup)
+        start_pipeline(translator, vad_model)
+        startup_report.enter(PHASE_READY)
+    except Exception as e:
+        startup_report.fail(e)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup: Load models
+    global startup_report
+    # Startup: Load models in the background; /health/ready reports when they are usable
     logger.info("Initializing models...")
-    device_mgr = DeviceManager()
-    models["translator"] = TranslatorEngine(device_mgr)
-    # VAD is fast to load, but we keep it here for consistency
-    models["vad"] = VADProcessor()
-    logger.info("Application startup complete. Models loaded.")
+    startup_report = StartupReport()
+    # Thread budgets must be in place before any torch work starts
+    plan = DeviceManager.apply_thread_plan()
+    if plan.executor_threads:
+        asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=plan.executor_threads))
+    register_startup_gauges()
+    loading = asyncio.create_task(load_pipeline())
     yield
     # Shutdown: Clean up resources if needed
-    models.clear()
+    loading.cancel()
+    await asyncio.wait({loading})
+    if pipeline_ready():
+        await stop_pipeline()
     logger.info("Application shutdown complete.")
 
 
@@ -53,106 +163,404 @@ app.add_middleware(
 @app.get("/status")
 async def get_status():
     """Returns the current status of the API."""
-    return {"status": "online", "device": DeviceManager().get_device()}
+    threads = DeviceManager.thread_plan.snapshot() if DeviceManager.thread_plan is not None else None
+    if not pipeline_ready():
+        return {
+            "status": "starting" if startup_report.error is None else "failed",
+            "device": DeviceManager().get_device(),
+            "threads": threads,
+            "startup": startup_report.snapshot(),
+        }
+    return {
+        "status": "online",
+        "device": DeviceManager().get_device(),
+        "threads": threads,
+        "startup": startup_report.snapshot(),
+        "event_loop_lag": models["loop_monitor"].snapshot(),
+        "vad": models["vad_pool"].model.snapshot(),
+        "rooms": models["rooms"].snapshot(),
+        "translation_queues": models["queues"].snapshot(),
+        "admission": models["admission"].snapshot(),
+        "wire": models["wire"].snapshot(),
+        "file_jobs": models["file_jobs"].snapshot(),
+        "speech_cache": speech_cache_snapshot(),
+        "inference_workers": (
+            models["translator"].snapshot() if isinstance(models["translator"], InferenceWorkerPool) else None
+        ),
+        "debug_recording": models["debug_recorder"].snapshot() if models["debug_recorder"] is not None else None,
+    }
+
+
+@app.get("/health/live")
+async def get_liveness():
+    """Liveness: the process and its event loop respond, even while the models are still loading."""
+    return {"status": "alive"}
+
+
+@app.get("/health/ready")
+async def get_readiness():
+    """Readiness: 200 once the models are loaded and warmed up, 503 before that (or if loading failed)."""
+    ready = pipeline_ready()
+    return JSONResponse(
+        {"ready": ready, "startup": startup_report.snapshot()},
+        status_code=200 if ready else 503,
+    )
+
+
+def snapshot_fields(snapshot: Callable[[], dict], label: str, fields: Dict[str, str], scale: float = 1.0):
+    """Gauge callback reading several fields (label value -> snapshot key) from one snapshot per scrape."""
+
+    def read():
+        values = snapshot()
+        return {((label, value),): values[key] * scale for value, key in fields.items()}
+
+    return read
+
+
+def register_gauges():
+    """Exposes the current state of the shared components on `/metrics`."""
+    queues: UtteranceQueueMonitor = models["queues"]
+    metrics.gauge("active_sessions", "Connected /ws/translate sessions.", lambda: {(): queues.snapshot()["sessions"]})
+    metrics.gauge(
+        "translation_queue_depth",
+        "Sentences waiting in session translation queues (total and deepest session).",
+        snapshot_fields(queues.snapshot, "agg", {"depth": "depth", "max_depth": "max_depth"}),
+    )
+    metrics.gauge(
+        "translation_queue_events",
+        "Sentences dropped or merged by the translation queue policies since startup.",
+        snapshot_fields(queues.snapshot, "event", {"dropped": "dropped", "coalesced": "coalesced"}),
+    )
+    metrics.gauge(
+        "websocket_bytes_per_second",
+        "Average WebSocket traffic of the connected /ws/translate sessions, summed.",
+        snapshot_fields(models["wire"].snapshot, "direction", {"in": "in_bytes_per_s", "out": "out_bytes_per_s"}),
+    )
+    metrics.gauge(
+        "admission",
+        "Predicted translator load, expected wait for queued work (s) and admitted sessions.",
+        snapshot_fields(
+            models["admission"].snapshot,
+            "stat",
+            {"load": "load", "expected_wait_s": "expected_wait_s", "sessions": "sessions"},
+        ),
+    )
+    metrics.gauge(
+        "file_jobs_running",
+        "Running /translate/file jobs.",
+        lambda: {(): models["file_jobs"].snapshot()["running"]},
+    )
+    metrics.gauge(
+        "vad_windows",
+        "VAD windows evaluated by the network and skipped by the silence pre-gate since startup.",
+        snapshot_fields(
+            models["vad_pool"].model.snapshot, "result", {"inferred": "windows_inferred", "skipped": "windows_skipped"}
+        ),
+    )
+    metrics.gauge(
+        "scheduler_pending_utterances",
+        "Requests waiting for an inference batch.",
+        lambda: {(): models["scheduler"].pending_count()},
+    )
+
+    def read_speech_cache():
+        snapshot = speech_cache_snapshot() or {}
+        return {
+            (("stat", key),): snapshot[key] for key in ("hit_rate", "entries", "bytes") if snapshot.get(key) is not None
+        }
+
+    metrics.gauge("speech_cache", "Synthesized speech cache: hit rate, entries and bytes held.", read_speech_cache)
+    metrics.gauge(
+        "room_listeners",
+        "Listener sockets per broadcast room.",
+        lambda: {(("room", name),): room["listeners"] for name, room in models["rooms"].snapshot().items()},
+    )
+    metrics.gauge(
+        "event_loop_lag_seconds",
+        "Recent event-loop lag (mean and p99).",
+        snapshot_fields(models["loop_monitor"].snapshot, "agg", {"mean": "mean_ms", "p99": "p99_ms"}, scale=0.001),
+    )
+
+
+def register_startup_gauges():
+    """Exposes the startup timings on `/metrics` as soon as they are known."""
+
+    def read():
+        snapshot = startup_report.snapshot()
+        return {
+            (("phase", key[: -len("_s")]),): snapshot[key]
+            for key in ("model_load_s", "warmup_s", "cold_start_s", "first_request_s")
+            if snapshot[key] is not None
+        }
+
+    metrics.gauge("startup_seconds", "Model loading, warmup, total cold start and first utterance latency.", read)
+
+
+async def reject_until_ready(websocket: WebSocket) -> bool:
+    """Closes a WebSocket with 1013 (try again later) while the models are still loading."""
+    if pipeline_ready():
+        return False
+    await websocket.accept()
+    await websocket.close(code=1013, reason="Models are still loading")
+    return True
+
+
+async def admit_session(websocket: WebSocket, speech: bool) -> Optional[Admission]:
+    """
+    Admission control for an accepted `/ws/translate` connection (see `AdmissionController`).
+
+    Sessions admitted as usual get no message, so existing clients are unaffected. Otherwise
+    the client receives an `admission` message: `degraded` (admitted with text output
+    only), `queued` (waiting for capacity, then `admitted`) or `rejected`, followed by a
+    1013 close. Queued and rejected clients get a `retry_after_s` hint.
+
+    Returns:
+        Admission: The session's admission, or None if it was refused (and closed).
+    """
+    controller: AdmissionController = models["admission"]
+    decision = controller.decide()
+    waited = decision.state == STATE_FULL and controller.policy == POLICY_QUEUE
+    if waited:
+        controller.note_queued()
+        message = {"type": "admission", "status": "queued", "retry_after_s": decision.retry_after_s}
+        await websocket.send_text(json.dumps(message))
+        deadline = asyncio.get_running_loop().time() + controller.queue_timeout_s
+        while decision.state == STATE_FULL and asyncio.get_running_loop().time() < deadline:
+            await asyncio.sleep(0.5)
+            decision = controller.decide()
+
+    if decision.state == STATE_FULL:
+        controller.note_rejected()
+        logger.warning(f"Refusing session: translation at capacity ({controller.snapshot()}).")
+        message = {"type": "admission", "status": "rejected", "retry_after_s": decision.retry_after_s}
+        await websocket.send_text(json.dumps(message))
+        await websocket.close(code=1013, reason=f"Server at capacity, retry after {decision.retry_after_s} s")
+        return None
+
+    admission = controller.register(decision, speech)
+    if admission.degraded:
+        await websocket.send_text(json.dumps({"type": "admission", "status": "degraded", "output_mode": "text"}))
+    elif waited:
+        await websocket.send_text(json.dumps({"type": "admission", "status": "admitted"}))
+    return admission
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Per-stage latency summaries and pipeline gauges in the Prometheus text format."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
 
 
 @app.websocket("/ws/translate")
-async def websocket_endpoint(websocket: WebSocket, tgt_lang: str = "eng"):
+async def websocket_endpoint(websocket: WebSocket, options: Annotated[SessionOptions, Depends()]):
     """
     WebSocket endpoint for real-time speech translation.
     Receives Float32 PCM audio chunks, processes through VAD,
     and returns translated audio blobs.
+
+    With `output_mode=stream`, each utterance is instead returned incrementally: a JSON
+    `translation_text` message as soon as the text is decoded, followed by framed raw
+    PCM chunks (see `stream_protocol`) and an end frame. With `output_mode=text`, only
+    the `translation_text` message is sent and no speech is synthesized; this is also
+    the fallback when the engine was loaded without speech output, or when a requested
+    language has text output only.
+
+    `tgt_lang` may list several languages (e.g. `eng,fra,spa`). Each utterance is then
+    encoded once and decoded per language. In WAV mode every WAV is preceded by a JSON
+    `translation_audio` message naming its language; in stream mode each language gets
+    its own utterance id, announced by its `translation_text` message.
+
+    `speculative` (or a `{"type": "config", "speculative": ...}` message) switches
+    speculative encoding for this session: the speech encoder already runs when the
+    speaker pauses, so only decoding is left once the pause is confirmed as the end.
+
+    With `room`, every output is also published to the listeners of that room (see
+    `listen_endpoint`), and languages requested by listeners are translated as well.
+
+    Sentences wait for translation in a bounded queue; `queue_policy` (`block`, `coalesce`
+    or `drop_stale`, see `UtteranceQueue`) overrides how it behaves when translation falls
+    behind. Queued and in-flight translations are cancelled when the client disconnects.
+
+    `input_format` and `output_format` (or the same keys in a config message, answered
+    with a `config_ack`) replace raw Float32 PCM in and float32 WAV out with a more compact
+    encoding (`pcm16`, `ulaw`, `flac` or `opus`) carried in timed frames, see `WireSession`.
+
+    New sessions pass admission control (`admit_session`): when the translator is near
+    capacity they are admitted with text output only, and beyond it they are refused (or
+    queued) with close code 1013 and a retry hint. While the server is overloaded, the
+    newest speech sessions temporarily get text instead of speech, announced by
+    `{"type": "admission", "status": "shedding"}` and `"admitted"` once speech resumes.
+    """
+    if await reject_until_ready(websocket):
+        return
+    await websocket.accept()
+    output_mode = options.output_mode
+    unspoken = [
+        lang for lang in parse_target_languages(options.tgt_lang) if not models["translator"].supports_speech(lang)
+    ]
+    if output_mode != "text" and not models["translator"].speech_enabled:
+        logger.warning(f"Speech output is disabled; sending text instead of output_mode={output_mode}.")
+        output_mode = "text"
+    elif output_mode != "text" and unspoken:
+        logger.warning(
+            f"No speech output for {', '.join(unspoken)}; sending text instead of output_mode={output_mode}."
+        )
+        output_mode = "text"
+    admission = await admit_session(websocket, speech=output_mode != "text")
+    if admission is None:
+        return
+    if admission.degraded:
+        logger.warning(f"Translation near capacity; sending text instead of output_mode={output_mode}.")
+        output_mode = "text"
+    session = TranslationSession(websocket, replace(options, output_mode=output_mode), models)
+    logger.info(
+        f"Client connected to translation WebSocket. Target Language(s): {', '.join(session.targets)}, "
+        f"Output: {output_mode}"
+    )
+    await session.run(admission)
+
+
+@app.websocket("/ws/listen/{room_name}")
+async def listen_endpoint(websocket: WebSocket, room_name: str, tgt_lang: str = "eng"):
     """
+    WebSocket endpoint for listeners of a broadcast room.
+
+    Receives the speaker's outputs in `tgt_lang`, in the format the speaker connected
+    with (`output_mode`). Nothing is expected from the listener; if it falls behind by
+    more than `broadcast.listener_queue_size` outputs, the oldest ones are skipped.
+    """
+    if await reject_until_ready(websocket):
+        return
     await websocket.accept()
-    logger.info(f"Client connected to translation WebSocket. Target Language: {tgt_lang}")
-    
-    vad: VADProcessor = models["vad"]
-    translator: TranslatorEngine = models["translator"]
-    
-    # We should reset VAD state for each new connection
-    vad.reset()
-
-    # Create an asyncio queue for communication between input and translation loops
-    queue = asyncio.Queue()
-
-    async def input_loop():
-        """Producer: Reads from WS, runs VAD, pushes to Queue."""
-        try:
-            while True:
-                # Receive message (can be bytes or text)
-                message = await websocket.receive()
-
-                if "bytes" in message:
-                    # Receive audio chunk as bytes
-                    data = message["bytes"]
-                    
-                    # Process chunk through VAD
-                    sentence_audio = vad.process(data)
-                    
-                    if sentence_audio is not None:
-                        timestamp = int(time.time())
-                        logger.info(f"Sentence detected, pushing to queue... (Timestamp: {timestamp})")
-                        
-                        # DEBUG: Save Input Audio
-                        os.makedirs("static/debug", exist_ok=True)
-                        input_filename = f"static/debug/input_{timestamp}.wav"
-                        sf.write(input_filename, sentence_audio, 16000)
-
-                        await queue.put(sentence_audio)
-
-                elif "text" in message:
-                    # Process config command
-                    try:
-                        payload = json.loads(message["text"])
-                        if payload.get("type") == "config":
-                            ms = payload.get("min_silence_ms")
-                            if ms:
-                                vad.set_min_silence(int(ms))
-                    except Exception as e:
-                        logger.warning(f"Invalid config message: {e}")
-
-        except WebSocketDisconnect:
-            logger.info("Client disconnected (input loop).")
-            # Signal consumer to stop
-            await queue.put(None)
-        except Exception as e:
-            logger.error(f"Error in input_loop: {e}")
-            await queue.put(None)
-
-    async def translation_loop():
-        """Consumer: Pulls from Queue, Translates (Thread), Sends to WS."""
-        try:
-            while True:
-                sentence_audio = await queue.get()
-                
-                if sentence_audio is None:
-                    # Sentinel received, stop
-                    break
-
-                logger.info(f"Processing sentence from queue. Queue size: {queue.qsize()}")
-                
-                # Run blocking translation inference in a separate thread
-                loop = asyncio.get_running_loop()
-                translated_audio_bytes = await loop.run_in_executor(
-                    None, translator.translate, sentence_audio, tgt_lang
-                )
-
-                # DEBUG: Save Output Audio
-                timestamp = int(time.time())
-                output_filename = f"static/debug/output_{timestamp}.wav"
-                with open(output_filename, "wb") as f:
-                    f.write(translated_audio_bytes)
-
-                # Send back the translated audio bytes (WAV)
-                await websocket.send_bytes(translated_audio_bytes)
-                logger.info(f"Translated audio ({tgt_lang}) sent to client.")
-                
-                queue.task_done()
-        except Exception as e:
-            logger.error(f"Error in translation_loop: {e}")
-
-    # Run both loops concurrently
-    await asyncio.gather(input_loop(), translation_loop())
+    rooms: RoomRegistry = models["rooms"]
+    broadcast_room = rooms.join(room_name)
+    listener = broadcast_room.subscribe(websocket, tgt_lang)
+    sender = asyncio.create_task(listener.run())
+    try:
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+    finally:
+        sender.cancel()
+        broadcast_room.unsubscribe(listener)
+        rooms.leave(broadcast_room)
+        logger.info(f"Listener left room '{room_name}' ({tgt_lang}, {listener.dropped} output(s) dropped).")
+
+
+async def receive_upload(request: Request, max_bytes: int) -> str:
+    """
+    Spools the request body to a temporary file (writing in executor threads) and returns its path.
+
+    Raises:
+        ValueError: If the body is larger than `max_bytes`; the partial file is removed.
+    """
+    loop = asyncio.get_running_loop()
+    upload, size = None, 0
+    try:
+        # Kept after closing: `stream_file_job` reads and removes it
+        with tempfile.NamedTemporaryFile(prefix="s2s-upload-", delete=False) as upload:
+            async for chunk in request.stream():
+                size += len(chunk)
+                if size > max_bytes:
+                    raise ValueError(f"Upload exceeds {max_bytes // (1024 * 1024)} MB")
+                await loop.run_in_executor(None, upload.write, chunk)
+    except BaseException:
+        # Also when the client disconnects partway (or the request is cancelled)
+        if upload is not None:
+            os.remove(upload.name)
+        raise
+    return upload.name
+
+
+async def stream_file_job(job: FileTranslationJob, path: str):
+    """Response body of a file job: NDJSON lines for text jobs, one WAV stream for speech jobs."""
+    timeline = SpeechTimeline() if job.speech else None
+    try:
+        if timeline is not None:
+            yield streaming_wav_header()
+        async with aclosing(job.results()) as results:
+            async for result in results:
+                if timeline is None:
+                    line = {
+                        "type": "segment",
+                        "index": result.index,
+                        "start_s": round(result.start_s, 2),
+                        "end_s": round(result.end_s, 2),
+                        "text": result.text,
+                        "progress": job.snapshot()["progress"],
+                    }
+                    yield json.dumps(line) + "\n"
+                else:
+                    for piece in timeline.place(result):
+                        yield PCM16.encode(piece)
+        logger.info(f"File job {job.id} done: {job.snapshot()}")
+        if timeline is None:
+            yield json.dumps({"type": "done", **job.snapshot()}) + "\n"
+    except Exception as e:
+        logger.error(f"File job {job.id} failed: {e}")
+        if timeline is None:
+            yield json.dumps({"type": "error", **job.snapshot()}) + "\n"
+    finally:
+        os.remove(path)
+
+
+@app.post("/translate/file")
+async def translate_file(request: Request, tgt_lang: str = "eng", output: str = "text"):
+    """
+    Translates a recorded audio file, sent as the raw request body (WAV, FLAC, OGG or any
+    other format libsndfile reads), much faster than real time.
+
+    The upload is spooled to disk, then read block by block and cut into sentences by a
+    VAD session of its own; the sentences are translated concurrently through the shared
+    scheduler, across all inference workers, and the output is streamed back in file
+    order with bounded memory (see `FileTranslationJob`). With `output=text`, the response
+    is NDJSON: a `segment` line per sentence (`index`, `start_s`, `end_s`, `text` and the
+    job's `progress`), then a `done` line (or an `error` line) with the job's summary.
+    With `output=wav`, it is a single 16kHz PCM16 WAV stream with the translated speech
+    laid out along the source timeline. Only the first language of `tgt_lang` is used.
+
+    The job id is returned in the `X-Job-Id` header; `GET /translate/file/{job_id}`
+    reports its progress.
+    """
+    if not pipeline_ready():
+        return JSONResponse({"error": "Models are still loading"}, status_code=503)
+    if output not in ("text", "wav"):
+        return JSONResponse({"error": f"Unknown output '{output}', expected text or wav"}, status_code=400)
+    if output == "wav" and not models["translator"].speech_enabled:
+        return JSONResponse({"error": "Speech output is disabled on this server"}, status_code=400)
+    target = parse_target_languages(tgt_lang)[0]
+    if output == "wav" and not models["translator"].supports_speech(target):
+        return JSONResponse({"error": f"{target} has text output only"}, status_code=400)
+
+    file_cfg = config.get("file_translation", {})
+    try:
+        path = await receive_upload(request, int(float(file_cfg.get("max_upload_mb", 2048)) * 1024 * 1024))
+    except ValueError as e:
+        return JSONResponse({"error": str(e)}, status_code=413)
+    try:
+        segmenter = await asyncio.get_running_loop().run_in_executor(
+            None, FileSegmenter, path, models["vad_pool"].model, float(file_cfg.get("block_s", 10))
+        )
+    except RuntimeError as e:
+        os.remove(path)
+        return JSONResponse({"error": f"Unreadable audio file: {e}"}, status_code=400)
+
+    job = FileTranslationJob(segmenter, models["scheduler"], target, output == "wav")
+    models["file_jobs"].add(job)
+    logger.info(f"File job {job.id} started: {segmenter.duration_s or 0:.1f} s of audio to {job.tgt_lang}, {output}.")
+    return StreamingResponse(
+        stream_file_job(job, path),
+        media_type="audio/wav" if output == "wav" else "application/x-ndjson",
+        headers={"X-Job-Id": job.id},
+    )
+
+
+@app.get("/translate/file/{job_id}")
+async def get_file_job(job_id: str):
+    """Progress of a running or recently finished `/translate/file` job."""
+    job = models["file_jobs"].get(job_id) if pipeline_ready() else None
+    if job is None:
+        return JSONResponse({"error": f"Unknown job '{job_id}'"}, status_code=404)
+    return job.snapshot()
 
 
 # Mount static files to /static instead of root to avoid WebSocket conflict
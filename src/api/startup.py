@@ -0,0 +1,67 @@
+import logging
+import time
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+PHASE_LOADING = "loading_models"
+PHASE_WARMUP = "warming_up"
+PHASE_READY = "ready"
+PHASE_FAILED = "failed"
+
+
+class StartupReport:
+    """
+    Tracks the server's startup: which phase it is in, how long loading and warmup took,
+    the total cold start and the latency of the first translated utterance.
+
+    Reported under `startup` in `/status` and as gauges on `/metrics`.
+    """
+
+    def __init__(self):
+        self.phase = PHASE_LOADING
+        self.started_at = time.perf_counter()
+        self._phase_started_at = self.started_at
+        self.durations = {}
+        self.cold_start_s: Optional[float] = None
+        self.first_request_s: Optional[float] = None
+        self.loaded_from_cache: Optional[bool] = None
+        self.error: Optional[str] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.phase == PHASE_READY
+
+    def enter(self, phase: str):
+        """Ends the current phase (recording its duration) and starts `phase`."""
+        now = time.perf_counter()
+        self.durations[self.phase] = now - self._phase_started_at
+        self.phase, self._phase_started_at = phase, now
+        if phase == PHASE_READY:
+            self.cold_start_s = now - self.started_at
+            logger.info(f"Ready to serve after a cold start of {self.cold_start_s:.1f} s.")
+
+    def fail(self, error: Exception):
+        self.enter(PHASE_FAILED)
+        self.error = str(error)
+        logger.error(f"Startup failed: {error}")
+
+    def record_request(self, elapsed_s: float):
+        """Keeps the processing time of the first utterance served after startup."""
+        if self.first_request_s is None:
+            self.first_request_s = elapsed_s
+            logger.info(f"First utterance translated in {elapsed_s:.2f} s.")
+
+    def snapshot(self) -> dict:
+        def rounded(value):
+            return None if value is None else round(value, 3)
+
+        return {
+            "phase": self.phase,
+            "model_load_s": rounded(self.durations.get(PHASE_LOADING)),
+            "warmup_s": rounded(self.durations.get(PHASE_WARMUP)),
+            "cold_start_s": rounded(self.cold_start_s),
+            "first_request_s": rounded(self.first_request_s),
+            "loaded_from_cache": self.loaded_from_cache,
+            "error": self.error,
+        }
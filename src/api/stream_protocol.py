@@ -0,0 +1,94 @@
+import struct
+from typing import List
+
+import numpy as np
+
+# Binary frame layout for streamed speech output (little-endian):
+#   u8  frame type    (FRAME_AUDIO / FRAME_END)
+#   u8  sample format (SAMPLE_FORMAT_FLOAT32: raw 16kHz mono float32 PCM)
+#   u16 sequence number within the utterance (wraps around)
+#   u32 utterance id within the connection
+# followed by the PCM payload (empty for FRAME_END).
+FRAME_HEADER = struct.Struct("<BBHI")
+
+FRAME_AUDIO = 1
+FRAME_END = 2
+
+SAMPLE_FORMAT_FLOAT32 = 1
+
+# Sessions that negotiated an audio format (see `wire_session`) use this header in both
+# directions; the sample format byte is the format's code (see `audio_formats`):
+#   u8  frame type
+#   u8  sample format
+#   u16 sequence number (per utterance downstream, per connection upstream; wraps around)
+#   u32 utterance id (0 upstream)
+#   u32 timestamp in ms (downstream: since the connection started; upstream: the client's clock)
+# followed by the encoded payload (empty for FRAME_END).
+TIMED_FRAME_HEADER = struct.Struct("<BBHII")
+
+
+def encode_audio_frames(samples: np.ndarray, utterance_id: int, first_sequence: int, frame_samples: int) -> List[bytes]:
+    """
+    Splits a piece of synthesized speech into framed raw PCM messages.
+
+    Args:
+        samples (np.ndarray): Float32 samples of the piece.
+        utterance_id (int): Utterance the piece belongs to.
+        first_sequence (int): Sequence number of the first frame.
+        frame_samples (int): Maximum number of samples per frame.
+
+    Returns:
+        List[bytes]: One message per frame.
+    """
+    samples = np.asarray(samples, dtype=np.float32)
+    frames = []
+    for offset in range(0, len(samples), frame_samples):
+        header = FRAME_HEADER.pack(
+            FRAME_AUDIO, SAMPLE_FORMAT_FLOAT32, (first_sequence + len(frames)) & 0xFFFF, utterance_id & 0xFFFFFFFF
+        )
+        frames.append(header + samples[offset : offset + frame_samples].tobytes())
+    return frames
+
+
+def encode_end_frame(utterance_id: int, sequence: int) -> bytes:
+    """Marks the end of an utterance's speech."""
+    return FRAME_HEADER.pack(FRAME_END, SAMPLE_FORMAT_FLOAT32, sequence & 0xFFFF, utterance_id & 0xFFFFFFFF)
+
+
+def decode_frame(message: bytes):
+    """
+    Parses a frame produced by this module.
+
+    Returns:
+        tuple: (frame_type, sequence, utterance_id, samples)
+    """
+    frame_type, _, sequence, utterance_id = FRAME_HEADER.unpack_from(message)
+    samples = np.frombuffer(message, dtype=np.float32, offset=FRAME_HEADER.size)
+    return frame_type, sequence, utterance_id, samples
+
+
+def encode_timed_frame(
+    frame_type: int, sample_format: int, sequence: int, utterance_id: int, timestamp_ms: int, payload: bytes = b""
+) -> bytes:
+    return (
+        TIMED_FRAME_HEADER.pack(
+            frame_type, sample_format, sequence & 0xFFFF, utterance_id & 0xFFFFFFFF, timestamp_ms & 0xFFFFFFFF
+        )
+        + payload
+    )
+
+
+def decode_timed_frame(message: bytes):
+    """
+    Parses a timed frame.
+
+    Returns:
+        tuple: (frame_type, sample_format, sequence, utterance_id, timestamp_ms, payload)
+
+    Raises:
+        ValueError: If the message is shorter than the header.
+    """
+    if len(message) < TIMED_FRAME_HEADER.size:
+        raise ValueError(f"Frame of {len(message)} bytes is shorter than its header")
+    frame_type, sample_format, sequence, utterance_id, timestamp_ms = TIMED_FRAME_HEADER.unpack_from(message)
+    return frame_type, sample_format, sequence, utterance_id, timestamp_ms, message[TIMED_FRAME_HEADER.size :]
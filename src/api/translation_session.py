@@ -0,0 +1,325 @@
+import asyncio
+import json
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+from fastapi import WebSocket, WebSocketDisconnect
+
+from src.api.broadcast import BroadcastRoom, Message, send_message
+from src.api.wire_session import WireSession
+from src.core.admission import Admission
+from src.core.config import config
+from src.core.metrics import metrics
+from src.core.translator_engine import TranslationText
+from src.core.utterance_queue import QueuedUtterance, UtteranceQueue
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SessionOptions:
+    """Query parameters of `/ws/translate`, see `websocket_endpoint`."""
+
+    tgt_lang: str = "eng"
+    output_mode: str = "wav"
+    speculative: Optional[bool] = None
+    room: Optional[str] = None
+    queue_policy: Optional[str] = None
+    input_format: Optional[str] = None
+    output_format: Optional[str] = None
+
+
+def parse_target_languages(tgt_lang: str) -> List[str]:
+    """Splits a comma-separated `tgt_lang` query value into unique language codes, in order."""
+    targets = [lang.strip() for lang in tgt_lang.split(",") if lang.strip()]
+    return list(dict.fromkeys(targets)) or [config.get("models", {}).get("translation", {}).get("tgt_lang", "eng")]
+
+
+class TranslationSession:
+    """
+    One admitted `/ws/translate` connection.
+
+    Owns the connection's VAD session, wire encoding, translation queue and (optional)
+    broadcast room, all taken from the shared `components` (the server's `models`). Two
+    loops run side by side: the input loop hands the client's audio to the VAD engine,
+    which queues each completed sentence, and the translation loop translates queued
+    sentences through the shared scheduler and sends the results. Everything the session
+    holds is returned in `run`'s cleanup, including queued and in-flight translations.
+    """
+
+    def __init__(self, websocket: WebSocket, options: SessionOptions, components: dict):
+        self.websocket = websocket
+        self.options = options
+        self.components = components
+        self.targets = parse_target_languages(options.tgt_lang)
+        self.scheduler = components["scheduler"]
+        self.recorder = components["debug_recorder"]
+        self.recording_id = self.recorder.new_session_id() if self.recorder is not None else None
+        stream_cfg = config.get("models", {}).get("translation", {}).get("streaming", {})
+        self.frame_samples = max(1, int(16000 * stream_cfg.get("frame_ms", 100) / 1000))
+
+        self.vad = self._open_vad()
+        self.wire = self._open_wire()
+        self.queue = self._open_queue()
+        self.room: Optional[BroadcastRoom] = components["rooms"].join(options.room) if options.room else None
+        self.admission: Optional[Admission] = None
+        # (draft audio, encoder task) of the latest speculatively encoded draft
+        self.speculation = None
+        self.utterance_id = 0
+        self.sentence_number = 0
+        self.shedding = False
+
+    @property
+    def text_only(self) -> bool:
+        return self.options.output_mode == "text"
+
+    @property
+    def streaming(self) -> bool:
+        return self.options.output_mode == "stream"
+
+    async def run(self, admission: Admission):
+        """Serves the client until it disconnects, then releases everything the session holds."""
+        self.admission = admission
+        self.components["vad_engine"].register(self.vad, self.on_sentence, self.on_draft)
+        # The translation loop only lives as long as the client
+        translation_task = asyncio.create_task(self.translation_loop())
+        try:
+            await self.input_loop()
+        finally:
+            await self._close(translation_task)
+
+    def on_draft(self, draft_audio: np.ndarray):
+        """Called by the VAD engine when speech pauses: start encoding the sentence so far."""
+        if self.speculation is not None:
+            self.speculation[1].cancel()  # Speech resumed after the previous draft
+        self.speculation = (draft_audio, asyncio.ensure_future(self.scheduler.encode(draft_audio)))
+
+    def on_sentence(self, sentence_audio: np.ndarray):
+        """Called by the VAD engine (on the event loop) for every completed sentence."""
+        logger.info("Sentence detected, pushing to queue...")
+        # A sentence that ends at its draft is the draft itself; a newer draft belongs to the next sentence
+        encoding = None
+        if self.speculation is not None and self.speculation[0] is sentence_audio:
+            encoding = self.speculation[1]
+            self.speculation = None
+        self.queue.put_nowait(sentence_audio, encoding)
+
+    async def input_loop(self):
+        """Producer: Reads from WS, hands audio to the VAD worker (which pushes sentences to Queue)."""
+        try:
+            while True:
+                message = await self.websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    logger.info("Client disconnected (input loop).")
+                    return
+                if "bytes" in message:
+                    await self._receive_audio(message["bytes"])
+                elif "text" in message:
+                    await self._receive_config(message["text"])
+        except WebSocketDisconnect:
+            logger.info("Client disconnected (input loop).")
+        except Exception as e:
+            logger.error(f"Error in input_loop: {e}")
+
+    async def translation_loop(self):
+        """Consumer: Pulls from Queue, Translates (batched via scheduler), Sends to WS."""
+        try:
+            while True:
+                item = await self.queue.get()
+                if item is None:
+                    # Queue closed, stop
+                    break
+                await self._translate(item)
+        except Exception as e:
+            logger.error(f"Error in translation_loop: {e}")
+
+    def utterance_targets(self, speech: bool) -> List[str]:
+        """
+        The client's own languages, followed by any other language the room's listeners want.
+
+        For speech output, listener languages that have text output only are left out, so
+        that they cannot fail the utterance for everyone else.
+        """
+        if self.room is None:
+            return self.targets
+        extra = [lang for lang in self.room.languages() if lang not in self.targets]
+        if speech:
+            extra = [lang for lang in extra if self.components["translator"].supports_speech(lang)]
+        return self.targets + extra
+
+    async def deliver(self, target: str, messages: List[Message]):
+        """Sends one output to this client (if it asked for `target`) and publishes it to the room."""
+        if self.room is not None:
+            # Never waits: slow listeners drop their own backlog instead of delaying the speaker
+            self.room.publish(target, messages)
+        if target in self.targets:
+            with metrics.span("send", count=len(messages)):
+                for message in messages:
+                    await self._send(message)
+
+    def _open_vad(self):
+        # Each connection owns its VAD state (iterator, buffers, min-silence setting)
+        vad = self.components["vad_pool"].acquire()
+        if self.options.speculative is not None:
+            vad.set_speculative(self.options.speculative)
+        return vad
+
+    def _open_wire(self) -> WireSession:
+        wire = self.components["wire"].create()
+        if self.options.input_format is not None or self.options.output_format is not None:
+            ack = wire.negotiate(self.options.input_format, self.options.output_format)
+            if "error" in ack:
+                logger.warning(f"{ack['error']}; keeping {ack['input_format']}/{ack['output_format']}.")
+        return wire
+
+    def _open_queue(self) -> UtteranceQueue:
+        # Bounded queue between the VAD (input loop) and the translation loop
+        try:
+            return self.components["queues"].create(self.options.queue_policy)
+        except ValueError as e:
+            logger.warning(f"{e}; using the configured default.")
+            return self.components["queues"].create()
+
+    async def _close(self, translation_task: asyncio.Task):
+        # Nobody is left to receive the backlog: drop it and cancel what is being translated
+        self.components["queues"].close(self.queue)
+        self.components["wire"].close(self.wire)
+        self.components["admission"].release(self.admission)
+        translation_task.cancel()
+        await asyncio.wait({translation_task})
+        await self.components["vad_engine"].unregister(self.vad)
+        self.components["vad_pool"].release(self.vad)
+        if self.speculation is not None:
+            self.speculation[1].cancel()
+        if self.room is not None:
+            self.components["rooms"].leave(self.room)
+
+    async def _receive_audio(self, data: bytes):
+        # With the `block` policy, stop reading audio while the translation backlog is full
+        await self.queue.wait_for_space()
+        try:
+            received = self.wire.receive(data)
+        except ValueError as e:
+            logger.warning(f"Invalid audio frame: {e}")
+            return
+        if received is not None:
+            # VAD (and decoding of negotiated formats) runs in the engine's worker thread
+            await self.components["vad_engine"].submit(self.vad, *received)
+
+    async def _receive_config(self, text: str):
+        try:
+            payload = json.loads(text)
+            if payload.get("type") != "config":
+                return
+            ms = payload.get("min_silence_ms")
+            if ms:
+                self.vad.set_min_silence(int(ms))
+            if "speculative" in payload:
+                self.vad.set_speculative(bool(payload["speculative"]))
+            if "input_format" in payload or "output_format" in payload:
+                ack = self.wire.negotiate(payload.get("input_format"), payload.get("output_format"))
+                await self.websocket.send_text(json.dumps(ack))
+        except Exception as e:
+            logger.warning(f"Invalid config message: {e}")
+
+    async def _send(self, message: Message):
+        await send_message(self.websocket, message)
+        self.wire.sent(message)
+
+    async def _translate(self, item: QueuedUtterance):
+        logger.info(f"Processing sentence from queue. Queue size: {self.queue.qsize()}")
+        started = asyncio.get_running_loop().time()
+        metrics.observe("pipeline_stage_seconds", started - item.enqueued_at, stage="queue_wait")
+        encoded = await self._speculative_encoding(item)
+        self.sentence_number += 1
+        # Debug capture of the sentence as translated (after coalescing) and of its WAV or text outputs
+        recording = self.recorder is not None and self.recorder.sample()
+        if recording:
+            self.recorder.record(self.recording_id, self.sentence_number, "input.wav", item.audio)
+
+        self.shedding = await self._update_shedding()
+        languages = self.utterance_targets(speech=not (self.text_only or self.shedding))
+        if self.text_only or self.shedding:
+            await self._translate_text(item.audio, languages, encoded, recording)
+        elif self.streaming:
+            await self._translate_streaming(item.audio, languages, encoded)
+        else:
+            await self._translate_wav(item.audio, languages, encoded, recording)
+
+        elapsed = asyncio.get_running_loop().time() - started
+        metrics.observe("utterance_real_time_factor", elapsed / (len(item.audio) / 16000))
+        self.components["startup_report"].record_request(elapsed)
+
+    async def _speculative_encoding(self, item: QueuedUtterance):
+        """The encoder output of a sentence that was encoded while the speaker paused, if any."""
+        if item.encoding is None:
+            return None
+        try:
+            return await item.encoding
+        except Exception as e:
+            logger.warning(f"Speculative encoding failed, encoding again: {e}")
+            return None
+
+    async def _update_shedding(self) -> bool:
+        """Whether to translate the next utterance to text only; tells the client when this changes."""
+        controller = self.components["admission"]
+        controller.update_shedding(self.admission)
+        shed = not self.text_only and not controller.speech_allowed(self.admission)
+        if shed != self.shedding:
+            logger.warning(f"Session {'sheds' if shed else 'resumes'} speech output (load: {controller.load():.2f}).")
+            await self._send(json.dumps({"type": "admission", "status": "shedding" if shed else "admitted"}))
+        return shed
+
+    async def _translate_text(self, audio: np.ndarray, languages: List[str], encoded, recording: bool):
+        # Subtitles: no text-to-unit model or vocoder involved
+        texts: Dict[str, str] = await self.scheduler.translate_text_fanout(audio, languages, encoded)
+        if recording:
+            self.recorder.record(self.recording_id, self.sentence_number, "text.json", json.dumps(texts).encode())
+        for offset, (target, text) in enumerate(texts.items(), start=1):
+            await self.deliver(target, [self._text_message(self.utterance_id + offset, target, text)])
+        self.utterance_id += len(languages)
+
+    async def _translate_streaming(self, audio: np.ndarray, languages: List[str], encoded):
+        # All languages decode from one encoder pass and stream side by side
+        encoded = await self.scheduler.encode_for_fanout(audio, len(languages), encoded)
+        await asyncio.gather(
+            *(
+                self._stream_translation(audio, encoded, target, self.utterance_id + offset)
+                for offset, target in enumerate(languages, start=1)
+            )
+        )
+        self.utterance_id += len(languages)
+
+    async def _stream_translation(self, audio: np.ndarray, encoded, target: str, utterance_id: int):
+        """Sends the text and then the speech of one utterance as soon as each piece is ready."""
+        sequence = 0
+        async for piece in self.scheduler.translate_stream(audio, target, encoded):
+            if isinstance(piece, TranslationText):
+                await self.deliver(target, [self._text_message(utterance_id, target, piece.text)])
+                continue
+            frames = await self.wire.speech_frames(piece.samples, utterance_id, sequence, self.frame_samples)
+            sequence += len(frames)
+            await self.deliver(target, frames)
+        await self.deliver(target, [self.wire.end_frame(utterance_id, sequence)])
+        logger.info(f"Streamed translation ({target}) sent to client.")
+
+    async def _translate_wav(self, audio: np.ndarray, languages: List[str], encoded, recording: bool):
+        # The scheduler batches this utterance with those of other sessions
+        translations = await self.scheduler.translate_fanout(audio, languages, encoded)
+        self.utterance_id += 1
+        for target, wav in translations.items():
+            if recording:
+                self.recorder.record(self.recording_id, self.sentence_number, f"output_{target}.wav", wav)
+            # Send back the translated audio (a WAV, or frames in the negotiated format)
+            messages = await self.wire.utterance_messages(wav, self.utterance_id)
+            if len(self.targets) > 1:
+                header = {"type": "translation_audio", "utterance_id": self.utterance_id, "tgt_lang": target}
+                messages.insert(0, json.dumps(header))
+            await self.deliver(target, messages)
+            logger.info(f"Translated audio ({target}) sent to client.")
+
+    @staticmethod
+    def _text_message(utterance_id: int, target: str, text: str) -> str:
+        return json.dumps({"type": "translation_text", "utterance_id": utterance_id, "tgt_lang": target, "text": text})
@@ -0,0 +1,200 @@
+import asyncio
+import io
+import logging
+import time
+from typing import Callable, List, Optional, Set, Tuple
+
+import numpy as np
+import soundfile as sf
+
+from src.api.audio_formats import AudioFormat, available_formats, format_for_code, get_format
+from src.api.stream_protocol import (
+    FRAME_AUDIO,
+    FRAME_END,
+    decode_timed_frame,
+    encode_audio_frames,
+    encode_end_frame,
+    encode_timed_frame,
+)
+
+logger = logging.getLogger(__name__)
+
+# Names of the formats before negotiation: raw Float32 PCM in, WAV files (or float32 stream frames) out
+LEGACY_INPUT = "float32"
+LEGACY_OUTPUT = "wav"
+
+
+class WireSession:
+    """
+    Audio encoding and traffic of one `/ws/translate` connection.
+
+    Until the client negotiates (`?input_format=`/`?output_format=` or a config message),
+    it sends raw Float32 PCM and receives WAV files or `FRAME_HEADER` frames. Any other
+    input format switches its binary messages to timed frames (`TIMED_FRAME_HEADER`),
+    each decoded according to its own sample format byte in the VAD worker thread. Any
+    other output format makes the server send speech as timed frames in that format,
+    encoded in an executor thread: an utterance (WAV mode) is one audio frame followed by
+    an end frame, streamed speech keeps its framing.
+    """
+
+    def __init__(self):
+        self.input_format: Optional[AudioFormat] = None
+        self.output_format: Optional[AudioFormat] = None
+        self.started_at = time.monotonic()
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.frames_in = 0
+        self.lost_frames = 0
+        # Interarrival jitter of the client's frames (RFC 3550 estimator), in ms
+        self.jitter_ms = 0.0
+        self._next_sequence: Optional[int] = None
+        self._last_transit_ms: Optional[float] = None
+
+    @property
+    def framed_output(self) -> bool:
+        return self.output_format is not None
+
+    def formats(self) -> dict:
+        return {
+            "input_format": self.input_format.name if self.input_format else LEGACY_INPUT,
+            "output_format": self.output_format.name if self.output_format else LEGACY_OUTPUT,
+        }
+
+    def negotiate(self, input_format: Optional[str] = None, output_format: Optional[str] = None) -> dict:
+        """
+        Switches the session's formats; formats left at None stay as they are.
+
+        Returns:
+            dict: The `config_ack` message for the client, with the formats in effect and
+            an `error` if a requested format is not supported (then nothing changes).
+        """
+        ack = {"type": "config_ack", "sample_rate": 16000, "available_formats": available_formats()}
+        try:
+            new_input = self.input_format
+            if input_format is not None:
+                new_input = None if input_format == LEGACY_INPUT else get_format(input_format)
+            new_output = self.output_format
+            if output_format is not None:
+                new_output = None if output_format == LEGACY_OUTPUT else get_format(output_format)
+        except ValueError as e:
+            return {**ack, **self.formats(), "error": str(e)}
+        if new_input is not self.input_format:
+            # A new stream of frames starts
+            self._next_sequence = self._last_transit_ms = None
+        self.input_format, self.output_format = new_input, new_output
+        return {**ack, **self.formats()}
+
+    def timestamp_ms(self) -> int:
+        return int((time.monotonic() - self.started_at) * 1000)
+
+    def receive(self, message: bytes) -> Optional[Tuple[bytes, Optional[Callable[[bytes], np.ndarray]]]]:
+        """
+        Accounts for an incoming binary message.
+
+        Returns:
+            tuple: The audio payload and the function that decodes it (None for raw Float32),
+            or None if the message carries no audio.
+
+        Raises:
+            ValueError: If a timed frame is malformed or in an unsupported format.
+        """
+        self.bytes_in += len(message)
+        if self.input_format is None:
+            return message, None
+        frame_type, sample_format, sequence, _, timestamp_ms, payload = decode_timed_frame(message)
+        if frame_type != FRAME_AUDIO:
+            return None
+        audio_format = format_for_code(sample_format)
+
+        self.frames_in += 1
+        if self._next_sequence is not None:
+            self.lost_frames += (sequence - self._next_sequence) & 0xFFFF
+        self._next_sequence = (sequence + 1) & 0xFFFF
+        transit_ms = self.timestamp_ms() - timestamp_ms
+        if self._last_transit_ms is not None:
+            self.jitter_ms += (abs(transit_ms - self._last_transit_ms) - self.jitter_ms) / 16
+        self._last_transit_ms = transit_ms
+        return payload, audio_format.decode
+
+    def sent(self, message):
+        self.bytes_out += len(message.encode() if isinstance(message, str) else message)
+
+    async def utterance_messages(self, wav_bytes: bytes, utterance_id: int) -> List[bytes]:
+        """The messages carrying one translated WAV in the session's output format."""
+        if self.output_format is None:
+            return [wav_bytes]
+        return await asyncio.get_running_loop().run_in_executor(None, self._encode_utterance, wav_bytes, utterance_id)
+
+    async def speech_frames(
+        self, samples: np.ndarray, utterance_id: int, first_sequence: int, frame_samples: int
+    ) -> List[bytes]:
+        """The frames carrying one streamed piece of speech in the session's output format."""
+        if self.output_format is None:
+            return encode_audio_frames(samples, utterance_id, first_sequence, frame_samples)
+        return await asyncio.get_running_loop().run_in_executor(
+            None, self._encode_frames, samples, utterance_id, first_sequence, frame_samples
+        )
+
+    def end_frame(self, utterance_id: int, sequence: int) -> bytes:
+        if self.output_format is None:
+            return encode_end_frame(utterance_id, sequence)
+        return encode_timed_frame(FRAME_END, self.output_format.code, sequence, utterance_id, self.timestamp_ms())
+
+    def _encode_utterance(self, wav_bytes: bytes, utterance_id: int) -> List[bytes]:
+        samples, _ = sf.read(io.BytesIO(wav_bytes), dtype="float32")
+        frames = self._encode_frames(samples, utterance_id, 0, len(samples) or 1)
+        return frames + [self.end_frame(utterance_id, len(frames))]
+
+    def _encode_frames(
+        self, samples: np.ndarray, utterance_id: int, first_sequence: int, frame_samples: int
+    ) -> List[bytes]:
+        audio_format = self.output_format
+        # Compressed formats go out as one self-contained file per piece
+        step = frame_samples if audio_format.framewise else max(1, len(samples))
+        timestamp_ms = self.timestamp_ms()
+        return [
+            encode_timed_frame(
+                FRAME_AUDIO,
+                audio_format.code,
+                first_sequence + index,
+                utterance_id,
+                timestamp_ms,
+                audio_format.encode(samples[offset : offset + step]),
+            )
+            for index, offset in enumerate(range(0, len(samples), step))
+        ]
+
+    def snapshot(self) -> dict:
+        elapsed = max(time.monotonic() - self.started_at, 1e-6)
+        return {
+            **self.formats(),
+            "in_bytes_per_s": round(self.bytes_in / elapsed, 1),
+            "out_bytes_per_s": round(self.bytes_out / elapsed, 1),
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "lost_frames": self.lost_frames,
+            "jitter_ms": round(self.jitter_ms, 1),
+        }
+
+
+class WireMonitor:
+    """Creates the per-connection wire sessions and reports their traffic."""
+
+    def __init__(self):
+        self._sessions: Set[WireSession] = set()
+
+    def create(self) -> WireSession:
+        wire = WireSession()
+        self._sessions.add(wire)
+        return wire
+
+    def close(self, wire: WireSession):
+        self._sessions.discard(wire)
+
+    def snapshot(self) -> dict:
+        sessions = [wire.snapshot() for wire in self._sessions]
+        return {
+            "in_bytes_per_s": round(sum(session["in_bytes_per_s"] for session in sessions), 1),
+            "out_bytes_per_s": round(sum(session["out_bytes_per_s"] for session in sessions), 1),
+            "sessions": sessions,
+        }
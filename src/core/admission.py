@@ -0,0 +1,213 @@
+import itertools
+import logging
+import math
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, List, Optional, Tuple
+
+from src.core.config import config
+
+logger = logging.getLogger(__name__)
+
+# Capacity states, from best to worst
+STATE_OK = "ok"
+STATE_DEGRADED = "degraded"  # New speech sessions get text output only
+STATE_FULL = "full"  # New sessions are refused (or wait, with the `queue` policy)
+
+POLICY_REJECT = "reject"
+POLICY_QUEUE = "queue"
+
+
+class LoadTracker:
+    """
+    Measured cost and demand of translation, fed by the `InferenceScheduler`.
+
+    `rtf` is a moving average of batch busy time per second of translated audio, i.e.
+    the real-time factor of one model replica with the current mix of batches and tasks.
+    `demand` is the audio submitted for translation per second, over the last `window_s`.
+    """
+
+    def __init__(self, window_s: float = 30.0, smoothing: float = 0.2, clock: Callable[[], float] = time.monotonic):
+        self.window_s = window_s
+        self.smoothing = smoothing
+        self.clock = clock
+        self.rtf: Optional[float] = None
+        self._arrivals: Deque[Tuple[float, float]] = deque()
+        self._arrived_s = 0.0
+        self._first_arrival: Optional[float] = None
+
+    def record_arrival(self, audio_s: float):
+        now = self.clock()
+        if self._first_arrival is None:
+            self._first_arrival = now
+        self._arrivals.append((now, audio_s))
+        self._arrived_s += audio_s
+
+    def record_batch(self, audio_s: float, busy_s: float):
+        if audio_s <= 0:
+            return
+        sample = busy_s / audio_s
+        self.rtf = sample if self.rtf is None else self.rtf + self.smoothing * (sample - self.rtf)
+
+    def demand(self) -> float:
+        """Seconds of audio submitted per second, over the window (or since the first request)."""
+        now = self.clock()
+        while self._arrivals and self._arrivals[0][0] < now - self.window_s:
+            self._arrived_s -= self._arrivals.popleft()[1]
+        if self._first_arrival is None:
+            return 0.0
+        # Early on, the window is not full yet; a second at least keeps one utterance from looking like a flood
+        span = min(self.window_s, max(now - self._first_arrival, 1.0))
+        return max(0.0, self._arrived_s) / span
+
+
+@dataclass(eq=False)
+class Admission:
+    """An admitted `/ws/translate` session."""
+
+    number: int
+    # Whether the client asked for speech (WAV or stream output) at all
+    speech: bool
+    # Admitted as text-only because capacity was short; never gets speech
+    degraded: bool = False
+    # Currently shedding speech because the server is overloaded (see `AdmissionController.update_shedding`)
+    shedding: bool = False
+
+
+@dataclass
+class Decision:
+    state: str
+    retry_after_s: int
+
+
+class AdmissionController:
+    """
+    Admission control for live sessions, based on the measured load of the translator.
+
+    The load is the translator utilization that the current demand predicts:
+    `demand * rtf / concurrency` (see `LoadTracker`); above 1, the backlog grows and
+    latency with it. The expected wait is the audio already waiting or being translated
+    (scheduler and session queues), times the real-time factor, per replica.
+
+    New sessions are admitted normally while the load is below `degrade_load`, as
+    text-only sessions (no text-to-unit model or vocoder) up to `max_load`, and refused
+    beyond that, when the expected wait exceeds `max_wait_s`, or at `max_sessions`. With
+    the `queue` policy, a refused session waits up to `queue_timeout_s` for capacity
+    instead. While overloaded, the newest speech sessions shed speech (their utterances
+    are translated to text only) until the load is back below `max_load`, so the older
+    sessions keep their latency instead of everyone slowing down together.
+    """
+
+    def __init__(self, scheduler, queues):
+        admission_cfg = config.get("admission", {})
+        self.enabled = bool(admission_cfg.get("enabled", True))
+        self.policy = admission_cfg.get("policy", POLICY_REJECT)
+        if self.policy not in (POLICY_REJECT, POLICY_QUEUE):
+            logger.warning(f"Unknown admission policy '{self.policy}', rejecting at capacity.")
+            self.policy = POLICY_REJECT
+        self.max_sessions = int(admission_cfg.get("max_sessions", 0))
+        self.degrade = bool(admission_cfg.get("degrade", True))
+        self.degrade_load = float(admission_cfg.get("degrade_load", 0.8))
+        self.max_load = float(admission_cfg.get("max_load", 1.0))
+        self.max_wait_s = float(admission_cfg.get("max_wait_s", 5.0))
+        self.queue_timeout_s = float(admission_cfg.get("queue_timeout_s", 15.0))
+        self.min_retry_after_s = int(admission_cfg.get("retry_after_s", 5))
+
+        self.scheduler = scheduler
+        self.queues = queues
+        self.admitted = 0
+        self.degraded = 0
+        self.rejected = 0
+        self.queued = 0
+        self._sessions: List[Admission] = []
+        self._numbers = itertools.count(1)
+
+    def load(self) -> float:
+        rtf = self.scheduler.load.rtf
+        if rtf is None:
+            return 0.0
+        return self.scheduler.load.demand() * rtf / self.scheduler.max_concurrent_batches
+
+    def expected_wait_s(self) -> float:
+        rtf = self.scheduler.load.rtf or 0.0
+        backlog_s = self.scheduler.backlog_seconds() + self.queues.queued_seconds()
+        return backlog_s * rtf / self.scheduler.max_concurrent_batches
+
+    def decide(self) -> Decision:
+        """Whether a new session can be admitted now, and how."""
+        load, wait_s = self.load(), self.expected_wait_s()
+        retry_after_s = max(self.min_retry_after_s, math.ceil(wait_s))
+        if not self.enabled:
+            return Decision(STATE_OK, retry_after_s)
+        at_max_sessions = 0 < self.max_sessions <= len(self._sessions)
+        if at_max_sessions or load >= self.max_load or wait_s >= self.max_wait_s:
+            return Decision(STATE_FULL, retry_after_s)
+        if self.degrade and load >= self.degrade_load:
+            return Decision(STATE_DEGRADED, retry_after_s)
+        return Decision(STATE_OK, retry_after_s)
+
+    def register(self, decision: Decision, speech: bool) -> Admission:
+        admission = Admission(next(self._numbers), speech, degraded=speech and decision.state == STATE_DEGRADED)
+        self._sessions.append(admission)
+        self.admitted += 1
+        self.degraded += admission.degraded
+        return admission
+
+    def release(self, admission: Admission):
+        if admission in self._sessions:
+            self._sessions.remove(admission)
+
+    def note_queued(self):
+        """Counts a session that waits for capacity (`queue` policy)."""
+        self.queued += 1
+
+    def note_rejected(self):
+        """Counts a session refused at capacity."""
+        self.rejected += 1
+
+    def update_shedding(self, admission: Admission):
+        """
+        Decides whether the session sheds speech now, in `admission.shedding`.
+
+        While overloaded, the newest speech sessions shed speech: as many as it takes to
+        bring the predicted load to `max_load`, assuming every session has the same share.
+        """
+        if not admission.speech or admission.degraded or not (self.enabled and self.degrade):
+            admission.shedding = False
+            return
+        load = self.load()
+        overloaded = load > self.max_load or self.expected_wait_s() > self.max_wait_s
+        speaking = [session for session in self._sessions if session.speech and not session.degraded]
+        overflow = 0
+        if overloaded:
+            overflow = max(1, math.ceil(len(speaking) * (1 - self.max_load / load))) if load > 0 else 1
+        admission.shedding = admission in speaking[len(speaking) - overflow :] if overflow else False
+
+    @staticmethod
+    def speech_allowed(admission: Admission) -> bool:
+        """Whether the session's next utterance may be synthesized (as of the last `update_shedding`)."""
+        return admission.speech and not admission.degraded and not admission.shedding
+
+    def snapshot(self) -> dict:
+        decision = self.decide()
+        load = self.load()
+        rtf = self.scheduler.load.rtf
+        return {
+            "state": decision.state,
+            "policy": self.policy,
+            "load": round(load, 3),
+            "real_time_factor": round(rtf, 3) if rtf is not None else None,
+            "demand_audio_s_per_s": round(self.scheduler.load.demand(), 3),
+            "expected_wait_s": round(self.expected_wait_s(), 2),
+            "sessions": len(self._sessions),
+            # Sessions of the current average demand that fit below `max_load`
+            "estimated_capacity": math.floor(len(self._sessions) * self.max_load / load) if load > 0 else None,
+            "degraded_sessions": sum(session.degraded for session in self._sessions),
+            "shedding_sessions": sum(session.shedding for session in self._sessions),
+            "admitted": self.admitted,
+            "admitted_degraded": self.degraded,
+            "queued": self.queued,
+            "rejected": self.rejected,
+            "retry_after_s": decision.retry_after_s,
+        }
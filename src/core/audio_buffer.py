@@ -0,0 +1,112 @@
+import numpy as np
+
+
+class AudioFifo:
+    """
+    Preallocated FIFO of float32 samples that hands out zero-copy windows.
+
+    Incoming chunks are written in place after the unread data. When the free space at
+    the end runs out, the (small) unread remainder is moved to the front instead of
+    reallocating, so a long-running stream allocates nothing after warm-up. Windows are
+    returned as views and are only valid until the next `write`.
+    """
+
+    def __init__(self, capacity: int):
+        self._data = np.zeros(capacity, dtype=np.float32)
+        self._read_pos = 0
+        self._write_pos = 0
+
+    def __len__(self) -> int:
+        return self._write_pos - self._read_pos
+
+    def write(self, samples: np.ndarray):
+        """Appends samples, compacting (or, for oversized bursts, growing) the storage as needed."""
+        if self._write_pos + len(samples) > len(self._data):
+            self._make_room(len(samples))
+        self._data[self._write_pos : self._write_pos + len(samples)] = samples
+        self._write_pos += len(samples)
+
+    def read(self, num_samples: int) -> np.ndarray:
+        """Removes and returns the next `num_samples` samples as a view into the buffer."""
+        window = self._data[self._read_pos : self._read_pos + num_samples]
+        self._read_pos += len(window)
+        return window
+
+    def peek(self, num_samples: int) -> np.ndarray:
+        """Returns the next `num_samples` unread samples as a view, without removing them."""
+        return self._data[self._read_pos : min(self._read_pos + num_samples, self._write_pos)]
+
+    def clear(self):
+        self._read_pos = 0
+        self._write_pos = 0
+
+    def _make_room(self, incoming: int):
+        unread = len(self)
+        if unread + incoming > len(self._data):
+            grown = np.zeros(max(2 * len(self._data), unread + incoming), dtype=np.float32)
+            grown[:unread] = self._data[self._read_pos : self._write_pos]
+            self._data = grown
+        else:
+            self._data[:unread] = self._data[self._read_pos : self._write_pos]
+        self._read_pos = 0
+        self._write_pos = unread
+
+
+class SentenceBuffer:
+    """
+    Growable, reusable buffer that accumulates the windows of one sentence.
+
+    Storage is kept across sentences and doubled only when a sentence outgrows it, and
+    the finished sentence is produced with a single copy, padding included.
+    """
+
+    def __init__(self, initial_capacity: int):
+        self._data = np.zeros(initial_capacity, dtype=np.float32)
+        self._length = 0
+
+    def __len__(self) -> int:
+        return self._length
+
+    def append(self, samples: np.ndarray):
+        required = self._length + len(samples)
+        if required > len(self._data):
+            grown = np.zeros(max(2 * len(self._data), required), dtype=np.float32)
+            grown[: self._length] = self._data[: self._length]
+            self._data = grown
+        self._data[self._length : required] = samples
+        self._length = required
+
+    def view(self) -> np.ndarray:
+        """Returns the accumulated audio as a view, valid until the buffer is next modified."""
+        return self._data[: self._length]
+
+    def pop_padded(self, pad_samples: int) -> np.ndarray:
+        """
+        Returns the accumulated audio with `pad_samples` of silence on both sides and
+        empties the buffer.
+        """
+        sentence = self.copy_padded(pad_samples)
+        self._length = 0
+        return sentence
+
+    def pop_front_padded(self, num_samples: int, pad_samples: int) -> np.ndarray:
+        """
+        Like `pop_padded`, but returns only the first `num_samples` samples and keeps the
+        rest at the start of the buffer.
+        """
+        num_samples = min(num_samples, self._length)
+        segment = np.zeros(num_samples + 2 * pad_samples, dtype=np.float32)
+        segment[pad_samples : pad_samples + num_samples] = self._data[:num_samples]
+        remaining = self._length - num_samples
+        self._data[:remaining] = self._data[num_samples : self._length]
+        self._length = remaining
+        return segment
+
+    def copy_padded(self, pad_samples: int) -> np.ndarray:
+        """Like `pop_padded`, but keeps accumulating into the buffer."""
+        sentence = np.zeros(self._length + 2 * pad_samples, dtype=np.float32)
+        sentence[pad_samples : pad_samples + self._length] = self._data[: self._length]
+        return sentence
+
+    def clear(self):
+        self._length = 0
@@ -0,0 +1,113 @@
+import logging
+from dataclasses import dataclass
+from typing import Tuple
+
+import numpy as np
+import torch
+
+logger = logging.getLogger(__name__)
+
+QUANTIZATION_NONE = "none"
+QUANTIZATION_INT8 = "int8"
+
+# Sub-models that `TranslatorEngine` calls directly and that benefit from torch.compile
+COMPILED_SUBMODULES = ("speech_encoder", "t2u_model", "vocoder")
+
+
+@dataclass
+class CPUAccelerationSettings:
+    """CPU inference options of `TranslatorEngine` (`models.translation.cpu_acceleration`)."""
+
+    quantization: str = QUANTIZATION_NONE
+    bfloat16: bool = False
+    compile: bool = False
+    self_check: bool = True
+    min_similarity: float = 0.98
+
+    @classmethod
+    def from_config(cls, cpu_cfg: dict) -> "CPUAccelerationSettings":
+        settings = cls(
+            quantization=cpu_cfg.get("quantization", QUANTIZATION_NONE),
+            bfloat16=bool(cpu_cfg.get("bfloat16", False)),
+            compile=bool(cpu_cfg.get("compile", False)),
+            self_check=bool(cpu_cfg.get("self_check", True)),
+            min_similarity=float(cpu_cfg.get("self_check_min_similarity", 0.98)),
+        )
+        if settings.quantization not in (QUANTIZATION_NONE, QUANTIZATION_INT8):
+            raise ValueError(f"Unknown quantization '{settings.quantization}', expected 'none' or 'int8'")
+        return settings
+
+    @property
+    def conversion(self) -> str:
+        """The weight conversion alone (what `convert_weights` does), e.g. as a cache key."""
+        if self.quantization != QUANTIZATION_NONE:
+            return self.quantization
+        return "bfloat16" if self.bfloat16 else "float32"
+
+    def describe(self) -> str:
+        parts = [self.quantization] if self.quantization != QUANTIZATION_NONE else []
+        parts += ["bfloat16"] * self.bfloat16 + ["compile"] * self.compile
+        return "+".join(parts) or "float32"
+
+
+def bfloat16_supported() -> bool:
+    """True if oneDNN has fast bfloat16 kernels for this CPU (AVX512-BF16 or AMX)."""
+    try:
+        return bool(torch.ops.mkldnn._is_mkldnn_bf16_supported())
+    except (AttributeError, RuntimeError):
+        return False
+
+
+def convert_weights(model: torch.nn.Module, settings: CPUAccelerationSettings) -> Tuple[torch.nn.Module, torch.dtype]:
+    """
+    Converts a float32 model to the configured weight format.
+
+    Dynamic int8 quantization replaces every `nn.Linear` (the bulk of SeamlessM4T's
+    compute) with a kernel that quantizes activations on the fly; convolutions, such as
+    most of the vocoder, stay float32. bfloat16 is only used when the CPU has native
+    support, since emulated bfloat16 is slower than float32, and not together with int8.
+
+    Returns:
+        Tuple[torch.nn.Module, torch.dtype]: The converted model and the dtype its inputs need.
+    """
+    dtype = torch.float32
+    if settings.quantization == QUANTIZATION_INT8:
+        model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+        logger.info("Applied dynamic int8 quantization to the linear layers.")
+        if settings.bfloat16:
+            logger.warning("bfloat16 is ignored together with int8 quantization.")
+    elif settings.bfloat16:
+        if bfloat16_supported():
+            model = model.to(torch.bfloat16)
+            dtype = torch.bfloat16
+            logger.info("Running the model in bfloat16.")
+        else:
+            logger.warning("This CPU has no native bfloat16 support; staying in float32.")
+    return model, dtype
+
+
+def compile_submodules(model: torch.nn.Module) -> torch.nn.Module:
+    """
+    Wraps the sub-models in `COMPILED_SUBMODULES` with torch.compile. Compilation itself
+    happens lazily on their first call, so it is best triggered by a warmup translation.
+    """
+    for name in COMPILED_SUBMODULES:
+        if hasattr(model, name):
+            setattr(model, name, torch.compile(getattr(model, name), dynamic=True))
+    logger.info(f"Compiled sub-models with torch.compile: {', '.join(COMPILED_SUBMODULES)}.")
+    return model
+
+
+def output_similarity(reference: torch.Tensor, candidate: torch.Tensor) -> float:
+    """Cosine similarity of two outputs of the same shape, computed in float32."""
+    return float(
+        torch.nn.functional.cosine_similarity(reference.float().reshape(1, -1), candidate.float().reshape(1, -1)).item()
+    )
+
+
+def probe_audio(duration_s: float = 2.0) -> np.ndarray:
+    """Deterministic voiced, syllable-modulated test signal (16kHz float32) for the self-check."""
+    t = np.arange(int(duration_s * 16000)) / 16000
+    voiced = sum(np.sin(2 * np.pi * 140 * harmonic * t) / harmonic for harmonic in range(1, 6))
+    syllables = 0.5 * (1 + np.sin(2 * np.pi * 4 * t))
+    return (0.2 * voiced * syllables).astype(np.float32)
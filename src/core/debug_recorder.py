@@ -0,0 +1,170 @@
+import logging
+import os
+import queue
+import random
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Deque, Optional, Tuple, Union
+
+import numpy as np
+import soundfile as sf
+from src.core.config import config
+
+logger = logging.getLogger(__name__)
+
+# File types the recorder writes, and the only ones its retention policy deletes
+RECORDING_SUFFIXES = (".wav", ".json")
+
+
+class DebugRecorder:
+    """
+    Saves a sample of the utterances (input audio and translations) for debugging.
+
+    Recording never touches the disk on the event loop: `record` queues the payload
+    and a background thread writes it. The queue is bounded; when the writer falls
+    behind, new recordings are dropped (and counted) instead of queueing up memory.
+    Files are named `<session>_<utterance>_<name>`, so they never collide, and the
+    oldest are deleted once they exceed `max_age_hours` or the directory holds more
+    than `max_total_mb`. Disabled by default (`debug_recording` in config.yaml), in
+    which case the server creates no recorder at all.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        sample_fraction: float = 1.0,
+        queue_size: int = 64,
+        max_total_mb: float = 500.0,
+        max_age_hours: float = 24.0,
+    ):
+        self.directory = directory
+        self.sample_fraction = min(1.0, max(0.0, sample_fraction))
+        self.max_total_bytes = int(max_total_mb * 1024 * 1024)
+        self.max_age_s = max_age_hours * 3600.0
+
+        self.written = 0
+        self.dropped = 0
+        self.removed = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, queue_size))
+        # (modification time, path, size) of the recordings on disk, oldest first
+        self._files: Deque[Tuple[float, str, int]] = deque()
+        self._total_bytes = 0
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_config(cls) -> Optional["DebugRecorder"]:
+        """Returns a recorder if `debug_recording.enabled` is set, else None."""
+        recording_cfg = config.get("debug_recording", {})
+        if not recording_cfg.get("enabled", False):
+            return None
+        return cls(
+            directory=recording_cfg.get("dir", "static/debug"),
+            sample_fraction=float(recording_cfg.get("sample_fraction", 1.0)),
+            queue_size=int(recording_cfg.get("queue_size", 64)),
+            max_total_mb=float(recording_cfg.get("max_total_mb", 500)),
+            max_age_hours=float(recording_cfg.get("max_age_hours", 24)),
+        )
+
+    def start(self):
+        """Indexes the recordings already on disk (so retention covers them) and starts the writer."""
+        os.makedirs(self.directory, exist_ok=True)
+        existing = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and entry.name.endswith(RECORDING_SUFFIXES):
+                stat = entry.stat()
+                existing.append((stat.st_mtime, entry.path, stat.st_size))
+        self._files.extend(sorted(existing))
+        self._total_bytes = sum(size for _, _, size in existing)
+        self._prune()
+        self._thread = threading.Thread(target=self._run, name="debug-recorder", daemon=True)
+        self._thread.start()
+        logger.info(f"Recording {self.sample_fraction:.0%} of utterances to {self.directory}.")
+
+    def close(self, timeout: float = 10.0):
+        """Writes what is still queued and stops the writer."""
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join(timeout)
+        self._thread = None
+
+    @staticmethod
+    def new_session_id() -> str:
+        """A unique, time-sortable prefix for one connection's recordings."""
+        return f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+
+    def sample(self) -> bool:
+        """Whether to record the next utterance."""
+        return self.sample_fraction >= 1.0 or random.random() < self.sample_fraction
+
+    def record(self, session_id: str, utterance: int, name: str, payload: Union[np.ndarray, bytes]):
+        """
+        Queues one file of an utterance; never blocks.
+
+        Args:
+            session_id (str): See `new_session_id`.
+            utterance (int): Number of the utterance within the session.
+            name (str): What the file holds, with its extension (e.g. `input.wav`, `output_eng.wav`).
+            payload: 16kHz float audio (written as WAV) or the file's bytes.
+        """
+        filename = f"{session_id}_{utterance:05d}_{name}"
+        try:
+            self._queue.put_nowait((filename, payload))
+        except queue.Full:
+            self.dropped += 1
+
+    def snapshot(self) -> dict:
+        return {
+            "sample_fraction": self.sample_fraction,
+            "files": len(self._files),
+            "bytes": self._total_bytes,
+            "written": self.written,
+            "dropped": self.dropped,
+            "removed": self.removed,
+            "pending": self._queue.qsize(),
+        }
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            filename, payload = item
+            try:
+                self._write(os.path.join(self.directory, filename), payload)
+            except Exception as e:
+                logger.warning(f"Could not write debug recording {filename}: {e}")
+            self._prune()
+
+    def _write(self, path: str, payload: Union[np.ndarray, bytes]):
+        # Written under a temporary name, so a half-written file is never served or indexed
+        tmp_path = f"{path}.tmp"
+        if isinstance(payload, np.ndarray):
+            sf.write(tmp_path, payload, 16000, format="WAV")
+        else:
+            with open(tmp_path, "wb") as f:
+                f.write(payload)
+        os.replace(tmp_path, path)
+        size = os.path.getsize(path)
+        self._files.append((time.time(), path, size))
+        self._total_bytes += size
+        self.written += 1
+
+    def _prune(self):
+        """Deletes the oldest recordings while they are too old or use too much space."""
+        oldest_allowed = time.time() - self.max_age_s if self.max_age_s > 0 else None
+        while self._files:
+            modified, path, size = self._files[0]
+            too_old = oldest_allowed is not None and modified < oldest_allowed
+            too_big = self.max_total_bytes > 0 and self._total_bytes > self.max_total_bytes
+            if not (too_old or too_big):
+                break
+            self._files.popleft()
+            self._total_bytes -= size
+            try:
+                os.remove(path)
+                self.removed += 1
+            except FileNotFoundError:
+                pass
@@ -1,12 +1,151 @@
+import glob
+import os
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
 import torch
 import logging
 
+from src.core.config import config
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def _parse_cpu_list(text: str) -> List[int]:
+    """Parses a sysfs CPU list such as "0-3,8,10-11"."""
+    cpus = []
+    for part in text.strip().split(","):
+        if not part:
+            continue
+        start, _, end = part.partition("-")
+        cpus.extend(range(int(start), int(end or start) + 1))
+    return cpus
+
+
+def _read(path: str) -> Optional[str]:
+    try:
+        with open(path) as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+@dataclass
+class CPUTopology:
+    """Logical CPUs usable by this process, grouped into physical cores and NUMA nodes."""
+
+    # One list of logical CPUs (SMT siblings) per physical core
+    physical_cores: List[List[int]]
+    # Logical CPUs per NUMA node
+    numa_nodes: List[List[int]]
+
+    @classmethod
+    def detect(cls) -> "CPUTopology":
+        """Reads the topology from sysfs, restricted to the CPUs this process may run on."""
+        usable = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else list(range(os.cpu_count()))
+
+        cores: Dict[tuple, List[int]] = {}
+        for cpu in usable:
+            base = f"/sys/devices/system/cpu/cpu{cpu}/topology"
+            package, core = _read(f"{base}/physical_package_id"), _read(f"{base}/core_id")
+            key = (package.strip(), core.strip()) if package and core else ("cpu", cpu)
+            cores.setdefault(key, []).append(cpu)
+
+        nodes = []
+        for path in sorted(glob.glob("/sys/devices/system/node/node[0-9]*/cpulist")):
+            node_cpus = [cpu for cpu in _parse_cpu_list(_read(path) or "") if cpu in usable]
+            if node_cpus:
+                nodes.append(node_cpus)
+        return cls(physical_cores=sorted(cores.values()), numa_nodes=nodes or [usable])
+
+    @property
+    def logical_cpus(self) -> int:
+        return sum(len(siblings) for siblings in self.physical_cores)
+
+    def node_of(self, cpu: int) -> int:
+        return next((index for index, node in enumerate(self.numa_nodes) if cpu in node), 0)
+
+
+@dataclass
+class ThreadPlan:
+    """
+    Explicit CPU threading of the server process (`threads` in config.yaml).
+
+    The translator gets `translation_threads` torch intra-op threads, the VAD worker
+    thread its own `vad_threads`, so the two models don't oversubscribe the cores.
+    Budgets count physical cores: SMT siblings share execution units, and dense
+    matrix kernels gain little from them.
+    """
+
+    topology: CPUTopology
+    translation_threads: int
+    vad_threads: int
+    interop_threads: int
+    pin_replicas: bool = True
+    executor_threads: int = 0
+    applied: bool = field(default=False, compare=False)
+
+    @classmethod
+    def from_config(cls, topology: CPUTopology) -> "ThreadPlan":
+        threads_cfg = config.get("threads", {})
+        physical = len(topology.physical_cores)
+        vad_threads = max(1, int(threads_cfg.get("vad_intra_op", 1)))
+        translation_threads = int(threads_cfg.get("translation_intra_op", 0)) or max(1, physical - vad_threads)
+        return cls(
+            topology=topology,
+            translation_threads=translation_threads,
+            vad_threads=vad_threads,
+            interop_threads=max(1, int(threads_cfg.get("inter_op", 1))),
+            pin_replicas=bool(threads_cfg.get("pin_replicas", True)),
+            executor_threads=int(threads_cfg.get("executor_threads", 0)),
+        )
+
+    def replica_cores(self, processes: int, cores_per_replica: int = 0) -> List[List[int]]:
+        """
+        Splits the physical cores between `processes` model replicas, one logical CPU per
+        core, filling one NUMA node before the next so a replica doesn't straddle nodes
+        when it fits into one. Returns an empty list per replica if pinning is disabled.
+        """
+        if not self.pin_replicas:
+            return [[] for _ in range(processes)]
+        primary = sorted(
+            (siblings[0] for siblings in self.topology.physical_cores),
+            key=lambda cpu: (self.topology.node_of(cpu), cpu),
+        )
+        per_replica = cores_per_replica or max(1, len(primary) // processes)
+        return [
+            [primary[(index * per_replica + offset) % len(primary)] for offset in range(per_replica)]
+            for index in range(processes)
+        ]
+
+    def snapshot(self) -> dict:
+        return {
+            "applied": self.applied,
+            "physical_cores": len(self.topology.physical_cores),
+            "logical_cpus": self.topology.logical_cpus,
+            "numa_nodes": len(self.topology.numa_nodes),
+            "translation_intra_op": self.translation_threads,
+            "vad_intra_op": self.vad_threads,
+            "inter_op": self.interop_threads,
+            "pin_replicas": self.pin_replicas,
+            "executor_threads": self.executor_threads,
+        }
+
+
+def _set_thread_budget(threads: int) -> int:
+    torch.set_num_threads(threads)
+    # The first parallel op fixes this thread's pool size; later changes of the default don't affect it
+    torch.ones(2).add_(1)
+    return torch.get_num_threads()
+
+
 class DeviceManager:
+    # Threading plan of this process, once `apply_thread_plan` has run
+    thread_plan: Optional[ThreadPlan] = None
+
     def __init__(self):
         self.device = self._detect_device()
         logger.info(f"Device Manager initialized. Running on: {self.device}")
@@ -35,3 +174,39 @@ class DeviceManager:
         Returns the torch.device object.
         """
         return torch.device(self.device)
+
+    @staticmethod
+    def plan_threads() -> ThreadPlan:
+        """Returns the applied plan, or a fresh one from the detected topology and config."""
+        return DeviceManager.thread_plan or ThreadPlan.from_config(CPUTopology.detect())
+
+    @staticmethod
+    def apply_thread_plan() -> ThreadPlan:
+        """
+        Applies the process-wide part of the plan: the translator's intra-op thread count
+        (inherited by every thread that starts torch work later) and the inter-op pool.
+        Call once at startup, before any model runs.
+        """
+        plan = DeviceManager.plan_threads()
+        torch.set_num_threads(plan.translation_threads)
+        try:
+            torch.set_num_interop_threads(plan.interop_threads)
+        except RuntimeError:
+            # Can only be set before the inter-op pool starts
+            logger.warning("torch inter-op threads were already initialized; keeping them.")
+        plan.applied = True
+        DeviceManager.thread_plan = plan
+        logger.info(f"CPU thread plan: {plan.snapshot()}")
+        return plan
+
+    @staticmethod
+    def dedicate_thread(executor: Executor, threads: int):
+        """
+        Gives the (single) thread of `executor` its own intra-op budget, e.g. the VAD worker.
+
+        torch applies `set_num_threads` to the calling thread and as the default for threads
+        that start torch work later, so the default is restored afterwards.
+        """
+        executor.submit(_set_thread_budget, threads).result()
+        if DeviceManager.thread_plan is not None:
+            torch.set_num_threads(DeviceManager.thread_plan.translation_threads)
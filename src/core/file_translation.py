@@ -0,0 +1,297 @@
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import AsyncIterator, Deque, Iterator, List, Optional, Tuple
+
+import numpy as np
+import soundfile as sf
+from src.core.config import config
+from src.core.inference_scheduler import InferenceScheduler
+from src.core.translator_engine import TranslationText
+from src.core.vad_processor import WINDOW_SIZE_SAMPLES, SileroVADModel, VADProcessor
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+
+STATE_RUNNING = "running"
+STATE_DONE = "done"
+STATE_FAILED = "failed"
+STATE_CANCELLED = "cancelled"
+
+
+@dataclass
+class Segment:
+    """One VAD segment of a file; times are approximate positions in the source, in seconds."""
+
+    index: int
+    start_s: float
+    end_s: float
+    audio: np.ndarray
+
+
+@dataclass
+class TranslatedSegment:
+    index: int
+    start_s: float
+    end_s: float
+    text: str
+    # Translated speech (float32, 16kHz), None for text-only jobs or if the segment failed
+    speech: Optional[np.ndarray] = None
+
+
+class StreamingResampler:
+    """
+    Linear resampling to 16kHz across consecutive blocks, as if the whole file were
+    resampled at once (like `bench_replay.read_wav`, without holding the file in memory).
+    """
+
+    def __init__(self, source_rate: int):
+        self.step = source_rate / SAMPLE_RATE
+        self._previous = np.zeros(0, dtype=np.float32)
+        # Position of the next output sample, relative to the first sample of the next call's input
+        self._position = 0.0
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        if self.step == 1.0:
+            return block
+        # The last sample of the previous block is needed to interpolate up to the new one
+        samples = np.concatenate([self._previous, block])
+        count = max(0, int(np.ceil((len(samples) - 1 - self._position) / self.step)))
+        positions = self._position + np.arange(count) * self.step
+        resampled = np.interp(positions, np.arange(len(samples)), samples).astype(np.float32)
+        self._position += count * self.step - (len(samples) - 1)
+        self._previous = samples[-1:]
+        return resampled
+
+
+class FileSegmenter:
+    """
+    Reads an audio file from disk block by block, downmixes and resamples it to 16kHz
+    mono, and cuts it into sentences with a `VADProcessor` of its own (not the shared
+    `VADEngine`, so a file never delays the windows of live sessions). Only one block
+    and the sentence in progress are held in memory. Blocking: call `read` and `close`
+    in a worker thread.
+    """
+
+    def __init__(self, path: str, model: SileroVADModel, block_s: float = 10.0):
+        """
+        Raises:
+            sf.LibsndfileError: If the file is not a readable audio file.
+        """
+        info = sf.info(path)
+        self.duration_s = info.frames / info.samplerate if info.frames > 0 else None
+        # Nothing would pick up drafts: the whole file is already there
+        self.session = VADProcessor(model, speculative=False)
+        self.finished = False
+        # A cancelled job closes the file while a `read` may still be running in its thread
+        self._lock = threading.Lock()
+        self._resampler = StreamingResampler(info.samplerate)
+        self._file = sf.SoundFile(path)
+        self._block_frames = max(1, int(block_s * info.samplerate))
+        self._samples_done = 0
+        self._next_index = 0
+
+    @property
+    def position_s(self) -> float:
+        """How far into the file the VAD has got."""
+        return self._samples_done / SAMPLE_RATE
+
+    def read(self) -> List[Segment]:
+        """Segments the next block; at the end of the file, also returns the last sentence."""
+        with self._lock:
+            if self._file.closed:
+                self.finished = True
+                return []
+            block = self._file.read(self._block_frames, dtype="float32", always_2d=True)
+            if len(block) == 0:
+                self.finished = True
+                self._file.close()
+                sentence = self.session.flush()
+                return [self._segment(sentence)] if sentence is not None else []
+            return self._segment_block(block)
+
+    def _segment_block(self, block: np.ndarray) -> List[Segment]:
+        self.session.append_audio(self._resampler.process(block.mean(axis=1, dtype=np.float32)))
+        segments = []
+        while self.session.has_window():
+            self._samples_done += WINDOW_SIZE_SAMPLES
+            sentence = self.session.step()
+            if sentence is not None:
+                segments.append(self._segment(sentence))
+        return segments
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+    def _segment(self, audio: np.ndarray) -> Segment:
+        end_s = self.position_s
+        segment = Segment(self._next_index, max(0.0, end_s - len(audio) / SAMPLE_RATE), end_s, audio)
+        self._next_index += 1
+        return segment
+
+
+class FileTranslationJob:
+    """
+    Translates a `FileSegmenter`'s segments through the shared `InferenceScheduler`.
+
+    Segments are submitted as soon as the VAD cuts them, so they are batched with each
+    other (and with live sessions) and spread over all inference workers, while the
+    next block is read and segmented. They are background requests: a job uses the
+    capacity live sessions leave and does not count toward their admission load.
+    `results` yields the translations in file order.
+    At most `max_in_flight` segments are translating or waiting to be consumed; when
+    the consumer (e.g. a slow HTTP client) falls behind, reading stops, so memory stays
+    bounded whatever the length of the file.
+    """
+
+    def __init__(self, segmenter: FileSegmenter, scheduler: InferenceScheduler, tgt_lang: str, speech: bool):
+        self.id = uuid.uuid4().hex[:12]
+        self.segmenter = segmenter
+        self.scheduler = scheduler
+        self.tgt_lang = tgt_lang
+        self.speech = speech
+        file_cfg = config.get("file_translation", {})
+        # 0: twice as many segments as the scheduler can translate at once, so the next batch is always ready
+        self.max_in_flight = int(file_cfg.get("max_in_flight", 0)) or (
+            2 * scheduler.max_batch_size * scheduler.max_concurrent_batches
+        )
+
+        self.state = STATE_RUNNING
+        self.error: Optional[str] = None
+        self.segments_done = 0
+        self.failed_segments = 0
+        self.translated_s = 0.0
+        self.started_at = time.monotonic()
+        self.finished_at: Optional[float] = None
+
+    async def results(self) -> AsyncIterator[TranslatedSegment]:
+        loop = asyncio.get_running_loop()
+        in_flight: Deque[Tuple[Segment, asyncio.Task]] = deque()
+        try:
+            while not self.segmenter.finished:
+                for segment in await loop.run_in_executor(None, self.segmenter.read):
+                    in_flight.append((segment, asyncio.create_task(self._translate(segment))))
+                while len(in_flight) >= self.max_in_flight:
+                    yield await self._next_result(in_flight)
+            while in_flight:
+                yield await self._next_result(in_flight)
+            self.state = STATE_DONE
+        except asyncio.CancelledError:
+            self.state = STATE_CANCELLED
+            raise
+        except GeneratorExit:
+            # The consumer stopped reading (e.g. the client disconnected)
+            self.state = STATE_CANCELLED
+            raise
+        except Exception as e:
+            self.state = STATE_FAILED
+            self.error = str(e)
+            raise
+        finally:
+            for _, task in in_flight:
+                task.cancel()
+            # Waits for a `read` still running in its thread; the consumer closes us with `aclosing`
+            await loop.run_in_executor(None, self.segmenter.close)
+            self.finished_at = time.monotonic()
+
+    async def _next_result(self, in_flight: Deque[Tuple[Segment, asyncio.Task]]) -> TranslatedSegment:
+        segment, task = in_flight[0]
+        try:
+            result = await task
+        except Exception as e:
+            # One bad segment should not cost the rest of an hour-long file
+            logger.error(f"File job {self.id}: segment {segment.index} failed: {e}")
+            self.failed_segments += 1
+            result = TranslatedSegment(segment.index, segment.start_s, segment.end_s, text="")
+        in_flight.popleft()
+        self.segments_done += 1
+        self.translated_s = segment.end_s
+        return result
+
+    async def _translate(self, segment: Segment) -> TranslatedSegment:
+        if not self.speech:
+            text = await self.scheduler.translate_text(segment.audio, self.tgt_lang, background=True)
+            return TranslatedSegment(segment.index, segment.start_s, segment.end_s, text)
+
+        text, pieces = "", []
+        async for piece in self.scheduler.translate_stream(segment.audio, self.tgt_lang, background=True):
+            if isinstance(piece, TranslationText):
+                text = piece.text
+            else:
+                pieces.append(piece.samples)
+        speech = np.concatenate(pieces) if pieces else np.zeros(0, dtype=np.float32)
+        return TranslatedSegment(segment.index, segment.start_s, segment.end_s, text, speech)
+
+    def snapshot(self) -> dict:
+        end = self.finished_at if self.finished_at is not None else time.monotonic()
+        elapsed_s = max(end - self.started_at, 1e-6)
+        duration_s = self.segmenter.duration_s
+        if self.state == STATE_DONE:
+            progress = 1.0
+        else:
+            progress = min(1.0, self.translated_s / duration_s) if duration_s else None
+        return {
+            "id": self.id,
+            "state": self.state,
+            "error": self.error,
+            "tgt_lang": self.tgt_lang,
+            "speech": self.speech,
+            "duration_s": round(duration_s, 2) if duration_s is not None else None,
+            "segmented_s": round(self.segmenter.position_s, 2),
+            "translated_s": round(self.translated_s, 2),
+            "progress": round(progress, 4) if progress is not None else None,
+            "segments": self.segments_done,
+            "failed_segments": self.failed_segments,
+            "elapsed_s": round(elapsed_s, 2),
+            # Seconds of audio translated per second of wall time
+            "speed": round(self.translated_s / elapsed_s, 2),
+        }
+
+
+class SpeechTimeline:
+    """
+    Lays translated speech out along the source timeline: each segment starts at its
+    source position, or right after the previous segment if that one ran longer.
+    Silence is produced in pieces of at most a second, so long pauses cost no memory.
+    """
+
+    def __init__(self):
+        self.cursor = 0  # Samples laid out so far
+
+    def place(self, segment: TranslatedSegment) -> Iterator[np.ndarray]:
+        gap = int(segment.start_s * SAMPLE_RATE) - self.cursor
+        while gap > 0:
+            silence = np.zeros(min(gap, SAMPLE_RATE), dtype=np.float32)
+            gap -= len(silence)
+            self.cursor += len(silence)
+            yield silence
+        if segment.speech is not None and len(segment.speech):
+            self.cursor += len(segment.speech)
+            yield segment.speech
+
+
+class FileJobRegistry:
+    """Keeps the running file jobs and the last `history` finished ones for progress queries."""
+
+    def __init__(self, history: int = 20):
+        self.history = max(0, history)
+        self._jobs: "OrderedDict[str, FileTranslationJob]" = OrderedDict()
+
+    def add(self, job: FileTranslationJob):
+        self._jobs[job.id] = job
+        finished = [job_id for job_id, known in self._jobs.items() if known.finished_at is not None]
+        for job_id in finished[: max(0, len(finished) - self.history)]:
+            del self._jobs[job_id]
+
+    def get(self, job_id: str) -> Optional[FileTranslationJob]:
+        return self._jobs.get(job_id)
+
+    def snapshot(self) -> dict:
+        jobs = [job.snapshot() for job in self._jobs.values()]
+        return {"running": sum(job["state"] == STATE_RUNNING for job in jobs), "jobs": jobs}
@@ -0,0 +1,369 @@
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Callable, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+from src.core.admission import LoadTracker
+from src.core.config import config
+from src.core.metrics import metrics
+from src.core.translator_engine import EncodedSpeech, TranslationOutput
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PendingTranslation:
+    """A single utterance waiting to be translated, plus the future its session awaits."""
+
+    audio: np.ndarray
+    future: asyncio.Future
+    enqueued_at: float = field(default=0.0)
+    # Set for streaming requests: receives each output piece on the event loop
+    on_output: Optional[Callable[[TranslationOutput], None]] = None
+    # Speech encoder output computed ahead of time (speculative encoding)
+    encoded: Optional[EncodedSpeech] = None
+    # Throughput work (file jobs) that takes whatever capacity live sessions leave; not counted as live load
+    background: bool = False
+
+
+# Kinds of batched work
+TASK_TRANSLATE = "translate"
+TASK_STREAM = "stream"
+TASK_ENCODE = "encode"
+TASK_TEXT = "text"
+
+# Pending requests are grouped by (task, target language)
+BatchKey = Tuple[str, str]
+
+
+class InferenceScheduler:
+    """
+    Central dynamic batching scheduler for the shared TranslatorEngine.
+
+    All WebSocket sessions submit their utterances here instead of calling the engine
+    directly. Pending utterances are grouped by target language and dispatched as one
+    padded `translate_batch` call as soon as either `max_batch_size` utterances are
+    waiting or the oldest one has waited `max_wait_ms`. Only one batch runs at a time
+    per model replica (`translator.concurrency`, 1 for the in-process engine), so the
+    model never competes with itself for CPU cores; utterances arriving while all
+    replicas are busy simply form the next batch.
+
+    Streaming requests are batched separately from whole-WAV ones and receive their
+    text and speech pieces while their batch is still running. Encode-only requests
+    (speculative encoding of a sentence that is not finished yet) form batches of
+    their own as well, and so do text-only requests, which skip speech synthesis.
+    Multi-target sessions encode an utterance once and then queue one request per
+    language that reuses the encoding (`translate_fanout`, `translate_text_fanout`).
+
+    The scheduler measures the translator's real-time factor and the live demand on it
+    (`load`), which the `AdmissionController` turns into capacity decisions. Background
+    requests (file jobs) are served after live ones and are not part of the demand.
+    """
+
+    def __init__(self, translator):
+        self.translator = translator
+
+        batching_cfg = config.get("models", {}).get("translation", {}).get("batching", {})
+        self.max_batch_size = max(1, int(batching_cfg.get("max_batch_size", 8)))
+        self.max_wait_s = batching_cfg.get("max_wait_ms", 50) / 1000.0
+
+        # Batches that may run at the same time, e.g. one per `InferenceWorkerPool` process
+        self.max_concurrent_batches = max(1, int(getattr(translator, "concurrency", 1)))
+
+        self._pending: Dict[BatchKey, List[PendingTranslation]] = {}
+        self._wakeup = asyncio.Event()
+        self._worker: Optional[asyncio.Task] = None
+        self._running: Set[asyncio.Task] = set()
+
+        self.load = LoadTracker(window_s=float(config.get("admission", {}).get("window_s", 30)))
+        # Seconds of audio in the batches that are running (encode-only batches excluded)
+        self._running_audio_s = 0.0
+
+    def start(self):
+        """Starts the dispatcher task on the running event loop."""
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._dispatch_loop())
+            logger.info(
+                f"Inference scheduler started (max_batch_size={self.max_batch_size}, "
+                f"max_wait_ms={self.max_wait_s * 1000:.0f})."
+            )
+
+    async def stop(self):
+        """Stops the dispatcher and cancels every utterance that is still waiting or running."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        for task in list(self._running):
+            task.cancel()
+        if self._running:
+            await asyncio.wait(self._running)
+
+        for requests in self._pending.values():
+            for request in requests:
+                request.future.cancel()
+        self._pending.clear()
+
+    async def translate(self, audio_np: np.ndarray, tgt_lang: str, encoded: Optional[EncodedSpeech] = None) -> bytes:
+        """
+        Queues an utterance for batched translation and waits for its result.
+
+        Args:
+            audio_np (np.ndarray): Input audio (16kHz, float32).
+            tgt_lang (str): Target language code.
+            encoded (EncodedSpeech, optional): Encoder output of `audio_np` from `encode`.
+
+        Returns:
+            bytes: Synthesized audio as WAV file (in-memory).
+        """
+        loop = asyncio.get_running_loop()
+        request = PendingTranslation(
+            audio=audio_np, future=loop.create_future(), enqueued_at=loop.time(), encoded=encoded
+        )
+        self._enqueue((TASK_TRANSLATE, tgt_lang), request)
+        return await request.future
+
+    async def translate_stream(
+        self,
+        audio_np: np.ndarray,
+        tgt_lang: str,
+        encoded: Optional[EncodedSpeech] = None,
+        background: bool = False,
+    ) -> AsyncIterator[TranslationOutput]:
+        """
+        Queues an utterance for batched streaming translation and yields its output pieces:
+        first a `TranslationText`, then consecutive `TranslationAudio` pieces.
+
+        Args:
+            audio_np (np.ndarray): Input audio (16kHz, float32).
+            tgt_lang (str): Target language code.
+            encoded (EncodedSpeech, optional): Encoder output of `audio_np` from `encode`.
+            background (bool): Throughput work, e.g. a file job (see `PendingTranslation`).
+        """
+        loop = asyncio.get_running_loop()
+        pieces: asyncio.Queue = asyncio.Queue()
+        request = PendingTranslation(
+            audio=audio_np,
+            future=loop.create_future(),
+            enqueued_at=loop.time(),
+            on_output=pieces.put_nowait,
+            encoded=encoded,
+            background=background,
+        )
+        # Pieces are delivered before the batch completes, so the end marker always comes last
+        request.future.add_done_callback(lambda _: pieces.put_nowait(None))
+        self._enqueue((TASK_STREAM, tgt_lang), request)
+
+        try:
+            while (piece := await pieces.get()) is not None:
+                yield piece
+            request.future.result()  # Re-raise a failed batch
+        finally:
+            if not request.future.done():
+                request.future.cancel()
+
+    async def translate_text(
+        self,
+        audio_np: np.ndarray,
+        tgt_lang: str,
+        encoded: Optional[EncodedSpeech] = None,
+        background: bool = False,
+    ) -> str:
+        """
+        Queues an utterance for batched text-only translation (no speech synthesis) and
+        waits for its translated text.
+        """
+        loop = asyncio.get_running_loop()
+        request = PendingTranslation(
+            audio=audio_np, future=loop.create_future(), enqueued_at=loop.time(), encoded=encoded, background=background
+        )
+        self._enqueue((TASK_TEXT, tgt_lang), request)
+        return await request.future
+
+    async def encode(self, audio_np: np.ndarray) -> EncodedSpeech:
+        """
+        Queues an utterance for the speech encoder only; the result can later be passed
+        to `translate`/`translate_stream` for the same audio to skip the encoder there.
+
+        Cancelling the returned awaitable before its batch starts drops the request.
+        """
+        loop = asyncio.get_running_loop()
+        request = PendingTranslation(audio=audio_np, future=loop.create_future(), enqueued_at=loop.time())
+        self._enqueue((TASK_ENCODE, ""), request)
+        return await request.future
+
+    async def translate_fanout(
+        self, audio_np: np.ndarray, tgt_langs: List[str], encoded: Optional[EncodedSpeech] = None
+    ) -> Dict[str, bytes]:
+        """
+        Translates one utterance into several target languages with a single encoder pass.
+
+        The speech encoder output does not depend on the target language, so it is computed
+        once (unless already given) and every per-language request decodes from it. Each of
+        those requests is still batched with other sessions' utterances of that language.
+
+        Args:
+            audio_np (np.ndarray): Input audio (16kHz, float32).
+            tgt_langs (List[str]): Target language codes.
+            encoded (EncodedSpeech, optional): Encoder output of `audio_np` from `encode`.
+
+        Returns:
+            Dict[str, bytes]: Synthesized WAV file (in-memory) per target language.
+        """
+        encoded = await self.encode_for_fanout(audio_np, len(tgt_langs), encoded)
+        results = await asyncio.gather(*(self.translate(audio_np, lang, encoded) for lang in tgt_langs))
+        return dict(zip(tgt_langs, results))
+
+    async def translate_text_fanout(
+        self, audio_np: np.ndarray, tgt_langs: List[str], encoded: Optional[EncodedSpeech] = None
+    ) -> Dict[str, str]:
+        """Like `translate_fanout`, but returns the translated text per target language."""
+        encoded = await self.encode_for_fanout(audio_np, len(tgt_langs), encoded)
+        results = await asyncio.gather(*(self.translate_text(audio_np, lang, encoded) for lang in tgt_langs))
+        return dict(zip(tgt_langs, results))
+
+    async def encode_for_fanout(
+        self, audio_np: np.ndarray, target_count: int, encoded: Optional[EncodedSpeech] = None
+    ) -> Optional[EncodedSpeech]:
+        """
+        Returns the encoding to share between `target_count` translations of the same audio.
+
+        A single target encodes as part of its own translate batch, so nothing is done ahead.
+        """
+        if encoded is not None or target_count < 2:
+            return encoded
+        return await self.encode(audio_np)
+
+    def _enqueue(self, key: BatchKey, request: PendingTranslation):
+        if key[0] != TASK_ENCODE and not request.background:
+            # Encodings are reused by the translation that follows; counting both would double the demand
+            self.load.record_arrival(len(request.audio) / 16000)
+        self._pending.setdefault(key, []).append(request)
+        self._wakeup.set()
+
+    def pending_count(self) -> int:
+        """Returns the number of utterances waiting for a batch slot."""
+        return sum(len(requests) for requests in self._pending.values())
+
+    def backlog_seconds(self) -> float:
+        """
+        Seconds of audio waiting for a batch or being translated (encode-only and waiting
+        background requests excluded).
+        """
+        pending_samples = sum(
+            len(request.audio)
+            for (task, _), requests in self._pending.items()
+            if task != TASK_ENCODE
+            for request in requests
+            if not (request.background or request.future.done())
+        )
+        return pending_samples / 16000 + self._running_audio_s
+
+    async def _dispatch_loop(self):
+        slots = asyncio.Semaphore(self.max_concurrent_batches)
+        while True:
+            # A batch is only formed once a replica is free to run it, so it can still grow meanwhile
+            await slots.acquire()
+            key, batch = await self._next_batch()
+            if not batch:
+                slots.release()
+                continue
+            task = asyncio.create_task(self._run_batch(key, batch))
+            self._running.add(task)
+            task.add_done_callback(lambda done: (self._running.discard(done), slots.release()))
+
+    async def _next_batch(self):
+        """
+        Waits until a batch is ready and removes it from the pending queues.
+
+        A group with `max_batch_size` utterances waiting is served at once; otherwise the
+        group whose oldest utterance has waited longest is served first (when its
+        `max_wait_ms` is up), which keeps a busy language from starving the others. Live
+        requests come before background ones, both when choosing the group and within its batch.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            while not self._pending:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+
+            # A group that already fills a batch is served right away, without waiting for an older one
+            full = [key for key, requests in self._pending.items() if len(requests) >= self.max_batch_size]
+            key = min(full or self._pending, key=self._priority)
+            remaining = self._pending[key][0].enqueued_at + self.max_wait_s - loop.time()
+            if full or remaining <= 0:
+                break
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=remaining)
+            except asyncio.TimeoutError:
+                pass
+
+        # Stable: live and background requests each stay in arrival order
+        requests = sorted(self._pending.pop(key), key=lambda request: request.background)
+        batch, overflow = requests[: self.max_batch_size], requests[self.max_batch_size :]
+        if overflow:
+            self._pending[key] = overflow
+
+        # Sessions that disconnected while waiting cancel their futures; don't spend compute on them
+        return key, [request for request in batch if not request.future.done()]
+
+    def _priority(self, key: BatchKey) -> Tuple[bool, float]:
+        requests = self._pending[key]
+        live = [request.enqueued_at for request in requests if not request.background]
+        return (False, min(live)) if live else (True, requests[0].enqueued_at)
+
+    async def _run_batch(self, key: BatchKey, batch: List[PendingTranslation]):
+        task, tgt_lang = key
+        logger.info(f"Dispatching {task} batch: {len(batch)} utterance(s) -> {tgt_lang or '-'}")
+        loop = asyncio.get_running_loop()
+        for request in batch:
+            metrics.observe("pipeline_stage_seconds", loop.time() - request.enqueued_at, stage="scheduler_wait")
+        audio_batch = [request.audio for request in batch]
+        encoded = [request.encoded for request in batch]
+
+        def emit(index: int, piece: TranslationOutput):
+            # Called from the executor thread
+            loop.call_soon_threadsafe(batch[index].on_output, piece)
+
+        audio_s = 0.0 if task == TASK_ENCODE else sum(len(audio) for audio in audio_batch) / 16000
+        self._running_audio_s += audio_s
+        started = loop.time()
+        try:
+            if task == TASK_ENCODE:
+                results = await loop.run_in_executor(None, self.translator.encode_batch, audio_batch)
+            elif task == TASK_STREAM:
+                await loop.run_in_executor(
+                    None, self.translator.translate_batch_streaming, audio_batch, tgt_lang, emit, encoded
+                )
+                results = [None] * len(batch)
+            elif task == TASK_TEXT:
+                results = await loop.run_in_executor(
+                    None, self.translator.translate_text_batch, audio_batch, tgt_lang, encoded
+                )
+            else:
+                results = await loop.run_in_executor(
+                    None, self.translator.translate_batch, audio_batch, tgt_lang, encoded
+                )
+        except asyncio.CancelledError:
+            # `stop()`: the callers must not wait for a result that never comes
+            for request in batch:
+                request.future.cancel()
+            raise
+        except Exception as e:
+            logger.error(f"Batched {task} failed: {e}")
+            for request in batch:
+                if not request.future.done():
+                    request.future.set_exception(e)
+            return
+        finally:
+            self._running_audio_s -= audio_s
+        self.load.record_batch(audio_s, loop.time() - started)
+
+        for request, result in zip(batch, results):
+            if not request.future.done():
+                request.future.set_result(result)
@@ -0,0 +1,499 @@
+import functools
+import logging
+import multiprocessing
+import os
+import sys
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from multiprocessing.connection import Connection
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import torch
+from src.core.config import config
+from src.core.device_manager import DeviceManager
+from src.core.speech_cache import SpeechCache
+from src.core.translator_engine import EncodedSpeech, TranslationAudio, TranslationOutput, TranslationText
+
+logger = logging.getLogger(__name__)
+
+# (byte offset, dtype string, shape) of each array in a shared memory block
+ArrayLayout = List[Tuple[int, str, Tuple[int, ...]]]
+
+
+def write_shared(arrays: Sequence[np.ndarray], track: bool = True) -> Tuple[SharedMemory, ArrayLayout]:
+    """
+    Copies arrays back to back into a new shared memory block.
+
+    The block is handed to another process by name; the receiver copies the arrays out
+    with `read_shared`. The creator keeps the returned handle and closes it when done.
+    Pass `track=False` if the receiver unlinks the block (see `_open_shared`).
+    """
+    layout, offset = [], 0
+    for array in arrays:
+        offset = (offset + 15) // 16 * 16  # Keep every array aligned
+        layout.append((offset, array.dtype.str, array.shape))
+        offset += array.nbytes
+    block = _open_shared(track, create=True, size=max(1, offset))
+    for array, (start, dtype, shape) in zip(arrays, layout):
+        np.ndarray(shape, dtype=dtype, buffer=block.buf, offset=start)[...] = array
+    return block, layout
+
+
+def read_shared(name: str, layout: ArrayLayout, unlink: bool = False) -> List[np.ndarray]:
+    """Copies the arrays out of a shared memory block (and removes the block if `unlink`)."""
+    # Only the process that unlinks a block may track it (see `_open_shared`)
+    block = _open_shared(unlink, name=name)
+    try:
+        return [np.ndarray(shape, dtype=dtype, buffer=block.buf, offset=start).copy() for start, dtype, shape in layout]
+    finally:
+        block.close()
+        if unlink:
+            block.unlink()
+
+
+def _open_shared(track: bool, **kwargs) -> SharedMemory:
+    """
+    Creates or attaches to a shared memory block. Before Python 3.13, every block is
+    registered with the process's resource tracker, which unlinks it (and warns about a
+    leak) when the process exits, even if another process still owns it; untracked
+    blocks are left to the process that unlinks them.
+    """
+    if sys.version_info >= (3, 13):
+        return SharedMemory(track=track, **kwargs)
+    block = SharedMemory(**kwargs)
+    if not track and os.name == "posix":  # Windows frees blocks with their last handle instead
+        resource_tracker.unregister(block._name, "shared_memory")
+    return block
+
+
+def _pack_encodings(encoded: Sequence[Optional[EncodedSpeech]], arrays: List[np.ndarray]) -> List[Optional[tuple]]:
+    """Appends the encodings to `arrays`; returns the array indices of each (None where missing)."""
+    spec = []
+    for item in encoded:
+        if item is None:
+            spec.append(None)
+            continue
+        spec.append((len(arrays), len(arrays) + 1))
+        arrays += [item.input_features.float().cpu().numpy(), item.hidden_states.float().cpu().numpy()]
+    return spec
+
+
+def engine_factory():
+    """Builds the model replica of one worker process (the default `InferenceWorkerPool` factory)."""
+    from src.core.device_manager import DeviceManager
+    from src.core.translator_engine import TranslatorEngine
+
+    return TranslatorEngine(DeviceManager())
+
+
+class _WorkerReply:
+    """Builds the replies of a worker process; numpy payloads travel through shared memory."""
+
+    def __init__(self, conn: Connection):
+        self.conn = conn
+
+    def send(self, request_id: int, kind: str, value=None, arrays: Sequence[np.ndarray] = ()):
+        if not arrays:
+            self.conn.send((request_id, kind, value, None, None))
+            return
+        # The API process copies the block out and unlinks it
+        block, layout = write_shared(arrays, track=False)
+        try:
+            self.conn.send((request_id, kind, value, block.name, layout))
+        finally:
+            block.close()
+
+    def piece(self, request_id: int, position: int, piece: TranslationOutput):
+        """Forwards one streamed piece of `translate_batch_streaming`."""
+        if isinstance(piece, TranslationText):
+            self.send(request_id, "text", (position, piece.text))
+        else:
+            self.send(request_id, "audio", position, arrays=[piece.samples])
+
+
+@dataclass
+class _WorkerRequest:
+    """One batch call as received by a worker process."""
+
+    id: int
+    method: str
+    tgt_lang: Optional[str]
+    audio_batch: List[np.ndarray]
+    encoded: Optional[List[Optional[EncodedSpeech]]]
+
+
+def _decode_encodings(engine, spec, arrays: List[np.ndarray]) -> Optional[List[Optional[EncodedSpeech]]]:
+    if spec is None:
+        return None
+    device, dtype = getattr(engine, "device", "cpu"), getattr(engine, "dtype", torch.float32)
+    return [
+        (
+            None
+            if item is None
+            else EncodedSpeech(
+                input_features=torch.from_numpy(arrays[item[0]]).to(device, dtype),
+                hidden_states=torch.from_numpy(arrays[item[1]]).to(device, dtype),
+            )
+        )
+        for item in spec
+    ]
+
+
+def _read_request(engine, request_id, method, tgt_lang, name, layout, encoded_spec) -> _WorkerRequest:
+    arrays = read_shared(name, layout) if name else []
+    audio_batch = arrays[: len(layout) - 2 * sum(item is not None for item in encoded_spec or [])]
+    return _WorkerRequest(request_id, method, tgt_lang, audio_batch, _decode_encodings(engine, encoded_spec, arrays))
+
+
+def _serve_warmup(engine, reply: _WorkerReply, request: _WorkerRequest):
+    engine.warmup()
+    reply.send(request.id, "result")
+
+
+def _serve_translate_batch(engine, reply: _WorkerReply, request: _WorkerRequest):
+    wavs = engine.translate_batch(request.audio_batch, request.tgt_lang, request.encoded)
+    reply.send(request.id, "result", arrays=[np.frombuffer(wav, dtype=np.uint8) for wav in wavs])
+
+
+def _serve_translate_text_batch(engine, reply: _WorkerReply, request: _WorkerRequest):
+    texts = engine.translate_text_batch(request.audio_batch, request.tgt_lang, request.encoded)
+    reply.send(request.id, "result", texts)
+
+
+def _serve_translate_batch_streaming(engine, reply: _WorkerReply, request: _WorkerRequest):
+    emit = functools.partial(reply.piece, request.id)
+    engine.translate_batch_streaming(request.audio_batch, request.tgt_lang, emit, request.encoded)
+    reply.send(request.id, "result")
+
+
+def _serve_encode_batch(engine, reply: _WorkerReply, request: _WorkerRequest):
+    payload: List[np.ndarray] = []
+    spec = _pack_encodings(engine.encode_batch(request.audio_batch), payload)
+    reply.send(request.id, "result", spec, arrays=payload)
+
+
+_HANDLERS: Dict[str, Callable[[object, _WorkerReply, _WorkerRequest], None]] = {
+    "warmup": _serve_warmup,
+    "translate_batch": _serve_translate_batch,
+    "translate_text_batch": _serve_translate_text_batch,
+    "translate_batch_streaming": _serve_translate_batch_streaming,
+    "encode_batch": _serve_encode_batch,
+}
+
+
+def _serve(engine, reply: _WorkerReply, message: tuple):
+    """Runs one request and sends its result or error."""
+    request_id, method = message[0], message[1]
+    try:
+        if method not in _HANDLERS:
+            raise ValueError(f"Unknown method {method}")
+        _HANDLERS[method](engine, reply, _read_request(engine, *message))
+    except Exception as e:
+        reply.send(request_id, "error", f"{type(e).__name__}: {e}")
+    if method in ("translate_batch", "translate_batch_streaming") and getattr(engine, "speech_cache", None):
+        # Unsolicited, so that the API process can report the cache without asking
+        reply.send(-1, "speech_cache", engine.speech_cache.snapshot())
+
+
+def _load_replica(index: int, cores: List[int], threads: int, factory: Callable, reply: _WorkerReply):
+    """Pins the worker process, builds its engine and reports ready (or the error, returning None)."""
+    logging.basicConfig(
+        level=logging.INFO, format=f"%(asctime)s - worker{index} - %(name)s - %(levelname)s - %(message)s"
+    )
+    if cores and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cores)
+    torch.set_num_threads(threads)
+    try:
+        engine = factory()
+    except Exception as e:
+        reply.send(-1, "error", f"{type(e).__name__}: {e}")
+        return None
+    info = {
+        "speech_enabled": getattr(engine, "speech_enabled", True),
+        "speech_languages": sorted(engine.speech_languages) if hasattr(engine, "speech_languages") else None,
+        "loaded_from_cache": getattr(engine, "loaded_from_cache", False),
+    }
+    reply.send(-1, "ready", info)
+    return engine
+
+
+def _worker_main(index: int, cores: List[int], threads: int, factory: Callable, conn: Connection):
+    """Entry point of a worker process: loads one model replica and serves requests until the pipe closes."""
+    reply = _WorkerReply(conn)
+    engine = _load_replica(index, cores, threads, factory, reply)
+    if engine is None:
+        return
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            if hasattr(engine, "close"):
+                engine.close()
+            return
+        _serve(engine, reply, message)
+
+
+@dataclass
+class _PendingCall:
+    future: Future
+    load: float
+    emit: Optional[Callable[[int, TranslationOutput], None]] = None
+
+
+@dataclass
+class InferenceWorker:
+    """API-side handle of one worker process."""
+
+    index: int
+    cores: List[int]
+    process: multiprocessing.Process
+    conn: Connection
+    send_lock: threading.Lock = field(default_factory=threading.Lock)
+    pending: Dict[int, _PendingCall] = field(default_factory=dict)
+    load: float = 0.0  # Seconds of audio in flight
+    alive: bool = True
+    info: dict = field(default_factory=dict)
+
+
+class InferenceWorkerPool:
+    """
+    Runs N model replicas in separate processes, each pinned to its own slice of physical
+    cores (`ThreadPlan.replica_cores`).
+
+    Exposes the same batch methods as `TranslatorEngine`, so `InferenceScheduler` uses it
+    in place of the in-process engine and keeps up to `concurrency` batches running at
+    once. Each batch goes to the worker with the least audio in flight.
+
+    Audio goes to a worker as one shared memory block per batch: only the block name and
+    array layout are pickled through the pipe. WAVs, streamed speech pieces and speech
+    encodings come back the same way. Text and small control messages go through the pipe.
+
+    Per-stage latency metrics are recorded inside the worker processes and therefore
+    not exported on the API process's `/metrics`; `scheduler_wait` and the per-utterance
+    figures still are.
+    """
+
+    def __init__(self, processes: int, cores_per_worker: int = 0, factory: Callable = engine_factory):
+        self.processes = max(1, processes)
+        plan = DeviceManager.plan_threads()
+        # Physical cores, NUMA node by node (or no pinning, see `ThreadPlan.replica_cores`)
+        self.core_slices = plan.replica_cores(self.processes, cores_per_worker)
+        per_worker = cores_per_worker or max(1, len(plan.topology.physical_cores) // self.processes)
+        self.threads = [len(cores) or per_worker for cores in self.core_slices]
+        self.factory = factory
+        self.workers: List[InferenceWorker] = []
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self._closing = False
+
+    @classmethod
+    def from_config(cls) -> Optional["InferenceWorkerPool"]:
+        """Returns a pool if `models.translation.workers.processes` is set, else None (in-process engine)."""
+        workers_cfg = config.get("models", {}).get("translation", {}).get("workers", {})
+        processes = int(workers_cfg.get("processes", 0))
+        if processes <= 0:
+            return None
+        return cls(processes, int(workers_cfg.get("cores_per_worker", 0)))
+
+    @property
+    def concurrency(self) -> int:
+        return self.processes
+
+    @property
+    def speech_enabled(self) -> bool:
+        return all(worker.info.get("speech_enabled", True) for worker in self.workers)
+
+    def supports_speech(self, tgt_lang: str) -> bool:
+        """See `TranslatorEngine.supports_speech`; every replica has to support the language."""
+        return all(
+            worker.info.get("speech_languages") is None or tgt_lang in worker.info["speech_languages"]
+            for worker in self.workers
+        )
+
+    @property
+    def loaded_from_cache(self) -> bool:
+        return all(worker.info.get("loaded_from_cache", False) for worker in self.workers)
+
+    def start(self):
+        """
+        Starts the workers and blocks until every replica is loaded. The first worker
+        loads alone, so that it fills the model cache which the others then map.
+        """
+        context = multiprocessing.get_context("spawn")
+        for index, cores in enumerate(self.core_slices):
+            parent, child = context.Pipe()
+            process = context.Process(
+                target=_worker_main,
+                args=(index, cores, self.threads[index], self.factory, child),
+                name=f"inference-worker-{index}",
+                daemon=True,
+            )
+            process.start()
+            child.close()
+            self.workers.append(InferenceWorker(index=index, cores=cores, process=process, conn=parent))
+            if index == 0:
+                self._await_ready(self.workers[0])
+
+        for worker in self.workers[1:]:
+            self._await_ready(worker)
+        for worker in self.workers:
+            threading.Thread(
+                target=self._read_replies, args=(worker,), name=f"worker{worker.index}-replies", daemon=True
+            ).start()
+        logger.info(f"Started {self.processes} inference worker process(es) on cores {self.core_slices}.")
+
+    def _await_ready(self, worker: InferenceWorker):
+        try:
+            _, kind, value, _, _ = worker.conn.recv()
+        except EOFError:
+            kind, value = "error", f"exit code {worker.process.exitcode}"
+        if kind != "ready":
+            self.close()
+            raise RuntimeError(f"Inference worker {worker.index} failed to start: {value}")
+        worker.info = value
+
+    def close(self):
+        """Stops all workers; requests still in flight fail."""
+        self._closing = True
+        for worker in self.workers:
+            worker.conn.close()
+        for worker in self.workers:
+            worker.process.join(timeout=10)
+            if worker.process.is_alive():
+                worker.process.terminate()
+        self.workers.clear()
+
+    def snapshot(self) -> List[dict]:
+        return [
+            {
+                "index": worker.index,
+                "alive": worker.alive,
+                "cores": len(worker.cores),
+                "in_flight": len(worker.pending),
+                "in_flight_audio_s": round(worker.load, 2),
+            }
+            for worker in self.workers
+        ]
+
+    def speech_cache_snapshot(self) -> Optional[dict]:
+        """The speech caches of all replicas, added up (as of each replica's latest translation)."""
+        return SpeechCache.merge(
+            [worker.info["speech_cache"] for worker in self.workers if "speech_cache" in worker.info]
+        )
+
+    # --- TranslatorEngine interface (called from executor threads) ---
+
+    def translate_batch(
+        self, audio_batch: List[np.ndarray], tgt_lang: Optional[str] = None, encoded=None
+    ) -> List[bytes]:
+        arrays = self._call("translate_batch", audio_batch, tgt_lang, encoded)[1]
+        return [array.tobytes() for array in arrays]
+
+    def translate_text_batch(
+        self, audio_batch: List[np.ndarray], tgt_lang: Optional[str] = None, encoded=None
+    ) -> List[str]:
+        return self._call("translate_text_batch", audio_batch, tgt_lang, encoded)[0]
+
+    def translate_batch_streaming(
+        self,
+        audio_batch: List[np.ndarray],
+        tgt_lang: str,
+        emit: Callable[[int, TranslationOutput], None],
+        encoded=None,
+    ):
+        self._call("translate_batch_streaming", audio_batch, tgt_lang, encoded, emit=emit)
+
+    def encode_batch(self, audio_batch: List[np.ndarray]) -> List[Optional[EncodedSpeech]]:
+        spec, arrays = self._call("encode_batch", audio_batch)
+        return [
+            (
+                None
+                if item is None
+                else EncodedSpeech(
+                    input_features=torch.from_numpy(arrays[item[0]]), hidden_states=torch.from_numpy(arrays[item[1]])
+                )
+            )
+            for item in spec
+        ]
+
+    def warmup(self):
+        """Warms up every replica (in parallel)."""
+        calls = [self._submit(worker, "warmup", [], None, None) for worker in self.workers]
+        for future in calls:
+            future.result()
+
+    # --- Routing and transport ---
+
+    def _call(self, method, audio_batch, tgt_lang=None, encoded=None, emit=None):
+        with self._lock:
+            candidates = [worker for worker in self.workers if worker.alive]
+            if not candidates:
+                raise RuntimeError("No inference worker is running")
+            worker = min(candidates, key=lambda candidate: candidate.load)
+        return self._submit(worker, method, audio_batch, tgt_lang, encoded, emit).result()
+
+    def _submit(self, worker, method, audio_batch, tgt_lang, encoded, emit=None) -> Future:
+        arrays = [np.ascontiguousarray(audio, dtype=np.float32) for audio in audio_batch]
+        encoded_spec = None
+        if encoded is not None and any(item is not None for item in encoded):
+            encoded_spec = _pack_encodings(encoded, arrays)
+
+        load = sum(len(audio) for audio in audio_batch) / 16000
+        call = _PendingCall(future=Future(), load=load, emit=emit)
+        block, layout = write_shared(arrays) if arrays else (None, [])
+        with self._lock:
+            request_id = self._next_id
+            self._next_id += 1
+            worker.pending[request_id] = call
+            worker.load += load
+        call.future.add_done_callback(lambda _: self._release(worker, request_id, block))
+
+        try:
+            with worker.send_lock:
+                worker.conn.send((request_id, method, tgt_lang, block.name if block else None, layout, encoded_spec))
+        except (OSError, ValueError) as e:
+            call.future.set_exception(RuntimeError(f"Inference worker {worker.index} is gone: {e}"))
+        return call.future
+
+    def _release(self, worker: InferenceWorker, request_id: int, block: Optional[SharedMemory]):
+        with self._lock:
+            call = worker.pending.pop(request_id, None)
+            if call is not None:
+                worker.load -= call.load
+        if block is not None:
+            block.close()
+            block.unlink()
+
+    def _read_replies(self, worker: InferenceWorker):
+        """Reply reader thread of one worker: resolves futures and forwards streamed pieces."""
+        while True:
+            try:
+                request_id, kind, value, name, layout = worker.conn.recv()
+            except (EOFError, OSError):
+                break
+            if kind == "speech_cache":
+                worker.info["speech_cache"] = value
+                continue
+            arrays = read_shared(name, layout, unlink=True) if name else []
+            call = worker.pending.get(request_id)
+            if call is None:
+                continue
+            if kind == "text":
+                call.emit(value[0], TranslationText(text=value[1]))
+            elif kind == "audio":
+                call.emit(value, TranslationAudio(samples=arrays[0]))
+            elif kind == "error":
+                call.future.set_exception(RuntimeError(f"Inference worker {worker.index}: {value}"))
+            else:
+                call.future.set_result((value, arrays))
+
+        worker.alive = False
+        if not self._closing:
+            logger.error(f"Inference worker {worker.index} exited (code {worker.process.exitcode}).")
+        for call in list(worker.pending.values()):
+            if not call.future.done():
+                call.future.set_exception(RuntimeError(f"Inference worker {worker.index} exited"))
@@ -0,0 +1,54 @@
+import asyncio
+import logging
+from collections import deque
+from typing import Deque, Dict, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class EventLoopMonitor:
+    """
+    Measures event-loop lag: how much later than scheduled a periodic timer wakes up.
+
+    Any blocking work on the loop (inference, disk I/O, heavy numpy) shows up directly as
+    lag, delaying `receive()` and `send_bytes()` for every connected client.
+    """
+
+    def __init__(self, interval_ms: int = 100, window_size: int = 600):
+        self.interval_s = interval_ms / 1000.0
+        self._lags_ms: Deque[float] = deque(maxlen=window_size)
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def snapshot(self) -> Dict[str, float]:
+        """Returns lag statistics (milliseconds) over the recent measurement window."""
+        if not self._lags_ms:
+            return {"last_ms": 0.0, "mean_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+        lags = np.fromiter(self._lags_ms, dtype=np.float64)
+        return {
+            "last_ms": round(lags[-1], 3),
+            "mean_ms": round(float(lags.mean()), 3),
+            "p99_ms": round(float(np.percentile(lags, 99)), 3),
+            "max_ms": round(float(lags.max()), 3),
+        }
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected_wakeup = loop.time() + self.interval_s
+            await asyncio.sleep(self.interval_s)
+            self._lags_ms.append(max(0.0, loop.time() - expected_wakeup) * 1000.0)
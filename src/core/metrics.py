@@ -0,0 +1,120 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Deque, Dict, Iterator, List, Tuple
+
+import numpy as np
+
+# Label set of one series, e.g. (("stage", "vocoder"),)
+Labels = Tuple[Tuple[str, str], ...]
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class LatencySummary:
+    """
+    Count, sum and recent observations of one series.
+
+    Recording is an append under a lock, cheap enough for every window and every stage;
+    quantiles are only computed when the metrics are scraped. They cover the last
+    `window_size` observations, like the lag statistics of `EventLoopMonitor`.
+    """
+
+    def __init__(self, window_size: int):
+        self.count = 0
+        self.total = 0.0
+        self._recent: Deque[float] = deque(maxlen=window_size)
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        with self._lock:
+            self.count += 1
+            self.total += value
+            self._recent.append(value)
+
+    def quantiles(self) -> List[Tuple[float, float]]:
+        with self._lock:
+            recent = np.fromiter(self._recent, dtype=np.float64)
+        if not len(recent):
+            return [(quantile, 0.0) for quantile in QUANTILES]
+        return list(zip(QUANTILES, np.quantile(recent, QUANTILES).tolist()))
+
+
+class MetricsRegistry:
+    """
+    Process-wide pipeline metrics, rendered in the Prometheus text exposition format.
+
+    Latencies are recorded as summaries (p50/p95/p99 over a recent window, plus totals).
+    Gauges are callbacks evaluated at scrape time, so components don't have to push
+    their current depth or session counts anywhere.
+    """
+
+    def __init__(self, window_size: int = 1024):
+        self.window_size = window_size
+        self._summaries: Dict[str, Dict[Labels, LatencySummary]] = {}
+        self._help: Dict[str, str] = {}
+        self._gauges: Dict[str, Tuple[str, Callable[[], Dict[Labels, float]]]] = {}
+        self._lock = threading.Lock()
+
+    def describe(self, name: str, help_text: str):
+        self._help[name] = help_text
+
+    def observe(self, name: str, value: float, **labels: str):
+        series = self._summaries.get(name, {}).get(tuple(sorted(labels.items())))
+        if series is None:
+            series = self._create_series(name, tuple(sorted(labels.items())))
+        series.observe(value)
+
+    @contextmanager
+    def span(self, stage: str, count: int = 1) -> Iterator[None]:
+        """
+        Times a pipeline stage into `pipeline_stage_seconds{stage=...}`.
+
+        With `count`, the duration is spread over that many items (e.g. the windows of one
+        batched VAD pass) and recorded once as the per-item time.
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe("pipeline_stage_seconds", (time.perf_counter() - started) / max(1, count), stage=stage)
+
+    def gauge(self, name: str, help_text: str, read: Callable[[], Dict[Labels, float]]):
+        """Registers a gauge; `read` returns the current value per label set."""
+        with self._lock:
+            self._gauges[name] = (help_text, read)
+
+    def render(self) -> str:
+        # Worker threads add series while a scrape runs; format a copy taken under the lock
+        with self._lock:
+            summaries = [(name, sorted(series.items())) for name, series in sorted(self._summaries.items())]
+            gauges = sorted(self._gauges.items())
+        lines = []
+        for name, series in summaries:
+            lines += [f"# HELP {name} {self._help.get(name, name)}", f"# TYPE {name} summary"]
+            for labels, summary in series:
+                for quantile, value in summary.quantiles():
+                    lines.append(f"{name}{_format_labels(labels + (('quantile', str(quantile)),))} {value:.6g}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {summary.total:.6g}")
+                lines.append(f"{name}_count{_format_labels(labels)} {summary.count}")
+        for name, (help_text, read) in gauges:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+            for labels, value in sorted(read().items()):
+                lines.append(f"{name}{_format_labels(labels)} {value:.6g}")
+        return "\n".join(lines) + "\n"
+
+    def _create_series(self, name: str, labels: Labels) -> LatencySummary:
+        with self._lock:
+            return self._summaries.setdefault(name, {}).setdefault(labels, LatencySummary(self.window_size))
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{value}"' for key, value in labels) + "}"
+
+
+metrics = MetricsRegistry()
+metrics.describe("pipeline_stage_seconds", "Time spent per pipeline stage (per window for VAD stages).")
+metrics.describe("utterance_real_time_factor", "Processing time of an utterance divided by its audio duration.")
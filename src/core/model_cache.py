@@ -0,0 +1,136 @@
+import hashlib
+import logging
+import os
+import re
+import stat
+from contextlib import contextmanager
+from typing import Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: concurrent cold starts then prepare the model side by side
+    fcntl = None
+
+import torch
+import transformers
+
+logger = logging.getLogger(__name__)
+
+
+class ModelCache:
+    """
+    Local cache of a fully prepared (converted, e.g. quantized) model.
+
+    The model is pickled as a whole with `torch.save` and read back with
+    `torch.load(mmap=True)`: tensor storages are then mapped from the file instead of
+    copied into each process, so several server processes on one host share the same
+    page-cache pages, and a warm boot skips both `from_pretrained` and the conversion.
+
+    Entries are keyed by the model name, the conversion and the torch/transformers
+    versions, so changing any of them simply creates a new file.
+
+    Unpickling runs arbitrary code, so the cache directory must only be writable by the
+    user running the server. Hashing the entry on every boot would read all of it and
+    defeat the memory mapping; instead, entries that belong to another user or are
+    writable by group or others are refused before loading. A refused entry is not
+    rewritten either: the next boot would refuse it again.
+
+    On a cold cache, `exclusive` lets one process prepare and store the model while the
+    others starting at the same time wait for the entry instead of preparing it too.
+    """
+
+    def __init__(self, root: str, model_name: str, conversion: str):
+        self.root = root
+        fingerprint = f"{model_name}|{conversion}|torch={torch.__version__}|transformers={transformers.__version__}"
+        digest = hashlib.sha256(fingerprint.encode()).hexdigest()[:12]
+        slug = re.sub(r"[^A-Za-z0-9.-]+", "_", model_name)
+        self.path = os.path.join(root, f"{slug}-{conversion}-{digest}.pt")
+        # Set once the entry or directory failed the ownership/permission check (logged once)
+        self.refused = False
+
+    def persist_compiled_kernels(self):
+        """
+        Points torch.compile's on-disk caches (Inductor FX graphs and generated kernels)
+        into the cache directory, so compiled sub-models are reused across boots. An
+        explicitly set TORCHINDUCTOR_CACHE_DIR wins.
+        """
+        os.environ.setdefault("TORCHINDUCTOR_CACHE_DIR", os.path.join(self.root, "inductor"))
+        os.environ.setdefault("TORCHINDUCTOR_FX_GRAPH_CACHE", "1")
+
+    def exists(self) -> bool:
+        return os.path.isfile(self.path)
+
+    def load(self) -> Optional[Tuple[torch.nn.Module, torch.dtype]]:
+        """
+        Returns:
+            Optional[Tuple[torch.nn.Module, torch.dtype]]: The cached model and the dtype its
+            inputs need, or None if there is no usable entry.
+        """
+        if not self.exists():
+            return None
+        if not self._is_private(self.root, self.path):
+            self._refuse("loading it would unpickle untrusted data")
+            return None
+        try:
+            entry = torch.load(self.path, mmap=True, weights_only=False)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable model cache entry {self.path}: {e}")
+            return None
+        logger.info(f"Loaded prepared model from cache: {self.path}")
+        return entry["model"], entry["dtype"]
+
+    @contextmanager
+    def exclusive(self):
+        """
+        Holds a lock on the entry while the model is prepared and stored. Processes that
+        wait here should `load` again afterwards: the entry may have been written meanwhile.
+        """
+        os.makedirs(self.root, mode=0o700, exist_ok=True)
+        if fcntl is None:
+            yield
+            return
+        with open(f"{self.path}.lock", "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def store(self, model: torch.nn.Module, dtype: torch.dtype):
+        """Writes the model atomically, so concurrently starting processes never read a partial file."""
+        os.makedirs(self.root, mode=0o700, exist_ok=True)
+        if not self.refused and not self._is_private(self.root):
+            self._refuse("an entry written there would be refused on the next boot")
+        if self.refused:
+            return
+        partial = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            torch.save({"model": model, "dtype": dtype}, partial)
+            os.replace(partial, self.path)
+        except Exception as e:
+            logger.warning(f"Could not write model cache entry {self.path}: {e}")
+            if os.path.exists(partial):
+                os.remove(partial)
+            return
+        logger.info(f"Stored prepared model in cache: {self.path}")
+
+    def _refuse(self, consequence: str):
+        if not self.refused:
+            logger.warning(
+                f"Not using model cache entry {self.path}: it or its directory is writable by other users or "
+                f"owned by another user, and {consequence}. The cache is skipped (neither loaded nor rewritten) "
+                f"until the permissions are fixed, e.g. with chmod go-w, or models.translation.model_cache.dir "
+                f"points to a private directory."
+            )
+        self.refused = True
+
+    @staticmethod
+    def _is_private(*paths: str) -> bool:
+        """True if the paths belong to this user and nobody else can write them."""
+        for path in paths:
+            status = os.stat(path)
+            if status.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+                return False
+            if hasattr(os, "getuid") and status.st_uid != os.getuid():
+                return False
+        return True
@@ -0,0 +1,201 @@
+import logging
+import multiprocessing
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (target language, normalized text)
+CacheKey = Tuple[str, str]
+
+# Store writes are committed at most this often; a crash loses at most this much of the cache
+COMMIT_INTERVAL_S = 5.0
+
+
+def normalize_text(text: str) -> str:
+    """
+    Key form of a translated phrase: case, whitespace and punctuation are ignored, except
+    question marks, which change the intonation.
+    """
+    kept = "".join(
+        char if char == "?" or not unicodedata.category(char).startswith("P") else " " for char in text.casefold()
+    )
+    return re.sub(r"\s+", " ", kept).strip()
+
+
+class SpeechCache:
+    """
+    Bounded LRU cache of synthesized speech (WAV bytes) per translated phrase and target
+    language, so recurring phrases skip the text-to-unit model and vocoder.
+
+    The cache holds at most `max_entries` entries and `max_mb` of audio; the least
+    recently used entries are evicted first. With a `store_path`, entries are also
+    written to a local SQLite file and loaded from it on the next start, so a restarted
+    server begins with its recent phrases. The file mirrors the in-memory contents,
+    including evictions, so it stays within the same bounds. Writes are committed every
+    `COMMIT_INTERVAL_S` and on `close`, not on every `put`.
+
+    The text-to-unit model also attends to the input speech, so a hit returns a valid
+    rendering of the phrase, not necessarily the exact one a fresh synthesis would give.
+    Safe to use from several threads.
+    """
+
+    def __init__(self, max_entries: int = 2000, max_mb: float = 128.0, store_path: Optional[str] = None):
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.store_path = store_path
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[CacheKey, bytes]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._store: Optional[sqlite3.Connection] = None
+        self._committed_at = 0.0
+        if store_path is not None:
+            self._open_store()
+
+    @classmethod
+    def from_config(
+        cls, cache_cfg: dict, model_name: str, conversion: str, process_name: Optional[str] = None
+    ) -> Optional["SpeechCache"]:
+        """
+        Returns the cache configured by `models.translation.speech_cache`, or None if disabled.
+
+        Each inference worker process persists to a file of its own (named after the
+        process, which keeps its name across restarts), so replicas never evict each
+        other's rows.
+        """
+        if not cache_cfg.get("enabled", True):
+            return None
+        store_path = None
+        if cache_cfg.get("persist", False):
+            # Speech differs between models and weight conversions
+            name = f"{model_name}-{conversion}"
+            process_name = process_name or multiprocessing.current_process().name
+            if process_name != "MainProcess":
+                name += f"-{process_name}"
+            slug = re.sub(r"[^A-Za-z0-9.-]+", "_", name)
+            store_path = os.path.join(cache_cfg.get("dir", "models_cache/speech"), f"{slug}.sqlite3")
+        return cls(
+            max_entries=int(cache_cfg.get("max_entries", 2000)),
+            max_mb=float(cache_cfg.get("max_mb", 128)),
+            store_path=store_path,
+        )
+
+    def get(self, text: str, tgt_lang: str) -> Optional[bytes]:
+        key = (tgt_lang, normalize_text(text))
+        with self._lock:
+            wav = self._entries.get(key)
+            if wav is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return wav
+
+    def put(self, text: str, tgt_lang: str, wav: bytes):
+        key = (tgt_lang, normalize_text(text))
+        if not key[1] or len(wav) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous)
+            self._entries[key] = wav
+            self._bytes += len(wav)
+            evicted = self._evict()
+            if self._store is not None:
+                self._write_store(key, wav, evicted)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / (self.hits + self.misses), 3) if self.hits + self.misses else None,
+                "persistent": self.store_path is not None,
+            }
+
+    @staticmethod
+    def merge(snapshots: List[dict]) -> Optional[dict]:
+        """Adds up the snapshots of several caches (e.g. one per inference worker)."""
+        if not snapshots:
+            return None
+        total = {
+            key: sum(snapshot[key] for snapshot in snapshots)
+            for key in ("entries", "bytes", "max_bytes", "hits", "misses", "evictions")
+        }
+        lookups = total["hits"] + total["misses"]
+        total["hit_rate"] = round(total["hits"] / lookups, 3) if lookups else None
+        total["persistent"] = any(snapshot["persistent"] for snapshot in snapshots)
+        return total
+
+    def close(self):
+        """Saves the recency order to the store and closes it."""
+        with self._lock:
+            if self._store is None:
+                return
+            now = time.time()
+            # Oldest first, so the most recently used entry gets the latest time
+            self._store.executemany(
+                "UPDATE speech SET used = ? WHERE tgt_lang = ? AND text = ?",
+                [(now + position * 1e-6, *key) for position, key in enumerate(self._entries)],
+            )
+            self._store.commit()
+            self._store.close()
+            self._store = None
+
+    def _evict(self) -> List[CacheKey]:
+        evicted = []
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            key, wav = self._entries.popitem(last=False)
+            self._bytes -= len(wav)
+            self.evictions += 1
+            evicted.append(key)
+        return evicted
+
+    def _open_store(self):
+        try:
+            os.makedirs(os.path.dirname(self.store_path) or ".", exist_ok=True)
+            self._store = sqlite3.connect(self.store_path, check_same_thread=False)
+            self._store.execute(
+                "CREATE TABLE IF NOT EXISTS speech "
+                "(tgt_lang TEXT, text TEXT, wav BLOB, used REAL, PRIMARY KEY (tgt_lang, text))"
+            )
+            rows = self._store.execute("SELECT tgt_lang, text, wav FROM speech ORDER BY used").fetchall()
+        except sqlite3.Error as e:
+            logger.warning(f"Speech cache store {self.store_path} is unusable, caching in memory only: {e}")
+            self._store = None
+            return
+        for tgt_lang, text, wav in rows:
+            self._entries[(tgt_lang, text)] = wav
+            self._bytes += len(wav)
+        # Limits may have shrunk since the entries were written
+        self._write_store(None, None, self._evict())
+        self.evictions = 0
+        logger.info(f"Loaded {len(self._entries)} cached phrase(s) from {self.store_path}.")
+
+    def _write_store(self, key: Optional[CacheKey], wav: Optional[bytes], evicted: List[CacheKey]):
+        try:
+            if key is not None:
+                self._store.execute(
+                    "INSERT OR REPLACE INTO speech VALUES (?, ?, ?, ?)", (*key, sqlite3.Binary(wav), time.time())
+                )
+            self._store.executemany("DELETE FROM speech WHERE tgt_lang = ? AND text = ?", evicted)
+            if time.monotonic() - self._committed_at >= COMMIT_INTERVAL_S:
+                self._store.commit()
+                self._committed_at = time.monotonic()
+        except sqlite3.Error as e:
+            logger.warning(f"Could not update speech cache store {self.store_path}: {e}")
@@ -0,0 +1,95 @@
+from collections import deque
+from typing import Deque, Optional, Tuple
+
+import numpy as np
+
+# Peak level of normalized speech, as in `TranslatorEngine._encode_wav`
+TARGET_PEAK = 0.9
+
+
+class SpeechStitcher:
+    """
+    Joins speech vocoded in overlapping windows into one continuous stream.
+
+    Each window is vocoded with a few units of context on both sides of its own units, so
+    the vocoder sees the same neighbourhood as in a one-shot pass. The unit durations
+    are predicted by the vocoder, so where a window's own units begin and end in its
+    output is only estimated by the caller. The end of every piece is therefore held
+    back and located in the next window by the smallest squared difference within
+    `search_samples` of the estimate, then crossfaded into it: the seam lies where
+    both windows had full context, and no audio is repeated or skipped.
+
+    The output is normalized to `TARGET_PEAK` over the last `normalize_window_samples`
+    (including the new piece), so a loud passage lowers the gain only while it is in
+    that window. Gain changes are ramped over the crossfade length.
+    """
+
+    def __init__(self, crossfade_samples: int = 320, search_samples: int = 1600, normalize_window_samples: int = 32000):
+        self.crossfade_samples = crossfade_samples
+        self.search_samples = search_samples
+        self.normalize_window_samples = normalize_window_samples
+        self._tail: Optional[np.ndarray] = None
+        self._gain: Optional[float] = None
+        # (length, peak) of the most recent pieces, newest last
+        self._recent: Deque[Tuple[int, float]] = deque()
+        self._recent_samples = 0
+
+    def add(self, samples: np.ndarray, content_start: int, content_end: int, final: bool) -> np.ndarray:
+        """
+        Args:
+            samples (np.ndarray): Vocoder output of one window, float32.
+            content_start (int): Estimated sample where the window's own units begin (after the left context).
+            content_end (int): Estimated sample where they end (before the right context).
+            final (bool): Whether this is the last window of the utterance; nothing is held back then.
+
+        Returns:
+            np.ndarray: Normalized float32 PCM that continues the previous piece (may be empty).
+        """
+        if self._tail is None or not len(self._tail):
+            piece = samples[content_start:content_end]
+        else:
+            piece = self._join(samples, content_start, content_end)
+        if final:
+            self._tail = None
+        else:
+            self._tail = piece[-self.crossfade_samples :]
+            piece = piece[: -self.crossfade_samples]
+        return self._normalize(piece)
+
+    def _join(self, samples: np.ndarray, content_start: int, content_end: int) -> np.ndarray:
+        fade = len(self._tail)
+        position = self._locate_tail(samples, content_start - fade)
+        ramp = np.linspace(0.0, 1.0, fade, endpoint=False, dtype=np.float32)
+        overlap = samples[position : position + fade]
+        mixed = self._tail[: len(overlap)] * (1.0 - ramp[: len(overlap)]) + overlap * ramp[: len(overlap)]
+        return np.concatenate([mixed, samples[position + fade : max(content_end, position + fade)]])
+
+    def _locate_tail(self, samples: np.ndarray, expected: int) -> int:
+        """Start of the stretch of `samples` that best matches the held-back tail."""
+        fade = len(self._tail)
+        low = min(max(0, expected - self.search_samples), max(0, len(samples) - fade))
+        high = max(low, min(len(samples) - fade, expected + self.search_samples))
+        region = samples[low : high + fade]
+        if len(region) < fade:
+            return low
+        # ||region[p:p+fade] - tail||^2 without the constant ||tail||^2
+        errors = np.convolve(region**2, np.ones(fade), "valid") - 2.0 * np.correlate(region, self._tail, "valid")
+        return low + int(np.argmin(errors))
+
+    def _normalize(self, piece: np.ndarray) -> np.ndarray:
+        if not len(piece):
+            return piece.astype(np.float32)
+        self._recent.append((len(piece), float(np.max(np.abs(piece)))))
+        self._recent_samples += len(piece)
+        # Keep the pieces that reach into the window ending with this one
+        while self._recent_samples - self._recent[0][0] >= self.normalize_window_samples:
+            self._recent_samples -= self._recent.popleft()[0]
+        peak = max(peak for _, peak in self._recent)
+        gain = TARGET_PEAK / peak if peak > 0.0001 else 1.0
+        previous = self._gain if self._gain is not None else gain
+        self._gain = gain
+
+        gains = np.full(len(piece), gain, dtype=np.float32)
+        ramp_length = min(len(piece), self.crossfade_samples)
+        gains[:ramp_length] = np.linspace(previous, gain, ramp_length, endpoint=False)
+        return np.clip(piece * gains, -1.0, 1.0).astype(np.float32)
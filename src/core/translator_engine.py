@@ -3,13 +3,90 @@ import numpy as np
 import logging
 import io
 import soundfile as sf
-from transformers import AutoProcessor, SeamlessM4Tv2Model
+from dataclasses import dataclass
+from typing import Callable, Iterator, List, Optional, Tuple, Union
+import transformers
+from transformers import AutoProcessor, SeamlessM4Tv2ForSpeechToSpeech, SeamlessM4Tv2ForSpeechToText
+from transformers.generation import GenerationMixin
+from transformers.modeling_outputs import BaseModelOutput
+from transformers.models.seamless_m4t_v2 import modeling_seamless_m4t_v2 as seamless_modeling
 from src.core.config import config
 from src.core.device_manager import DeviceManager
+from src.core.metrics import metrics
+from src.core.cpu_acceleration import (
+    CPUAccelerationSettings,
+    compile_submodules,
+    convert_weights,
+    output_similarity,
+    probe_audio,
+)
+from src.core.model_cache import ModelCache
+from src.core.speech_cache import SpeechCache
+from src.core.speech_stitching import SpeechStitcher
 
 logger = logging.getLogger(__name__)
 
 
+# Private SeamlessM4Tv2 helpers the stage-by-stage pipeline calls (see `_encode_speech` and `_generate_units`).
+# transformers is pinned in requirements.txt; `check_transformers_internals` verifies them at startup.
+SPEECH_ENCODER_INTERNALS = ("_compute_sub_sample_lengths_from_attention_mask",)
+TEXT_TO_UNIT_INTERNALS = ("_indices_to_subwords", "_count_character_length_in_subword", "_get_char_input_ids")
+
+
+def check_transformers_internals(model_class: type, speech_enabled: bool):
+    """
+    Verifies that the installed transformers still has the private APIs `TranslatorEngine` relies on.
+
+    Raises:
+        RuntimeError: Naming the missing attributes and the installed transformers version.
+    """
+    required = SPEECH_ENCODER_INTERNALS + (TEXT_TO_UNIT_INTERNALS if speech_enabled else ())
+    missing = [f"{model_class.__name__}.{name}" for name in required if not hasattr(model_class, name)]
+    if not hasattr(seamless_modeling, "_compute_new_attention_mask"):
+        missing.append("modeling_seamless_m4t_v2._compute_new_attention_mask")
+    if not issubclass(model_class, GenerationMixin):
+        missing.append(f"{model_class.__name__} as a GenerationMixin")
+    if missing:
+        raise RuntimeError(
+            f"transformers {transformers.__version__} lacks {', '.join(missing)}, which the translator engine "
+            f"calls directly. Install the transformers version pinned in requirements.txt."
+        )
+
+
+@dataclass
+class TranslationText:
+    """Translated text of one utterance, available before its speech is synthesized."""
+
+    text: str
+
+
+@dataclass
+class TranslationAudio:
+    """A consecutive piece of an utterance's translated speech (normalized float32 PCM, 16kHz)."""
+
+    samples: np.ndarray
+
+
+TranslationOutput = Union[TranslationText, TranslationAudio]
+
+# Output modalities the engine can be loaded for (`models.translation.output_modalities`)
+MODALITY_TEXT = "text"
+MODALITY_SPEECH = "speech"
+
+
+@dataclass
+class EncodedSpeech:
+    """
+    Speech encoder output of one utterance, without batch padding.
+
+    Produced by `TranslatorEngine.encode_batch` and accepted by the translate methods
+    in place of a fresh encoder pass.
+    """
+
+    input_features: torch.Tensor  # (frames, feature_size)
+    hidden_states: torch.Tensor  # (encoder_frames, hidden_size)
+
+
 class TranslatorEngine:
     def __init__(self, device_manager: DeviceManager):
         self.device_manager = device_manager
@@ -17,23 +94,61 @@ class TranslatorEngine:
 
         # Load configuration
         model_cfg = config.get("models", {}).get("translation", {})
-        self.model_name = model_cfg.get("variant", "facebook/seamless-m4t-v2-large")
-        self.src_lang = model_cfg.get("src_lang", "deu")
-        self.tgt_lang = model_cfg.get("tgt_lang", "eng")
+        self._read_settings(model_cfg)
+        model_class = SeamlessM4Tv2ForSpeechToSpeech if self.speech_enabled else SeamlessM4Tv2ForSpeechToText
+        check_transformers_internals(model_class, self.speech_enabled)
 
-        logger.info(f"Loading Translator Engine: {self.model_name} on {self.device}...")
+        logger.info(f"Loading Translator Engine: {self.model_name} ({model_class.__name__}) on {self.device}...")
 
         # Determine dtype based on device
         # Use float16 on GPU to save VRAM, float32 on CPU
         self.dtype = torch.float16 if self.device.type == "cuda" else torch.float32
+        on_cpu = self.device.type == "cpu"
+        self.model_cache = self._open_model_cache(model_cfg.get("model_cache", {}), on_cpu)
 
         # Load processor and model (Explicitly use v2 class)
         self.processor = AutoProcessor.from_pretrained(self.model_name)
-        self.model = SeamlessM4Tv2Model.from_pretrained(self.model_name, torch_dtype=self.dtype).to(self.device)
+        self.loaded_from_cache = self._load_or_prepare_model(model_class, on_cpu)
+        if on_cpu and self.cpu_acceleration.compile:
+            self._compile_for_cpu()
+
+        self.speech_languages = self._find_speech_languages()
+        # Recurring phrases reuse their synthesized speech (see `_translate_to_units`)
+        self.speech_cache = None
+        if self.speech_enabled:
+            self.speech_cache = SpeechCache.from_config(
+                model_cfg.get("speech_cache", {}), self.model_name, self.cpu_acceleration.conversion
+            )
 
         logger.info("Translator Engine loaded successfully.")
 
-    def translate(self, audio_np: np.ndarray, tgt_lang: str = None) -> bytes:
+    def supports_speech(self, tgt_lang: str) -> bool:
+        """Whether `tgt_lang` can be translated to speech, not only to text."""
+        return tgt_lang in self.speech_languages
+
+    def warmup(self, duration_s: float = 2.0):
+        """
+        Runs one complete translation of a synthetic signal, so that lazy kernel
+        initialization (and torch.compile, if enabled) happens before the first client
+        request instead of during it.
+        """
+        logger.info("Warming up the Translator Engine...")
+        # Bypass the speech cache, so that the vocoder runs and the probe's text isn't cached
+        speech_cache, self.speech_cache = self.speech_cache, None
+        try:
+            if self.speech_enabled:
+                self.translate(probe_audio(duration_s))
+            else:
+                self.translate_text_batch([probe_audio(duration_s)])
+        finally:
+            self.speech_cache = speech_cache
+
+    def close(self):
+        """Saves what should outlive the process (the speech cache's recency order)."""
+        if self.speech_cache is not None:
+            self.speech_cache.close()
+
+    def translate(self, audio_np: np.ndarray, tgt_lang: Optional[str] = None) -> bytes:
         """
         Translates German audio input to a target language audio output.
 
@@ -44,40 +159,491 @@ class TranslatorEngine:
         Returns:
             bytes: Synthesized audio as WAV file (in-memory).
         """
+        return self.translate_batch([audio_np], tgt_lang)[0]
+
+    def translate_batch(
+        self,
+        audio_batch: List[np.ndarray],
+        tgt_lang: Optional[str] = None,
+        encoded: Optional[List[Optional[EncodedSpeech]]] = None,
+    ) -> List[bytes]:
+        """
+        Translates several utterances into the same target language as one padded batch.
+
+        Args:
+            audio_batch (List[np.ndarray]): Input utterances (16kHz, float32), any lengths.
+            tgt_lang (str, optional): Target language code. Defaults to config value.
+            encoded (List[Optional[EncodedSpeech]], optional): Already computed encoder
+                output per utterance (e.g. from speculative encoding); None entries are encoded here.
+
+        Returns:
+            List[bytes]: One WAV file (in-memory) per input utterance, in input order.
+        """
         target = tgt_lang if tgt_lang else self.tgt_lang
-        
-        # DEBUG: Check input audio stats
-        input_max = np.max(np.abs(audio_np))
-        input_mean = np.mean(np.abs(audio_np))
-        logger.info(
-            f"Starting translation ({self.src_lang} -> {target})... Input Stats: Max={input_max:.4f}, Mean={input_mean:.4f}, Length={len(audio_np)} samples"
-        )
+        with torch.no_grad():
+            texts, wavs, unit_ids = self._translate_to_units(audio_batch, target, encoded)
+            if unit_ids is None:
+                return wavs
+            waveforms, waveform_lengths = self._vocode(unit_ids, target)
 
-        if input_max < 0.01:
-            logger.warning("Input audio is extremely quiet! The model might hallucinate.")
+        waveforms = waveforms.float().cpu().numpy()
+        # The vocoder squeezes the lengths tensor, so a batch of one comes back as a scalar
+        lengths = waveform_lengths.reshape(-1).cpu().tolist()
+        misses = [index for index, wav in enumerate(wavs) if wav is None]
+        for row, (index, length) in enumerate(zip(misses, lengths)):
+            wavs[index] = self._encode_wav(waveforms[row, :length])
+            if self.speech_cache is not None:
+                self.speech_cache.put(texts[index], target, wavs[index])
+        return wavs
+
+    def translate_text_batch(
+        self,
+        audio_batch: List[np.ndarray],
+        tgt_lang: Optional[str] = None,
+        encoded: Optional[List[Optional[EncodedSpeech]]] = None,
+    ) -> List[str]:
+        """
+        Translates several utterances to text only: speech encoder and text decoder, without
+        the text-to-unit model and vocoder.
 
-        # Pre-process
-        audio_inputs = self.processor(
-            audio=audio_np, src_lang=self.src_lang, return_tensors="pt", sampling_rate=16000
-        ).to(self.device)
+        Args:
+            audio_batch (List[np.ndarray]): Input utterances (16kHz, float32), any lengths.
+            tgt_lang (str, optional): Target language code. Defaults to config value.
+            encoded (List[Optional[EncodedSpeech]], optional): See `translate_batch`.
 
-        # Cast to correct dtype for inference
-        if self.dtype == torch.float16:
-            audio_inputs = {
-                k: v.to(torch.float16) if torch.is_floating_point(v) else v for k, v in audio_inputs.items()
-            }
+        Returns:
+            List[str]: Translated text per input utterance, in input order.
+        """
+        target = tgt_lang if tgt_lang else self.tgt_lang
+        with torch.no_grad():
+            encoded = self._complete_encodings(audio_batch, target, encoded)
+            audio_inputs, encoder_hidden_states, _ = self._collate(encoded)
+            sequences = self._generate_text(audio_inputs, encoder_hidden_states, target)
+        return self.processor.batch_decode(sequences, skip_special_tokens=True)
+
+    def translate_batch_streaming(
+        self,
+        audio_batch: List[np.ndarray],
+        tgt_lang: str,
+        emit: Callable[[int, TranslationOutput], None],
+        encoded: Optional[List[Optional[EncodedSpeech]]] = None,
+    ):
+        """
+        Translates a batch like `translate_batch`, but hands out results as soon as they exist.
+
+        For every utterance, `emit(index, TranslationText)` is called once the text is
+        decoded, followed by `emit(index, TranslationAudio)` for each vocoded piece of
+        speech. Pieces are normalized over a window of recent speech, since the final peak
+        of the utterance isn't known yet.
+
+        Args:
+            audio_batch (List[np.ndarray]): Input utterances (16kHz, float32), any lengths.
+            tgt_lang (str): Target language code.
+            emit (Callable): Receives (index into audio_batch, output piece).
+            encoded (List[Optional[EncodedSpeech]], optional): See `translate_batch`.
+        """
+        target = tgt_lang if tgt_lang else self.tgt_lang
+        with torch.no_grad():
+            texts, wavs, unit_ids = self._translate_to_units(audio_batch, target, encoded)
+
+            for index, text in enumerate(texts):
+                emit(index, TranslationText(text=text))
+
+            row = 0
+            for index in range(len(audio_batch)):
+                if wavs[index] is not None:
+                    # Cached phrase: its whole speech at once
+                    samples, _ = sf.read(io.BytesIO(wavs[index]), dtype="float32")
+                    emit(index, TranslationAudio(samples=samples))
+                    continue
+                pieces = []
+                for samples in self._vocode_incrementally(unit_ids[row], target):
+                    pieces.append(samples)
+                    emit(index, TranslationAudio(samples=samples))
+                row += 1
+                if self.speech_cache is not None and pieces:
+                    self.speech_cache.put(texts[index], target, self._encode_wav(np.concatenate(pieces)))
+
+    def encode_batch(self, audio_batch: List[np.ndarray]) -> List[EncodedSpeech]:
+        """
+        Runs feature extraction and the speech encoder only, e.g. speculatively while the
+        end of an utterance is not yet confirmed.
 
-        # Generate Speech
+        Args:
+            audio_batch (List[np.ndarray]): Input utterances (16kHz, float32), any lengths.
+
+        Returns:
+            List[EncodedSpeech]: Encoder output per utterance, in input order.
+        """
+        logger.info(f"Encoding {len(audio_batch)} utterance(s) ahead of translation...")
         with torch.no_grad():
-            output_tokens = self.model.generate(
+            return self._encode_utterances(audio_batch)
+
+    def _translate_to_units(
+        self, audio_batch: List[np.ndarray], target: str, encoded: Optional[List[Optional[EncodedSpeech]]] = None
+    ) -> Tuple[List[str], List[Optional[bytes]], Optional[torch.Tensor]]:
+        """
+        Runs the model up to the discrete speech units: features, speech encoder, text
+        decoder and text-to-unit model.
+
+        `SeamlessM4Tv2Model.generate` runs the speech encoder twice (once for text
+        generation, once more for the text-to-unit input); here its output is computed
+        once and reused for both. Utterances with a precomputed encoding skip it entirely.
+        Utterances whose translated text is in the speech cache skip the text-to-unit model.
+
+        Returns:
+            Tuple: Translated text per utterance, the cached WAV per utterance (None if it
+            needs synthesis), and vocoder unit ids of the utterances without a cached WAV,
+            in order (None if every utterance was cached).
+        """
+        if not self.speech_enabled:
+            raise RuntimeError("Speech output is disabled (models.translation.output_modalities)")
+        if not self.supports_speech(target):
+            raise ValueError(f"tgt_lang={target} is not supported by {self.model_name} for speech output")
+        encoded = self._complete_encodings(audio_batch, target, encoded)
+        audio_inputs, encoder_hidden_states, encoder_attention_mask = self._collate(encoded)
+        sequences = self._generate_text(audio_inputs, encoder_hidden_states, target)
+        texts = self.processor.batch_decode(sequences, skip_special_tokens=True)
+
+        wavs = [self.speech_cache.get(text, target) if self.speech_cache is not None else None for text in texts]
+        misses = [index for index, wav in enumerate(wavs) if wav is None]
+        if not misses:
+            logger.info("Reusing cached speech for the whole batch.")
+            return texts, wavs, None
+        if len(misses) < len(texts):
+            rows = torch.tensor(misses, device=sequences.device)
+            sequences, encoder_hidden_states = sequences[rows], encoder_hidden_states[rows]
+            if encoder_attention_mask is not None:
+                encoder_attention_mask = encoder_attention_mask[rows]
+        with metrics.span("text_to_unit"):
+            unit_ids = self._generate_units(sequences, encoder_hidden_states, encoder_attention_mask)
+        return texts, wavs, unit_ids
+
+    def _complete_encodings(
+        self, audio_batch: List[np.ndarray], target: str, encoded: Optional[List[Optional[EncodedSpeech]]]
+    ) -> List[EncodedSpeech]:
+        """Runs the speech encoder for every utterance that has no precomputed encoding."""
+        logger.info(f"Starting translation ({self.src_lang} -> {target}) of {len(audio_batch)} utterance(s)...")
+        for audio_np in audio_batch:
+            self._log_input_stats(audio_np)
+
+        encoded = list(encoded) if encoded is not None else [None] * len(audio_batch)
+        missing = [index for index, item in enumerate(encoded) if item is None]
+        if missing:
+            fresh = self._encode_utterances([audio_batch[index] for index in missing])
+            for index, item in zip(missing, fresh):
+                encoded[index] = item
+        else:
+            logger.info("Reusing precomputed speech encodings for the whole batch.")
+        return encoded
+
+    def _prepare_inputs(self, audio_batch: List[np.ndarray]) -> dict:
+        # Pre-process (the feature extractor pads the batch and returns the matching attention mask)
+        with metrics.span("feature_extraction"):
+            audio_inputs = self.processor(
+                audio=audio_batch, src_lang=self.src_lang, return_tensors="pt", sampling_rate=16000, padding=True
+            ).to(self.device)
+
+        # Cast to correct dtype for inference
+        return {k: v.to(self.dtype) if torch.is_floating_point(v) else v for k, v in audio_inputs.items()}
+
+    def _encode_utterances(self, audio_batch: List[np.ndarray]) -> List[EncodedSpeech]:
+        """Encodes a padded batch and splits the result back into unpadded utterances."""
+        audio_inputs = self._prepare_inputs(audio_batch)
+        encoder_hidden_states, _ = self._encode_speech(audio_inputs)
+
+        input_features = audio_inputs["input_features"]
+        attention_mask = audio_inputs.get("attention_mask")
+        if attention_mask is None:
+            attention_mask = torch.ones(input_features.shape[:2], dtype=torch.int32, device=input_features.device)
+        feature_lengths = attention_mask.sum(dim=1).tolist()
+        hidden_lengths = self.model._compute_sub_sample_lengths_from_attention_mask(attention_mask).tolist()
+
+        return [
+            EncodedSpeech(
+                input_features=input_features[index, : int(feature_lengths[index])],
+                hidden_states=encoder_hidden_states[index, : int(hidden_lengths[index])],
+            )
+            for index in range(len(audio_batch))
+        ]
+
+    def _collate(self, encoded: List[EncodedSpeech]):
+        """
+        Pads per-utterance encodings into one batch, like the feature extractor does for raw audio.
+
+        Returns:
+            Tuple[dict, torch.Tensor, torch.Tensor]: Model inputs (features and attention mask),
+            encoder hidden states and the attention mask subsampled to their length.
+        """
+        input_features = torch.nn.utils.rnn.pad_sequence([item.input_features for item in encoded], batch_first=True)
+        encoder_hidden_states = torch.nn.utils.rnn.pad_sequence(
+            [item.hidden_states for item in encoded], batch_first=True
+        )
+
+        attention_mask = torch.zeros(input_features.shape[:2], dtype=torch.int32, device=input_features.device)
+        for index, item in enumerate(encoded):
+            attention_mask[index, : len(item.input_features)] = 1
+        hidden_lengths = torch.tensor([len(item.hidden_states) for item in encoded], device=self.device)
+
+        audio_inputs = {"input_features": input_features, "attention_mask": attention_mask}
+        return (
+            audio_inputs,
+            encoder_hidden_states,
+            seamless_modeling._compute_new_attention_mask(encoder_hidden_states, hidden_lengths),
+        )
+
+    def _encode_speech(self, audio_inputs: dict):
+        """
+        Returns:
+            Tuple[torch.Tensor, Optional[torch.Tensor]]: Speech encoder hidden states and the
+            attention mask subsampled to their length.
+        """
+        attention_mask = audio_inputs.get("attention_mask")
+        with metrics.span("speech_encoder"):
+            encoder_hidden_states = self.model.speech_encoder(
+                input_features=audio_inputs["input_features"], attention_mask=attention_mask
+            ).last_hidden_state
+
+        if attention_mask is None:
+            return encoder_hidden_states, None
+        sub_sampled_lengths = self.model._compute_sub_sample_lengths_from_attention_mask(attention_mask).to(
+            encoder_hidden_states.device
+        )
+        return encoder_hidden_states, seamless_modeling._compute_new_attention_mask(
+            encoder_hidden_states, sub_sampled_lengths
+        )
+
+    def _generate_text(self, audio_inputs: dict, encoder_hidden_states: torch.Tensor, target: str) -> torch.Tensor:
+        """
+        Text decoding step of `generate`, fed with the cached encoder output.
+
+        The plain `GenerationMixin.generate` is called directly, since the speech-to-speech
+        model's own `generate` always continues with speech synthesis.
+        """
+        lang_to_id = self.model.generation_config.text_decoder_lang_to_code_id
+        if target not in lang_to_id:
+            raise ValueError(f"tgt_lang={target} is not supported by {self.model_name}")
+        batch_size = len(encoder_hidden_states)
+        decoder_input_ids = torch.tensor([[lang_to_id[target]]] * batch_size, device=self.device)
+
+        with metrics.span("text_decoder"):
+            text_output = GenerationMixin.generate(
+                self.model,
                 **audio_inputs,
-                tgt_lang=target,
-                generate_speech=True
+                encoder_outputs=BaseModelOutput(last_hidden_state=encoder_hidden_states),
+                decoder_input_ids=decoder_input_ids,
+                return_dict_in_generate=True,
+            )
+        return text_output.sequences
+
+    def _generate_units(
+        self,
+        sequences: torch.Tensor,
+        encoder_hidden_states: torch.Tensor,
+        encoder_attention_mask: Optional[torch.Tensor],
+    ) -> torch.Tensor:
+        """
+        Text-to-unit step of `SeamlessM4Tv2Model.generate`, fed with the cached encoder output.
+
+        Returns:
+            torch.Tensor: Vocoder unit ids, padded with `t2u_pad_token_id`.
+        """
+        model_cfg = self.model.config
+        pad_token_id = self.model.generation_config.pad_token_id
+
+        t2u_input_embeds = self.model.text_decoder(
+            input_ids=sequences[:, :-1],  # Trim the final EOS token
+            encoder_hidden_states=encoder_hidden_states,
+            encoder_attention_mask=encoder_attention_mask,
+        ).last_hidden_state
+        seq_lens = (sequences[:, :-1] != pad_token_id).int().sum(1)
+        t2u_attention_mask = seamless_modeling._compute_new_attention_mask(t2u_input_embeds, seq_lens)
+
+        # Remove EOS and lang_id, and replace every other EOS by padding
+        t2u_input_ids = sequences[:, 2:-1]
+        t2u_input_ids = torch.masked_fill(
+            t2u_input_ids, t2u_input_ids == self.model.generation_config.eos_token_id, pad_token_id
+        )
+
+        t2u_subwords = self.model._indices_to_subwords(t2u_input_ids)
+        t2u_char_count_per_id = self.model._count_character_length_in_subword(
+            t2u_input_ids, t2u_subwords, pad_token_id=pad_token_id
+        )
+        # Add pads for lang, EOS tokens as per NLLB "source" tokenizer mode
+        pad_zero = t2u_char_count_per_id.new_zeros((t2u_char_count_per_id.shape[0], 1))
+        t2u_char_count_per_id = torch.cat([pad_zero, t2u_char_count_per_id, pad_zero], dim=1)
+        t2u_char_input_ids = self.model._get_char_input_ids(
+            t2u_input_ids, t2u_subwords, t2u_char_count_per_id, pad_token_id=pad_token_id
+        )
+
+        t2u_logits, padding_mask = self.model.t2u_model(
+            inputs_embeds=t2u_input_embeds,
+            char_input_ids=t2u_char_input_ids,
+            char_count_per_id=t2u_char_count_per_id,
+            attention_mask=t2u_attention_mask,
+        )[:2]
+
+        # The text-to-unit model is non auto-regressive
+        unit_ids = t2u_logits.argmax(dim=-1)
+        replace_mask = (unit_ids == model_cfg.t2u_eos_token_id) | (~padding_mask.bool())
+        unit_ids = unit_ids.masked_fill(replace_mask, model_cfg.t2u_pad_token_id)
+        # Offset of control symbols
+        return torch.where(unit_ids == model_cfg.t2u_pad_token_id, unit_ids, unit_ids - model_cfg.vocoder_offset)
+
+    def _vocode(self, unit_ids: torch.Tensor, target: str):
+        """
+        Returns:
+            Tuple[torch.Tensor, torch.Tensor]: Padded waveforms and their lengths.
+        """
+        vocoder_lang_id = self.model.generation_config.vocoder_lang_code_to_id[target]
+        lang_id = torch.tensor([[vocoder_lang_id]] * len(unit_ids), device=self.device)
+        speaker_id = torch.tensor([[0]] * len(unit_ids), device=self.device)
+        with metrics.span("vocoder"):
+            return self.model.vocoder(input_ids=unit_ids, speaker_id=speaker_id, lang_id=lang_id)
+
+    def _vocode_incrementally(self, unit_ids: torch.Tensor, target: str) -> Iterator[np.ndarray]:
+        """
+        Vocodes the units of one utterance in consecutive pieces of `vocoder_chunk_units`,
+        each with `vocoder_context_units` of context on both sides, and stitches the pieces
+        together (see `SpeechStitcher`).
+
+        Yields:
+            np.ndarray: Normalized float32 PCM (16kHz) per piece.
+        """
+        unit_ids = unit_ids[unit_ids != self.model.config.t2u_pad_token_id]
+        stitcher = SpeechStitcher(normalize_window_samples=self.normalize_window_samples)
+        for start in range(0, len(unit_ids), self.vocoder_chunk_units):
+            first = max(0, start - self.vocoder_context_units)
+            end = min(len(unit_ids), start + self.vocoder_chunk_units)
+            last = min(len(unit_ids), end + self.vocoder_context_units)
+            waveform, _ = self._vocode(unit_ids[first:last].unsqueeze(0), target)
+            samples = waveform.float().cpu().numpy().reshape(-1)
+
+            # Unit durations vary, so where the chunk's own units lie is an estimate the stitcher refines
+            samples_per_unit = len(samples) / (last - first)
+            content_start, content_end = round((start - first) * samples_per_unit), round(
+                (end - first) * samples_per_unit
+            )
+            piece = stitcher.add(samples, content_start, content_end, final=end == len(unit_ids))
+            if len(piece):
+                yield piece
+
+    def _read_settings(self, model_cfg: dict):
+        self.model_name = model_cfg.get("variant", "facebook/seamless-m4t-v2-large")
+        self.src_lang = model_cfg.get("src_lang", "deu")
+        self.tgt_lang = model_cfg.get("tgt_lang", "eng")
+        # Units per vocoder call in streaming mode (one unit is roughly 20 ms of speech)
+        stream_cfg = model_cfg.get("streaming", {})
+        self.vocoder_chunk_units = int(stream_cfg.get("vocoder_chunk_units", 25))
+        self.vocoder_context_units = int(stream_cfg.get("vocoder_context_units", 6))
+        self.normalize_window_samples = int(16000 * stream_cfg.get("normalize_window_ms", 2000) / 1000)
+        # Speech output needs the text-to-unit model and vocoder on top of the speech encoder and text decoder.
+        # The text encoder (text input) is never loaded.
+        self.modalities = set(model_cfg.get("output_modalities", [MODALITY_SPEECH, MODALITY_TEXT]))
+        unknown = self.modalities - {MODALITY_SPEECH, MODALITY_TEXT}
+        if unknown or not self.modalities:
+            raise ValueError(f"Invalid output_modalities {sorted(self.modalities)}, expected 'speech' and/or 'text'")
+        self.speech_enabled = MODALITY_SPEECH in self.modalities
+        # Our CPU-only deployments can trade a little accuracy for speed (int8, bfloat16, torch.compile)
+        self.cpu_acceleration = CPUAccelerationSettings.from_config(model_cfg.get("cpu_acceleration", {}))
+
+    def _open_model_cache(self, cache_cfg: dict, on_cpu: bool) -> Optional[ModelCache]:
+        """On CPU, the converted model is kept in a memory-mapped cache shared by all server processes."""
+        if not on_cpu or not cache_cfg.get("enabled", True):
+            return None
+        return ModelCache(
+            cache_cfg.get("dir", "models_cache/prepared"),
+            self.model_name,
+            f"{self.cpu_acceleration.conversion}-{'-'.join(sorted(self.modalities))}",
+        )
+
+    def _load_or_prepare_model(self, model_class, on_cpu: bool) -> bool:
+        """Maps the prepared model from the cache or prepares it (filling the cache). True on a cache hit."""
+        cache = self.model_cache
+        cached = cache.load() if cache is not None else None
+        if cached is None and cache is not None and not cache.refused:
+            # Only one process prepares a cold entry; the others wait here and then map it
+            with cache.exclusive():
+                cached = cache.load()
+                if cached is None:
+                    self._prepare_model(model_class, on_cpu)
+                    cache.store(self.model, self.dtype)
+                    return False
+        if cached is None:
+            self._prepare_model(model_class, on_cpu)
+            return False
+        # Converted (and self-checked) when the entry was written
+        self.model, self.dtype = cached
+        return True
+
+    def _prepare_model(self, model_class, on_cpu: bool):
+        self.model = model_class.from_pretrained(self.model_name, torch_dtype=self.dtype).to(self.device)
+        if on_cpu and self.cpu_acceleration.conversion != "float32":
+            self._accelerate_for_cpu()
+
+    def _compile_for_cpu(self):
+        # Compiled graphs and kernels persist next to the cache; compilation runs on first use (see `warmup`)
+        if self.model_cache is not None:
+            self.model_cache.persist_compiled_kernels()
+        self.model = compile_submodules(self.model)
+
+    def _find_speech_languages(self) -> frozenset:
+        """Languages with text output only have no text-to-unit or vocoder embedding."""
+        if not self.speech_enabled:
+            return frozenset()
+        generation_config = self.model.generation_config
+        return frozenset(generation_config.t2u_lang_code_to_id) & frozenset(generation_config.vocoder_lang_code_to_id)
+
+    def _accelerate_for_cpu(self):
+        """
+        Applies the configured weight conversion. With `self_check`, the speech encoder
+        output and decoded text of a probe signal are compared against the float32 model
+        first, and startup fails if the converted encoder output deviates too far.
+        """
+        settings = self.cpu_acceleration
+        audio = probe_audio()
+        reference = self._probe(audio) if settings.self_check else None
+
+        self.model, self.dtype = convert_weights(self.model, settings)
+        if reference is None:
+            return
+
+        hidden_states, sequences = self._probe(audio)
+        similarity = output_similarity(reference[0], hidden_states)
+        tokens_equal = torch.equal(reference[1], sequences)
+        logger.info(
+            f"CPU acceleration self-check ({settings.describe()}): encoder similarity {similarity:.4f}, "
+            f"decoded tokens {'identical' if tokens_equal else 'differ'}."
+        )
+        if similarity < settings.min_similarity:
+            raise RuntimeError(
+                f"CPU acceleration ({settings.describe()}) changes the speech encoder output too much "
+                f"(similarity {similarity:.4f} < {settings.min_similarity}). Disable it in config.yaml."
             )
 
-        # SeamlessM4Tv2Model returns audio in output_tokens[0]
-        translated_audio = output_tokens[0].cpu().numpy().squeeze()
+    def _probe(self, audio_np: np.ndarray):
+        """
+        Returns:
+            Tuple[torch.Tensor, torch.Tensor]: Speech encoder output and text token sequence for one input.
+        """
+        with torch.no_grad():
+            audio_inputs = self._prepare_inputs([audio_np])
+            encoder_hidden_states, _ = self._encode_speech(audio_inputs)
+            sequences = self._generate_text(audio_inputs, encoder_hidden_states, self.tgt_lang)
+        return encoder_hidden_states, sequences
+
+    def _log_input_stats(self, audio_np: np.ndarray):
+        input_max = np.max(np.abs(audio_np))
+        input_mean = np.mean(np.abs(audio_np))
+        logger.info(f"Input Stats: Max={input_max:.4f}, Mean={input_mean:.4f}, Length={len(audio_np)} samples")
+
+        if input_max < 0.01:
+            logger.warning("Input audio is extremely quiet! The model might hallucinate.")
 
+    def _encode_wav(self, translated_audio: np.ndarray) -> bytes:
+        """
+        Normalizes a generated waveform and encodes it as an in-memory WAV file.
+        """
         # Check output stats and Normalize to prevent clipping
         out_max = np.max(np.abs(translated_audio))
         logger.info(
@@ -90,8 +656,7 @@ class TranslatorEngine:
             translated_audio = translated_audio * norm_factor
 
         # Convert to WAV bytes in-memory
-        wav_buffer = io.BytesIO()
-        sf.write(wav_buffer, translated_audio.astype(np.float32), 16000, format="WAV")
-        wav_bytes = wav_buffer.getvalue()
-
-        return wav_bytes
+        with metrics.span("wav_encoding"):
+            wav_buffer = io.BytesIO()
+            sf.write(wav_buffer, translated_audio.astype(np.float32), 16000, format="WAV")
+            return wav_buffer.getvalue()
@@ -0,0 +1,201 @@
+import asyncio
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Optional, Set
+
+import numpy as np
+from src.core.config import config
+
+logger = logging.getLogger(__name__)
+
+# What a session's queue does when translation falls behind
+POLICY_BLOCK = "block"  # Stop reading the client's audio until there is room again
+POLICY_COALESCE = "coalesce"  # Translate adjacent waiting utterances together, in one call
+POLICY_DROP_STALE = "drop_stale"  # Skip utterances that waited longer than the latency budget
+POLICIES = (POLICY_BLOCK, POLICY_COALESCE, POLICY_DROP_STALE)
+
+
+@dataclass
+class QueuedUtterance:
+    """A sentence waiting for translation, with its speculative encoding task (if any)."""
+
+    audio: np.ndarray
+    encoding: Optional[asyncio.Future]
+    enqueued_at: float
+
+
+class UtteranceQueue:
+    """
+    Bounded per-session queue between the VAD and the translation loop.
+
+    `max_size` bounds the backlog; the policy decides how it stays bounded. With
+    `block`, the reader waits in `wait_for_space` before handing more audio to the VAD,
+    so the client is slowed down by TCP backpressure (sentences the VAD already has may
+    still overshoot the bound slightly). `coalesce` merges waiting utterances into one
+    translate call of at most `max_coalesced_ms`; `drop_stale` skips utterances older
+    than `max_latency_ms`. The latter two drop the oldest utterance when full.
+    """
+
+    def __init__(self, max_size: int, policy: str, max_latency_ms: int, max_coalesced_ms: int):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown queue policy '{policy}', expected one of {', '.join(POLICIES)}")
+        self.max_size = max(1, max_size)
+        self.policy = policy
+        self.max_latency_s = max_latency_ms / 1000.0
+        self.max_coalesced_samples = int(16000 * max_coalesced_ms / 1000)
+
+        self.dropped = 0
+        self.coalesced = 0
+        self._items: Deque[QueuedUtterance] = deque()
+        self._not_empty = asyncio.Event()
+        self._not_full = asyncio.Event()
+        self._not_full.set()
+        self._closed = False
+
+    def qsize(self) -> int:
+        return len(self._items)
+
+    def queued_seconds(self) -> float:
+        return sum(len(item.audio) for item in self._items) / 16000
+
+    def put_nowait(self, audio: np.ndarray, encoding: Optional[asyncio.Future] = None):
+        """Queues a sentence; never waits, so it can be called from the VAD's sentence callback."""
+        if self._closed:
+            self._discard(QueuedUtterance(audio, encoding, 0.0))
+            return
+        item = QueuedUtterance(audio, encoding, asyncio.get_running_loop().time())
+        if len(self._items) >= self.max_size and self.policy != POLICY_BLOCK:
+            if not (self.policy == POLICY_COALESCE and self._merge_into_tail(item)):
+                self._drop(self._items.popleft(), "queue full")
+                self._items.append(item)
+        else:
+            self._items.append(item)
+        self._not_empty.set()
+        self._update_space()
+
+    async def wait_for_space(self):
+        """Waits while a `block` queue is full; returns at once for the other policies."""
+        if self.policy == POLICY_BLOCK:
+            await self._not_full.wait()
+
+    async def get(self) -> Optional[QueuedUtterance]:
+        """
+        Returns the next utterance to translate, or None once the queue is closed.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            while not self._items:
+                if self._closed:
+                    return None
+                self._not_empty.clear()
+                await self._not_empty.wait()
+
+            item = self._items.popleft()
+            self._update_space()
+            if self.policy == POLICY_DROP_STALE and loop.time() - item.enqueued_at > self.max_latency_s:
+                self._drop(item, "older than latency budget")
+                continue
+            if self.policy == POLICY_COALESCE:
+                while self._items and self._merge(item, self._items[0]):
+                    self._items.popleft()
+                self._update_space()
+            return item
+
+    def close(self) -> int:
+        """
+        Discards everything still waiting (cancelling speculative encodings) and wakes the reader.
+
+        Returns:
+            int: Number of utterances that were discarded.
+        """
+        self._closed = True
+        discarded = len(self._items)
+        while self._items:
+            self._discard(self._items.popleft())
+        self._not_empty.set()
+        self._not_full.set()
+        return discarded
+
+    def _merge_into_tail(self, item: QueuedUtterance) -> bool:
+        return bool(self._items) and self._merge(self._items[-1], item)
+
+    def _merge(self, target: QueuedUtterance, following: QueuedUtterance) -> bool:
+        """Appends `following` to `target` if the result stays within `max_coalesced_ms`."""
+        if len(target.audio) + len(following.audio) > self.max_coalesced_samples:
+            return False
+        target.audio = np.concatenate((target.audio, following.audio))
+        # The encodings belong to the separate sentences, not to the merged audio
+        self._cancel_encoding(target)
+        self._cancel_encoding(following)
+        self.coalesced += 1
+        return True
+
+    def _drop(self, item: QueuedUtterance, reason: str):
+        self.dropped += 1
+        logger.warning(f"Dropping queued utterance ({reason}). Dropped so far: {self.dropped}")
+        self._discard(item)
+
+    def _discard(self, item: QueuedUtterance):
+        self._cancel_encoding(item)
+
+    @staticmethod
+    def _cancel_encoding(item: QueuedUtterance):
+        if item.encoding is not None:
+            item.encoding.cancel()
+            item.encoding = None
+
+    def _update_space(self):
+        if len(self._items) < self.max_size:
+            self._not_full.set()
+        else:
+            self._not_full.clear()
+
+
+class UtteranceQueueMonitor:
+    """
+    Creates the per-session queues from config and aggregates their depth and drop counts.
+    """
+
+    def __init__(self):
+        queue_cfg = config.get("models", {}).get("translation", {}).get("queue", {})
+        self.max_size = int(queue_cfg.get("max_size", 8))
+        self.default_policy = queue_cfg.get("policy", POLICY_BLOCK)
+        self.max_latency_ms = int(queue_cfg.get("max_latency_ms", 10000))
+        self.max_coalesced_ms = int(queue_cfg.get("max_coalesced_ms", 10000))
+
+        self._queues: Set[UtteranceQueue] = set()
+        self._closed_dropped = 0
+        self._closed_coalesced = 0
+        self._discarded_on_disconnect = 0
+
+    def create(self, policy: Optional[str] = None) -> UtteranceQueue:
+        """
+        Raises:
+            ValueError: If `policy` is not one of `POLICIES`.
+        """
+        queue = UtteranceQueue(self.max_size, policy or self.default_policy, self.max_latency_ms, self.max_coalesced_ms)
+        self._queues.add(queue)
+        return queue
+
+    def close(self, queue: UtteranceQueue):
+        """Closes a session's queue and keeps its counts in the totals."""
+        self._discarded_on_disconnect += queue.close()
+        self._queues.discard(queue)
+        self._closed_dropped += queue.dropped
+        self._closed_coalesced += queue.coalesced
+
+    def queued_seconds(self) -> float:
+        """Seconds of audio waiting in all session queues."""
+        return sum(queue.queued_seconds() for queue in self._queues)
+
+    def snapshot(self) -> Dict[str, int]:
+        depths = [queue.qsize() for queue in self._queues]
+        return {
+            "sessions": len(depths),
+            "depth": sum(depths),
+            "max_depth": max(depths, default=0),
+            "dropped": self._closed_dropped + sum(queue.dropped for queue in self._queues),
+            "coalesced": self._closed_coalesced + sum(queue.coalesced for queue in self._queues),
+            "discarded_on_disconnect": self._discarded_on_disconnect,
+        }
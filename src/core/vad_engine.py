@@ -0,0 +1,192 @@
+import asyncio
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+from src.core.config import config
+from src.core.device_manager import DeviceManager
+from src.core.vad_processor import SileroVADModel, VADProcessor
+
+logger = logging.getLogger(__name__)
+
+# A client message and the function that decodes it into float32 samples (None for raw Float32 PCM)
+Chunk = Tuple[bytes, Optional[Callable[[bytes], np.ndarray]]]
+
+
+@dataclass
+class SessionInbox:
+    """Bounded queue of audio chunks from one session, waiting for the VAD worker."""
+
+    on_sentence: Callable[[np.ndarray], None]
+    slots: asyncio.Semaphore
+    chunks: Deque[Chunk] = field(default_factory=deque)
+    on_draft: Optional[Callable[[np.ndarray], None]] = None
+
+
+class VADEngine:
+    """
+    Batched multi-stream VAD inference across all sessions, off the event loop.
+
+    Instead of every session running the Silero network once per 512-sample window,
+    sessions hand their audio to the engine, which collects the ready windows of all
+    sessions and evaluates them in one batched forward pass per step. Each session keeps
+    its own recurrent state (`VADStream`) and start/end state machine, so results are
+    identical to the per-stream path. Windows the sessions' `SilenceGate` flags as silent
+    skip the forward pass.
+
+    All buffering and inference runs in one dedicated worker thread; the event loop only
+    moves chunks into per-session inboxes and delivers finished sentences. Chunks that
+    arrive while the worker is busy are processed together in its next cycle.
+    """
+
+    def __init__(self, model: SileroVADModel, threads: Optional[int] = None):
+        self.model = model
+        vad_cfg = config.get("models", {}).get("vad", {})
+        self.max_batch_size = max(1, int(vad_cfg.get("max_batch_size", 64)))
+        self.inbox_size = max(1, int(vad_cfg.get("inbox_size", 32)))
+
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="vad-worker")
+        if threads is not None:
+            # The worker's own torch intra-op budget (see `DeviceManager.dedicate_thread`)
+            DeviceManager.dedicate_thread(self._executor, threads)
+        self._inboxes: Dict[VADProcessor, SessionInbox] = {}
+        self._cycle: Optional[asyncio.Future] = None
+        self._cycle_sessions: Set[VADProcessor] = set()
+
+    def register(
+        self,
+        session: VADProcessor,
+        on_sentence: Callable[[np.ndarray], None],
+        on_draft: Optional[Callable[[np.ndarray], None]] = None,
+    ):
+        """
+        Attaches a session to the engine.
+
+        Args:
+            session (VADProcessor): The session's VAD state.
+            on_sentence (Callable): Called on the event loop with each completed sentence.
+            on_draft (Callable, optional): Called on the event loop with each new draft of the
+                sentence in progress (speculative sessions only), always before that sentence.
+        """
+        self._inboxes[session] = SessionInbox(
+            on_sentence=on_sentence, slots=asyncio.Semaphore(self.inbox_size), on_draft=on_draft
+        )
+
+    async def unregister(self, session: VADProcessor):
+        """Detaches a session and waits until the worker no longer touches it."""
+        self._inboxes.pop(session, None)
+        if self._cycle is not None and session in self._cycle_sessions:
+            # asyncio.wait neither cancels the cycle nor raises its errors (those are logged elsewhere)
+            await asyncio.wait({self._cycle})
+
+    async def submit(
+        self, session: VADProcessor, chunk_bytes: bytes, decode: Optional[Callable[[bytes], np.ndarray]] = None
+    ):
+        """
+        Queues an audio chunk for the VAD worker.
+
+        Waits only when the session's inbox is full, which applies backpressure to that
+        client instead of letting its backlog grow.
+
+        Args:
+            session (VADProcessor): The session the audio belongs to.
+            chunk_bytes (bytes): Raw Float32 PCM, or encoded audio if `decode` is given.
+            decode (Callable, optional): Turns the chunk into float32 samples; runs in the worker thread.
+        """
+        inbox = self._inboxes[session]
+        await inbox.slots.acquire()
+        inbox.chunks.append((chunk_bytes, decode))
+        self._schedule_cycle()
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _schedule_cycle(self):
+        if self._cycle is not None:
+            return
+
+        work = {session: list(inbox.chunks) for session, inbox in self._inboxes.items() if inbox.chunks}
+        if not work:
+            return
+        for session in work:
+            self._inboxes[session].chunks.clear()
+
+        loop = asyncio.get_running_loop()
+        self._cycle_sessions = set(work)
+        self._cycle = loop.run_in_executor(self._executor, self._run_cycle, work)
+        self._cycle.add_done_callback(lambda cycle: self._finish_cycle(cycle, work))
+
+    def _run_cycle(self, work: Dict[VADProcessor, List[Chunk]]) -> Dict[VADProcessor, List[np.ndarray]]:
+        """Worker thread: decodes and buffers the queued chunks and runs batched inference over them."""
+        for session, chunks in work.items():
+            for chunk_bytes, decode in chunks:
+                if decode is None:
+                    session.append_audio(chunk_bytes)
+                    continue
+                try:
+                    session.append_audio(decode(chunk_bytes))
+                except Exception as e:
+                    # Only this chunk is lost, not the cycle of every session
+                    logger.warning(f"Could not decode an audio chunk: {e}")
+        return self.run(list(work))
+
+    def _finish_cycle(self, cycle: asyncio.Future, work: Dict[VADProcessor, List[Chunk]]):
+        """Event loop: frees inbox slots, delivers sentences and starts the next cycle."""
+        self._cycle = None
+        self._cycle_sessions = set()
+
+        if cycle.cancelled():
+            return
+        if cycle.exception() is not None:
+            logger.error(f"Batched VAD cycle failed: {cycle.exception()}")
+            sentences = {}
+        else:
+            sentences = cycle.result()
+
+        for session, chunks in work.items():
+            inbox = self._inboxes.get(session)
+            if inbox is None:
+                continue  # Session disconnected during the cycle
+            for _ in chunks:
+                inbox.slots.release()
+            draft = session.pop_draft()
+            if draft is not None and inbox.on_draft is not None:
+                inbox.on_draft(draft)
+            for sentence_audio in sentences.get(session, []):
+                inbox.on_sentence(sentence_audio)
+
+        self._schedule_cycle()
+
+    def run(self, sessions: List[VADProcessor]) -> Dict[VADProcessor, List[np.ndarray]]:
+        """
+        Consumes every complete window buffered by the given sessions.
+
+        Windows of one stream depend on each other through the recurrent state, so each
+        step takes at most one window per session; sessions with more buffered audio take
+        part in several consecutive steps.
+
+        Returns:
+            Dict[VADProcessor, List[np.ndarray]]: Completed sentences per session.
+        """
+        sentences: Dict[VADProcessor, List[np.ndarray]] = {}
+        while True:
+            ready = [session for session in sessions if session.has_window()]
+            if not ready:
+                return sentences
+            for start in range(0, len(ready), self.max_batch_size):
+                self.step(ready[start : start + self.max_batch_size], sentences)
+
+    def step(self, sessions: List[VADProcessor], sentences: Dict[VADProcessor, List[np.ndarray]]):
+        """Runs one batched forward pass over the next window of each given session."""
+        windows = [session.next_window() for session in sessions]
+        speech_probs = self.model.evaluate(
+            [session.stream for session in sessions], windows, [session.skips_inference() for session in sessions]
+        )
+
+        for session, window, speech_prob in zip(sessions, windows, speech_probs):
+            sentence_audio = session.advance(window, speech_prob)
+            if sentence_audio is not None:
+                sentences.setdefault(session, []).append(sentence_audio)
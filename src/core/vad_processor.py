@@ -1,41 +1,388 @@
 import torch
 import numpy as np
 import logging
-from typing import Optional, List
+from collections import deque
+from typing import Deque, Optional, List, Tuple, Union
 from src.core.config import config
+from src.core.device_manager import DeviceManager
+from src.core.audio_buffer import AudioFifo, SentenceBuffer
+from src.core.metrics import metrics
 
 logger = logging.getLogger(__name__)
 
 
-class VADProcessor:
-    def __init__(self):
-        # Load Silero VAD model
-        self.model, utils = torch.hub.load(
-            repo_or_dir="snakers4/silero-vad", model="silero_vad", force_reload=False, onnx=False
+WINDOW_SIZE_SAMPLES = 512
+
+
+class TorchVADBackend:
+    """
+    Silero's JIT model through PyTorch, as shipped with the installed `silero-vad` package.
+
+    Batching needs Silero's stateless inner network (`_model`) and its context length
+    (`context_size_samples`). Neither is public API, so the package version is pinned in
+    requirements.txt and both are checked when the backend is created.
+    """
+
+    name = "torch"
+
+    def __init__(self, model: Optional[torch.jit.ScriptModule] = None):
+        """
+        Raises:
+            RuntimeError: If the model lacks the internals this backend relies on.
+        """
+        import silero_vad
+
+        if model is None:
+            model = silero_vad.load_silero_vad(onnx=False)
+        # Stateless sub-network: forward(audio_with_context, state) -> (speech_prob, new_state)
+        self.network = getattr(model, "_model", None)
+        if self.network is None or not hasattr(self.network, "context_size_samples"):
+            raise RuntimeError(
+                f"silero-vad {silero_vad.__version__} has no _model.context_size_samples, which the torch "
+                f"VAD backend needs. Install the silero-vad version pinned in requirements.txt, or set "
+                f"models.vad.backend to 'onnx'."
+            )
+        self.context_size = int(self.network.context_size_samples)
+
+    @torch.no_grad()
+    def __call__(self, audio: np.ndarray, state: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        speech_probs, new_state = self.network(torch.from_numpy(audio), torch.from_numpy(state))
+        return speech_probs[:, 0].numpy(), new_state.numpy()
+
+
+class OnnxVADBackend:
+    """
+    Silero's ONNX export through ONNX Runtime, read from a local file: no torch hub or
+    network access at startup, and a fraction of the per-window overhead of PyTorch.
+
+    Without a path, the model file shipped with the `silero-vad` package is used.
+    """
+
+    name = "onnx"
+    context_size = 64  # Samples of the previous window the 16kHz model sees
+
+    def __init__(self, path: Optional[str] = None, threads: int = 1):
+        try:
+            import onnxruntime
+        except ImportError as e:
+            raise RuntimeError("models.vad.backend 'onnx' needs the onnxruntime package") from e
+
+        if not path:
+            from importlib.resources import files
+
+            path = str(files("silero_vad") / "data" / "silero_vad.onnx")
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = threads
+        options.inter_op_num_threads = 1
+        self.session = onnxruntime.InferenceSession(path, sess_options=options, providers=["CPUExecutionProvider"])
+        self.path = path
+        self._sample_rate = np.array(SileroVADModel.SAMPLE_RATE, dtype=np.int64)
+
+    def __call__(self, audio: np.ndarray, state: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        speech_probs, new_state = self.session.run(None, {"input": audio, "state": state, "sr": self._sample_rate})
+        return speech_probs[:, 0], new_state
+
+
+class SileroVADModel:
+    """
+    Silero VAD network weights, loaded once per process and shared by all sessions.
+
+    The network runs on one of two backends, chosen with `models.vad.backend`: PyTorch
+    (`TorchVADBackend`) or ONNX Runtime (`OnnxVADBackend`). Both are used as a stateless
+    function of (audio with context, recurrent state), so the model can be shared between
+    streams: each session owns a `VADStream` holding its state, and `infer` evaluates any
+    number of streams at once.
+    """
+
+    SAMPLE_RATE = 16000
+    STATE_SHAPE = (2, 1, 128)
+    BACKENDS = ("torch", "onnx")
+
+    def __init__(self, backend: Optional[str] = None):
+        vad_cfg = config.get("models", {}).get("vad", {})
+        backend = backend or vad_cfg.get("backend", "torch")
+        if backend == "onnx":
+            # ONNX Runtime has its own thread pool, sized like the torch budget of the VAD worker
+            threads = DeviceManager.plan_threads().vad_threads
+            self.backend = OnnxVADBackend(vad_cfg.get("onnx_path") or None, threads)
+        elif backend == "torch":
+            self.backend = TorchVADBackend()
+        else:
+            raise ValueError(f"Unknown VAD backend '{backend}', expected one of {', '.join(self.BACKENDS)}")
+        self.context_size = self.backend.context_size
+        # How a stream's state is restarted after windows the `SilenceGate` let skip the network (see `_resume`)
+        self.restart_after_windows = int(vad_cfg.get("pre_gate_restart_after_windows", 4))
+        self.priming_windows = int(vad_cfg.get("pre_gate_priming_windows", 2))
+        if not 0 <= self.priming_windows <= self.restart_after_windows or self.restart_after_windows < 1:
+            raise ValueError(
+                f"Invalid pre-gate restart: priming {self.priming_windows} of {self.restart_after_windows} skipped "
+                f"windows, expected 0 <= pre_gate_priming_windows <= pre_gate_restart_after_windows and at least 1"
+            )
+        # Windows evaluated by the network and windows the `SilenceGate` let skip it
+        self.windows_inferred = 0
+        self.windows_skipped = 0
+
+    def create_stream(self) -> "VADStream":
+        return VADStream(self)
+
+    def infer(self, streams: List["VADStream"], windows: np.ndarray) -> np.ndarray:
+        """
+        Evaluates one window per stream in a single batched forward pass.
+
+        Args:
+            streams (List[VADStream]): Streams whose recurrent state is used and advanced.
+            windows (np.ndarray): Audio windows of shape (len(streams), 512).
+
+        Returns:
+            np.ndarray: Speech probability per stream.
+        """
+        audio = np.concatenate([np.concatenate([stream.context for stream in streams]), windows], axis=1)
+        state = np.concatenate([stream.state for stream in streams], axis=1)
+
+        with metrics.span("vad_window", count=len(streams)):
+            speech_probs, new_state = self.backend(audio, state)
+
+        for index, stream in enumerate(streams):
+            stream.state = new_state[:, index : index + 1]
+            stream.context = audio[index : index + 1, -self.context_size :]
+        self.windows_inferred += len(streams)
+        return speech_probs
+
+    def evaluate(self, streams: List["VADStream"], windows: List[np.ndarray], silent: List[bool]) -> np.ndarray:
+        """
+        Like `infer`, but windows flagged as silent by the `SilenceGate` skip the network.
+
+        A skipped window gets speech probability 0 and only moves its stream's audio
+        context along. Its recurrent state is not advanced, so after a longer gap it would
+        still describe the audio from before the silence when the network runs again: a
+        stream that skipped `restart_after_windows` or more is restarted first (see
+        `_resume`). Shorter gaps, as where the gate flickers on noise near its threshold,
+        leave the state as it was.
+
+        Returns:
+            np.ndarray: Speech probability per stream.
+        """
+        speech_probs = np.zeros(len(streams), dtype=np.float32)
+        evaluated = [index for index, skip in enumerate(silent) if not skip]
+        resumed = []
+        for index in evaluated:
+            stream = streams[index]
+            if stream.gap_windows >= self.restart_after_windows:
+                resumed.append(stream)
+            stream.gap_windows = 0
+        if resumed:
+            self._resume(resumed)
+        if evaluated:
+            speech_probs[evaluated] = self.infer(
+                [streams[index] for index in evaluated], np.stack([windows[index] for index in evaluated])
+            )
+        if len(evaluated) < len(streams):
+            for stream, window, skip in zip(streams, windows, silent):
+                if skip:
+                    stream.context = window[np.newaxis, -self.context_size :].copy()
+                    stream.skipped.append(window.copy())
+                    stream.gap_windows += 1
+            self.windows_skipped += len(streams) - len(evaluated)
+        return speech_probs
+
+    def _resume(self, streams: List["VADStream"]):
+        """
+        Restarts the recurrent state of streams the `SilenceGate` let skip a longer gap.
+
+        Each state is reset, as at the start of a stream, and primed with the last
+        `priming_windows` skipped windows (batched across streams), so the network has
+        heard a little of the silence before the window that reopened the gate.
+
+        The restarted state is not the one the network would have reached over the whole
+        gap, so speech starts can be detected differently than with the gate off.
+        """
+        primers = [list(stream.skipped) for stream in streams]
+        for stream in streams:
+            stream.reset_states()
+        # The gap is at least `priming_windows` long, so every stream has them all
+        for step in range(self.priming_windows):
+            self.infer(streams, np.stack([primer[step] for primer in primers]))
+        # These windows ran through the network after all
+        self.windows_skipped -= self.priming_windows * len(streams)
+
+    def snapshot(self) -> dict:
+        total = self.windows_inferred + self.windows_skipped
+        return {
+            "backend": self.backend.name,
+            "windows_inferred": self.windows_inferred,
+            "windows_skipped": self.windows_skipped,
+            "skipped_ratio": round(self.windows_skipped / total, 3) if total else None,
+        }
+
+
+class VADStream:
+    """Per-session recurrent state (LSTM state and audio context) for the shared Silero network."""
+
+    def __init__(self, model: SileroVADModel):
+        self.model = model
+        self.reset_states()
+
+    def reset_states(self):
+        self.state = np.zeros(self.model.STATE_SHAPE, dtype=np.float32)
+        self.context = np.zeros((1, self.model.context_size), dtype=np.float32)
+        # Windows the `SilenceGate` let skip the network since the state was last advanced, and the last of them
+        self.gap_windows = 0
+        self.skipped: Deque[np.ndarray] = deque(maxlen=self.model.priming_windows)
+
+
+class SilenceGate:
+    """
+    Cheap energy / zero-crossing pre-gate in front of the Silero network.
+
+    Flags the windows of a chunk that are clearly silent, all at once: digital silence
+    or anything below `silence_dbfs`, and broadband noise below `noise_dbfs` (noise
+    crosses zero in most samples, voiced speech at the same level far less often).
+    Sessions only skip the network for flagged windows while no speech is in progress,
+    where a low speech probability changes nothing in the `SpeechStateMachine`.
+
+    The network's recurrent state cannot follow the skipped windows without running on
+    them, so which utterances are detected, and when, can differ from the ungated
+    network. The gate is therefore off unless `models.vad.pre_gate` enables it.
+    """
+
+    def __init__(
+        self, enabled: bool = True, silence_dbfs: float = -60.0, noise_dbfs: float = -50.0, noise_zcr: float = 0.3
+    ):
+        self.enabled = enabled
+        # Thresholds on the mean power of a window, relative to a full-scale signal
+        self.silence_power = 10 ** (silence_dbfs / 10)
+        self.noise_power = 10 ** (noise_dbfs / 10)
+        self.noise_zcr = noise_zcr
+
+    @classmethod
+    def from_config(cls) -> "SilenceGate":
+        vad_cfg = config.get("models", {}).get("vad", {})
+        return cls(
+            enabled=bool(vad_cfg.get("pre_gate", False)),
+            silence_dbfs=float(vad_cfg.get("pre_gate_silence_dbfs", -60)),
+            noise_dbfs=float(vad_cfg.get("pre_gate_noise_dbfs", -50)),
+            noise_zcr=float(vad_cfg.get("pre_gate_noise_zcr", 0.3)),
         )
-        # Unpack utils to get VADIterator
-        (get_speech_timestamps, save_audio, read_audio, VADIterator, collect_chunks) = utils
+
+    def classify(self, audio: np.ndarray) -> np.ndarray:
+        """
+        Args:
+            audio (np.ndarray): Consecutive model windows (a multiple of 512 samples).
+
+        Returns:
+            np.ndarray: Per window, whether it is clearly silent.
+        """
+        windows = audio.reshape(-1, WINDOW_SIZE_SAMPLES)
+        power = np.einsum("ij,ij->i", windows, windows) / WINDOW_SIZE_SAMPLES
+        signs = np.signbit(windows)
+        zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / (WINDOW_SIZE_SAMPLES - 1)
+        return (power < self.silence_power) | ((power < self.noise_power) & (zcr > self.noise_zcr))
+
+
+class SpeechStateMachine:
+    """
+    Silero's `VADIterator` start/end logic, driven by precomputed speech probabilities.
+
+    Separating the bookkeeping from inference is what allows the `VADEngine` to
+    evaluate the windows of many streams in one batched forward pass.
+    """
+
+    def __init__(self, threshold: float, sampling_rate: int, min_silence_duration_ms: int, speech_pad_ms: int = 30):
+        self.threshold = threshold
+        self.min_silence_samples = sampling_rate * min_silence_duration_ms / 1000
+        self.speech_pad_samples = sampling_rate * speech_pad_ms / 1000
+        self.reset_states()
+
+    def reset_states(self):
+        self.triggered = False
+        self.temp_end = 0
+        self.current_sample = 0
+
+    def __call__(self, speech_prob: float, window_size: int) -> Optional[dict]:
+        """
+        Advances the state machine by one window.
+
+        Returns:
+            Optional[dict]: {"start": sample} or {"end": sample} on a state change, otherwise None.
+        """
+        self.current_sample += window_size
+
+        if speech_prob >= self.threshold and self.temp_end:
+            self.temp_end = 0
+
+        if speech_prob >= self.threshold and not self.triggered:
+            self.triggered = True
+            return {"start": int(max(0, self.current_sample - self.speech_pad_samples - window_size))}
+
+        if speech_prob < self.threshold - 0.15 and self.triggered:
+            if not self.temp_end:
+                self.temp_end = self.current_sample
+            if self.current_sample - self.temp_end < self.min_silence_samples:
+                return None
+            speech_end = self.temp_end + self.speech_pad_samples - window_size
+            self.temp_end = 0
+            self.triggered = False
+            return {"end": int(speech_end)}
+
+        return None
+
+
+class VADProcessor:
+    """
+    Per-connection VAD session: stream state, audio buffers and sensitivity settings.
+
+    The Silero weights live in a shared `SileroVADModel`; creating a processor is cheap.
+    `process` runs the model for this stream alone; the `VADEngine` instead drives many
+    processors through `next_window`/`advance` with batched inference.
+    """
+
+    def __init__(self, model: Optional[SileroVADModel] = None, speculative: Optional[bool] = None):
+        """
+        Args:
+            model (SileroVADModel, optional): Shared Silero weights. Loaded if omitted.
+            speculative (bool, optional): Whether to offer drafts; defaults to
+                `models.translation.speculative_encoding`. `reset` restores this setting.
+        """
+        self.model = model if model is not None else SileroVADModel()
+        self.stream = self.model.create_stream()
 
         # Configuration
         self.threshold = config.get("models", {}).get("vad", {}).get("threshold", 0.5)
-        self.min_silence_ms = config.get("models", {}).get("vad", {}).get("min_silence_duration_ms", 500)
+        self.default_min_silence_ms = config.get("models", {}).get("vad", {}).get("min_silence_duration_ms", 500)
+        self.min_silence_ms = self.default_min_silence_ms
         self.padding_ms = config.get("models", {}).get("vad", {}).get("padding_ms", 0)
-        self.sample_rate = 16000
+        self.sample_rate = SileroVADModel.SAMPLE_RATE
+        # Long monologues are cut into segments of at most this length (0 disables the cap)
+        max_segment_ms = config.get("models", {}).get("vad", {}).get("max_segment_ms", 15000)
+        split_search_ms = config.get("models", {}).get("vad", {}).get("split_search_ms", 3000)
+        self.max_segment_samples = int(max_segment_ms * self.sample_rate / 1000)
+        self.split_search_samples = int(split_search_ms * self.sample_rate / 1000)
 
-        # Initialize Iterator
-        # VADIterator handles the "speech detected" -> "silence" state machine
-        self.iterator = VADIterator(
-            self.model,
+        # The iterator handles the "speech detected" -> "silence" state machine
+        self.iterator = SpeechStateMachine(
             threshold=self.threshold,
             sampling_rate=self.sample_rate,
             min_silence_duration_ms=self.min_silence_ms,
         )
 
-        # Buffers
-        self.processing_buffer = np.array([], dtype=np.float32)  # For feeding the model in correct chunk sizes
-        self.sentence_buffer: List[np.ndarray] = []  # For accumulating the actual audio to return
+        # Buffers are preallocated once per session and reused across sentences and connections
+        self.processing_buffer = AudioFifo(self.sample_rate)  # For feeding the model in correct chunk sizes
+        # Pre-gate verdicts of the complete windows in the processing buffer, and of the window last read
+        self.gate = SilenceGate.from_config()
+        self.silent_windows: Deque[bool] = deque()
+        self.window_silent = False
+        self.sentence_buffer = SentenceBuffer(10 * self.sample_rate)  # For accumulating the audio to return
+        self.window_probs: List[float] = []  # Speech probability of each window in the sentence buffer
         self.is_recording = False
 
+        # Speculative encoding: when speech pauses, the sentence so far is offered as a draft
+        if speculative is None:
+            speculative = config.get("models", {}).get("translation", {}).get("speculative_encoding", False)
+        self.default_speculative = bool(speculative)
+        self.speculative = self.default_speculative
+        self.draft: Optional[np.ndarray] = None  # Draft of the sentence in progress, if still valid
+        self.new_draft: Optional[np.ndarray] = None  # Latest draft not yet picked up via `pop_draft`
+
     def set_min_silence(self, ms: int):
         """
         Dynamically updates the VAD sensitivity (min silence duration).
@@ -46,84 +393,223 @@ class VADProcessor:
 
         logger.info(f"VAD Config Update: min_silence_duration_ms set to {ms}")
         self.min_silence_ms = ms
-        # Update Silero iterator property
+        # Update iterator property
         # min_silence_samples is calculated as: ms * sample_rate / 1000
         self.iterator.min_silence_samples = int((ms * self.sample_rate) / 1000)
 
+    def set_speculative(self, enabled: bool):
+        """Switches speculative encoding drafts on or off for this session."""
+        logger.info(f"VAD Config Update: speculative encoding {'enabled' if enabled else 'disabled'}")
+        self.speculative = enabled
+        if not enabled:
+            self.draft = None
+            self.new_draft = None
+
+    def pop_draft(self) -> Optional[np.ndarray]:
+        """Returns the draft produced since the last call, if any."""
+        draft, self.new_draft = self.new_draft, None
+        return draft
+
     def process(self, chunk_bytes: bytes) -> Optional[np.ndarray]:
         """
         Processes a chunk of audio. Returns a complete sentence as np.ndarray
         if silence is detected after speech.
         """
-        chunk_np = np.frombuffer(chunk_bytes, dtype=np.float32)
-        if len(chunk_np) == 0:
-            return None
+        self.append_audio(chunk_bytes)
+
+        while self.has_window():
+            sentence_audio = self.step()
+            # Return the sentence immediately; remaining audio is handled by the next call
+            if sentence_audio is not None:
+                return sentence_audio
+
+        return None
+
+    def step(self) -> Optional[np.ndarray]:
+        """Runs the next window through the model (for this stream alone) and the state machine."""
+        window = self.next_window()
+        speech_prob = self.model.evaluate([self.stream], [window], [self.skips_inference()])[0]
+        return self.advance(window, speech_prob)
+
+    def append_audio(self, chunk: Union[bytes, np.ndarray]):
+        """Appends a raw Float32 PCM chunk (or decoded float32 samples) to the processing buffer."""
+        complete_windows = len(self.processing_buffer) // WINDOW_SIZE_SAMPLES
+        self.processing_buffer.write(chunk if isinstance(chunk, np.ndarray) else np.frombuffer(chunk, dtype=np.float32))
+        if self.gate.enabled:
+            # Reads always take whole windows, so the unread audio starts at a window boundary
+            ready_windows = len(self.processing_buffer) // WINDOW_SIZE_SAMPLES
+            if ready_windows > complete_windows:
+                audio = self.processing_buffer.peek(ready_windows * WINDOW_SIZE_SAMPLES)
+                self.silent_windows.extend(self.gate.classify(audio[complete_windows * WINDOW_SIZE_SAMPLES :]).tolist())
+
+    def has_window(self) -> bool:
+        return len(self.processing_buffer) >= WINDOW_SIZE_SAMPLES
+
+    def next_window(self) -> np.ndarray:
+        """
+        Removes and returns the next model window from the processing buffer.
+
+        The window is a view that stays valid only until the next `append_audio`.
+        """
+        self.window_silent = self.silent_windows.popleft() if self.silent_windows else False
+        return self.processing_buffer.read(WINDOW_SIZE_SAMPLES)
+
+    def skips_inference(self) -> bool:
+        """
+        Whether the window last returned by `next_window` can skip the network.
+
+        Only clearly silent windows outside of speech do: there, any probability below the
+        threshold has the same effect on the state machine. The network's own state is
+        restarted when it runs again (see `SileroVADModel._resume`). Inside speech, every
+        window is evaluated, since the network's probability decays over several windows
+        after speech ends.
+        """
+        return self.window_silent and not self.is_recording
+
+    def advance(self, window: np.ndarray, speech_prob: float) -> Optional[np.ndarray]:
+        """
+        Feeds one window and its speech probability through the state machine.
+
+        Returns:
+            Optional[np.ndarray]: The padded sentence audio if this window ended a sentence.
+        """
+        # It returns a dict if state changes, or None
+        speech_dict = self.iterator(speech_prob, len(window))
+
+        # "start" in dict means speech started; the current window contains the start
+        if speech_dict and "start" in speech_dict:
+            logger.info("VAD: Speech started.")
+            self.is_recording = True
 
-        # Append to processing buffer
-        self.processing_buffer = np.concatenate([self.processing_buffer, chunk_np])
-
-        WINDOW_SIZE_SAMPLES = 512
-
-        sentence_complete = False
-
-        while len(self.processing_buffer) >= WINDOW_SIZE_SAMPLES:
-            # Extract window
-            window = self.processing_buffer[:WINDOW_SIZE_SAMPLES]
-            self.processing_buffer = self.processing_buffer[WINDOW_SIZE_SAMPLES:]
-
-            chunk_torch = torch.from_numpy(window)
-
-            # Use VADIterator
-            # It returns a dict if state changes, or None
-            speech_dict = self.iterator(chunk_torch, return_seconds=False)
-
-            # "start" in dict means speech started
-            if speech_dict and "start" in speech_dict:
-                logger.info("VAD: Speech started.")
-                self.is_recording = True
-                # We might want to include some context before start, but for now strict cut.
-
-            # Always buffer if we are recording (or maybe we buffer everything and cut later?
-            # Simple approach: If inside a speech segment (or just triggered), append.)
-            # VADIterator expects continuous stream. We should accumulate audio
-            # while 'is_recording' is True.
-            # CAUTION: 'start' might come *after* we passed the relevant chunk if we aren't careful,
-            # but VADIterator returns 'start' relative to the current stream position it tracks.
-
-            # Actually, simpler: Always accumulate to a temporary rolling buffer?
-            # Let's stick to: If recording, append.
-            # But the 'start' signal means the *current* chunk contains the start.
-
-            if self.is_recording:
-                self.sentence_buffer.append(window)
-
-            # "end" in dict means speech ended
-            if speech_dict and "end" in speech_dict:
-                logger.info("VAD: Speech ended.")
-                self.is_recording = False
-                sentence_complete = True
-                # The iterator resets itself automatically for the next sentence
-                # We break to return the sentence immediately
-                break
-
-        if sentence_complete and self.sentence_buffer:
-            full_audio = np.concatenate(self.sentence_buffer)
-            self.sentence_buffer = []  # Reset buffer
-            # self.iterator.reset_states() # VADIterator does this internally usually, but 'reset_states' is for hard reset
-            
-            # Apply Padding
-            if self.padding_ms > 0:
-                pad_samples = int((self.padding_ms / 1000.0) * self.sample_rate)
-                silence = np.zeros(pad_samples, dtype=np.float32)
-                full_audio = np.concatenate([silence, full_audio, silence])
-                logger.info(f"VAD: Added {self.padding_ms}ms padding to audio.")
-
-            return full_audio
+        if self.is_recording:
+            self.sentence_buffer.append(window)
+            self.window_probs.append(float(speech_prob))
+
+        # "end" in dict means speech ended
+        if speech_dict and "end" in speech_dict:
+            logger.info("VAD: Speech ended.")
+            self.is_recording = False
+            return self._finish_sentence()
+
+        if self.is_recording and 0 < self.max_segment_samples <= len(self.sentence_buffer):
+            return self._split_segment()
+
+        if self.speculative and self.is_recording:
+            self._update_draft()
 
         return None
 
+    def flush(self) -> Optional[np.ndarray]:
+        """
+        Ends the stream (e.g. at the end of a file): returns the sentence still in progress,
+        if any, as if silence had followed it.
+        """
+        if not self.is_recording:
+            return None
+        self.is_recording = False
+        self.iterator.reset_states()
+        return self._finish_sentence()
+
+    def _split_segment(self) -> np.ndarray:
+        """
+        Cuts a sentence that reached `max_segment_samples` while speech continues.
+
+        The cut goes after the window with the lowest combined speech probability and
+        relative energy within the last `split_search_samples`, i.e. the most likely
+        word boundary. The rest stays buffered as the start of the next segment.
+        """
+        num_windows = len(self.window_probs)
+        search_windows = min(num_windows, max(1, self.split_search_samples // WINDOW_SIZE_SAMPLES))
+        first = num_windows - search_windows
+
+        audio = self.sentence_buffer.view()[first * WINDOW_SIZE_SAMPLES :]
+        energy = np.sqrt(np.mean(np.square(audio.reshape(search_windows, WINDOW_SIZE_SAMPLES)), axis=1))
+        score = np.asarray(self.window_probs[first:]) + energy / max(float(energy.max()), 1e-6)
+        split_window = first + int(np.argmin(score)) + 1
+
+        logger.info(
+            f"VAD: Segment reached {self.max_segment_samples / self.sample_rate:.1f}s, "
+            f"splitting at {split_window * WINDOW_SIZE_SAMPLES / self.sample_rate:.2f}s."
+        )
+        # A draft covers audio that is now part of the emitted segment
+        self.draft = None
+        self.new_draft = None
+        del self.window_probs[:split_window]
+        return self.sentence_buffer.pop_front_padded(split_window * WINDOW_SIZE_SAMPLES, self._pad_samples())
+
+    def _update_draft(self):
+        """
+        Offers the sentence so far as a draft when speech pauses, and drops the draft
+        again if speech resumes before `min_silence_ms` has passed.
+        """
+        if self.iterator.temp_end and self.draft is None:
+            self.draft = self.sentence_buffer.copy_padded(self._pad_samples())
+            self.new_draft = self.draft
+        elif not self.iterator.temp_end and self.draft is not None:
+            self.draft = None
+            self.new_draft = None
+
+    def _pad_samples(self) -> int:
+        return int((self.padding_ms / 1000.0) * self.sample_rate)
+
+    def _finish_sentence(self) -> Optional[np.ndarray]:
+        if self.draft is not None:
+            # Everything after the draft is silence: return the draft itself, so that its
+            # speculative encoding is valid for the final sentence
+            draft, self.draft = self.draft, None
+            self.sentence_buffer.clear()
+            self.window_probs.clear()
+            return draft
+
+        if len(self.sentence_buffer) == 0:
+            return None
+
+        # Apply Padding
+        pad_samples = self._pad_samples()
+        if pad_samples > 0:
+            logger.info(f"VAD: Added {self.padding_ms}ms padding to audio.")
+
+        self.window_probs.clear()
+        return self.sentence_buffer.pop_padded(pad_samples)
+
     def reset(self):
+        """
+        Clears all stream state and restores the configured sensitivity, so the
+        processor can be handed to a new connection.
+        """
         self.iterator.reset_states()
-        self.processing_buffer = np.array([], dtype=np.float32)
-        self.sentence_buffer = []
+        self.stream.reset_states()
+        self.processing_buffer.clear()
+        self.silent_windows.clear()
+        self.window_silent = False
+        self.sentence_buffer.clear()
+        self.window_probs.clear()
         self.is_recording = False
+        self.min_silence_ms = self.default_min_silence_ms
+        self.iterator.min_silence_samples = int((self.min_silence_ms * self.sample_rate) / 1000)
+        self.speculative = self.default_speculative
+        self.draft = None
+        self.new_draft = None
+
+
+class VADSessionPool:
+    """
+    Hands out per-connection `VADProcessor` sessions backed by one shared Silero model.
+
+    Released sessions are reset and kept for reuse, up to `max_idle` of them.
+    """
+
+    def __init__(self, model: SileroVADModel, max_idle: int = 16):
+        self.model = model
+        self.max_idle = max_idle
+        self._idle: List[VADProcessor] = []
+
+    def acquire(self) -> VADProcessor:
+        session = self._idle.pop() if self._idle else VADProcessor(self.model)
+        session.reset()
+        return session
+
+    def release(self, session: VADProcessor):
+        session.reset()
+        if len(self._idle) < self.max_idle:
+            self._idle.append(session)
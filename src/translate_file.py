@@ -0,0 +1,117 @@
+"""
+Translates a recorded audio file on this machine, without the server: the same VAD
+segmentation and concurrent, in-order translation as `POST /translate/file`, with the
+model(s) configured in config.yaml (including `models.translation.workers`).
+
+The translated text is printed line by line with its position in the source; with
+`--output`, the translated speech is written to a 16kHz WAV file laid out along the
+source timeline. Progress goes to stderr.
+
+Usage (from the project root):
+    python -m src.translate_file sermon.flac --tgt-lang eng --output sermon_eng.wav
+    python -m src.translate_file meeting.wav --tgt-lang deu > meeting_deu.txt
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import aclosing
+from typing import Optional
+
+import soundfile as sf
+from src.core.config import config
+from src.core.device_manager import DeviceManager
+from src.core.file_translation import SAMPLE_RATE, FileSegmenter, FileTranslationJob, SpeechTimeline
+from src.core.inference_scheduler import InferenceScheduler
+from src.core.inference_workers import InferenceWorkerPool
+from src.core.translator_engine import TranslatorEngine
+from src.core.vad_processor import SileroVADModel
+
+
+def format_time(seconds: float) -> str:
+    minutes, seconds = divmod(seconds, 60)
+    return f"{int(minutes // 60):02d}:{int(minutes % 60):02d}:{seconds:04.1f}"
+
+
+def load_translator():
+    """Model replicas in worker processes if configured, else one engine in this process (like the server)."""
+    translator = InferenceWorkerPool.from_config()
+    if translator is None:
+        return TranslatorEngine(DeviceManager())
+    translator.start()
+    return translator
+
+
+def report_progress(job: FileTranslationJob):
+    snapshot = job.snapshot()
+    progress = f"{snapshot['progress']:.1%}" if snapshot["progress"] is not None else "?"
+    print(
+        f"\r{progress} {snapshot['translated_s']:.0f}/{snapshot['duration_s'] or 0:.0f} s, "
+        f"{snapshot['segments']} segments, {snapshot['speed']:.1f}x real time",
+        end="",
+        file=sys.stderr,
+        flush=True,
+    )
+
+
+async def translate_file(args, translator, vad_model: SileroVADModel) -> FileTranslationJob:
+    plan = DeviceManager.thread_plan
+    if plan is not None and plan.executor_threads:
+        asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=plan.executor_threads))
+    scheduler = InferenceScheduler(translator)
+    scheduler.start()
+    block_s = float(config.get("file_translation", {}).get("block_s", 10))
+    job = FileTranslationJob(
+        FileSegmenter(args.input, vad_model, block_s), scheduler, args.tgt_lang, args.output is not None
+    )
+    timeline = SpeechTimeline()
+    speech_file: Optional[sf.SoundFile] = None
+    if args.output is not None:
+        speech_file = sf.SoundFile(args.output, "w", SAMPLE_RATE, 1, "PCM_16")
+    try:
+        async with aclosing(job.results()) as results:
+            async for result in results:
+                print(f"[{format_time(result.start_s)} - {format_time(result.end_s)}] {result.text}", flush=True)
+                if speech_file is not None:
+                    for piece in timeline.place(result):
+                        speech_file.write(piece)
+                report_progress(job)
+    finally:
+        if speech_file is not None:
+            speech_file.close()
+        await scheduler.stop()
+        print(file=sys.stderr)
+    return job
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help="Audio file in any format libsndfile reads (WAV, FLAC, OGG, MP3, ...).")
+    parser.add_argument("--tgt-lang", default=config.get("models", {}).get("translation", {}).get("tgt_lang", "eng"))
+    parser.add_argument("--output", help="Write the translated speech to this WAV file.")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    DeviceManager.apply_thread_plan()
+    translator = load_translator()
+    try:
+        if args.output is not None and not translator.speech_enabled:
+            parser.error("speech output is disabled in config.yaml (models.translation.output_modalities)")
+        if args.output is not None and not translator.supports_speech(args.tgt_lang):
+            parser.error(f"{args.tgt_lang} has text output only, speech output is not available")
+        job = asyncio.run(translate_file(args, translator, SileroVADModel()))
+    finally:
+        if hasattr(translator, "close"):
+            translator.close()
+    snapshot = job.snapshot()
+    print(
+        f"Translated {snapshot['translated_s']:.0f} s in {snapshot['elapsed_s']:.0f} s "
+        f"({snapshot['speed']:.1f}x real time, {snapshot['failed_segments']} failed segment(s)).",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+from src.core.admission import STATE_DEGRADED, STATE_FULL, STATE_OK, AdmissionController, LoadTracker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeScheduler:
+    max_concurrent_batches = 2
+
+    def __init__(self, clock):
+        self.load = LoadTracker(window_s=10.0, clock=clock)
+        self.backlog_s = 0.0
+
+    def backlog_seconds(self):
+        return self.backlog_s
+
+
+class FakeQueues:
+    def queued_seconds(self):
+        return 0.0
+
+
+def make_controller(demand_per_s, rtf):
+    """A controller whose scheduler has seen `demand_per_s` seconds of audio per second for 10 s."""
+    clock = FakeClock()
+    scheduler = FakeScheduler(clock)
+    for _ in range(10):
+        scheduler.load.record_arrival(demand_per_s)
+        clock.now += 1.0
+    scheduler.load.record_batch(audio_s=10.0, busy_s=10.0 * rtf)
+    return AdmissionController(scheduler, FakeQueues()), scheduler, clock
+
+
+def test_load_tracker_measures_rtf_and_windowed_demand():
+    clock = FakeClock()
+    tracker = LoadTracker(window_s=10.0, smoothing=0.5, clock=clock)
+    assert tracker.demand() == 0.0 and tracker.rtf is None
+
+    tracker.record_batch(audio_s=4.0, busy_s=2.0)
+    tracker.record_batch(audio_s=4.0, busy_s=1.0)
+    assert tracker.rtf == 0.375
+
+    for _ in range(20):
+        tracker.record_arrival(2.0)
+        clock.now += 1.0
+    # Only the last 10 s count
+    assert tracker.demand() == 2.0
+
+
+def test_states_follow_predicted_load():
+    # Load = demand * rtf / 2 replicas
+    assert make_controller(demand_per_s=2.0, rtf=0.5)[0].decide().state == STATE_OK  # 0.5
+    assert make_controller(demand_per_s=3.4, rtf=0.5)[0].decide().state == STATE_DEGRADED  # 0.85
+    assert make_controller(demand_per_s=4.4, rtf=0.5)[0].decide().state == STATE_FULL  # 1.1
+
+
+def test_refuses_when_queued_work_takes_too_long():
+    controller, scheduler, _ = make_controller(demand_per_s=1.0, rtf=0.5)
+    scheduler.backlog_s = 30.0
+
+    decision = controller.decide()
+
+    assert decision.state == STATE_FULL
+    assert decision.retry_after_s == 8  # 30 s of audio * 0.5 / 2 replicas, rounded up
+
+
+def test_newest_speech_sessions_shed_speech_while_overloaded():
+    controller, scheduler, clock = make_controller(demand_per_s=2.0, rtf=0.5)
+    admitted = controller.decide()
+    sessions = [controller.register(admitted, speech=True) for _ in range(4)]
+    text_session = controller.register(admitted, speech=False)
+    for session in sessions:
+        controller.update_shedding(session)
+    assert all(controller.speech_allowed(session) for session in sessions)
+
+    # Load 1.5: a third of the four speech sessions' share has to go, i.e. the newest two
+    for _ in range(10):
+        scheduler.load.record_arrival(6.0)
+        clock.now += 1.0
+    for session in sessions + [text_session]:
+        controller.update_shedding(session)
+
+    assert [controller.speech_allowed(session) for session in sessions] == [True, True, False, False]
+    assert not controller.speech_allowed(text_session)
+    assert controller.snapshot()["shedding_sessions"] == 2
+
+
+def test_degraded_sessions_never_get_speech():
+    controller, _, _ = make_controller(demand_per_s=3.4, rtf=0.5)
+
+    session = controller.register(controller.decide(), speech=True)
+
+    assert session.degraded
+    controller.update_shedding(session)
+    assert not controller.speech_allowed(session)
+    controller.release(session)
+    assert controller.snapshot()["sessions"] == 0
+
+
+def test_queued_and_rejected_sessions_are_counted():
+    controller, _, _ = make_controller(demand_per_s=0.0, rtf=0.5)
+
+    controller.note_queued()
+    controller.note_rejected()
+
+    assert controller.snapshot()["queued"] == 1
+    assert controller.snapshot()["rejected"] == 1
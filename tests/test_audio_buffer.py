@@ -0,0 +1,50 @@
+import numpy as np
+from src.core.audio_buffer import AudioFifo, SentenceBuffer
+
+
+def test_fifo_preserves_order_across_compaction_and_growth():
+    fifo = AudioFifo(capacity=1000)
+    stream = np.arange(40000, dtype=np.float32)
+    received = []
+
+    position = 0
+    for chunk_size in [300, 700, 1365, 4096, 90, 1365, 1365, 2500] * 3:
+        fifo.write(stream[position : position + chunk_size])
+        position += chunk_size
+        while len(fifo) >= 512:
+            received.append(fifo.read(512).copy())
+
+    received = np.concatenate(received)
+    np.testing.assert_array_equal(received, stream[: len(received)])
+    assert len(received) + len(fifo) == position
+
+
+def test_fifo_reuses_storage_once_warm():
+    fifo = AudioFifo(capacity=2048)
+    storage = fifo._data
+    for _ in range(100):
+        fifo.write(np.ones(1365, dtype=np.float32))
+        while len(fifo) >= 512:
+            fifo.read(512)
+    assert fifo._data is storage
+
+
+def test_sentence_buffer_pads_and_resets():
+    sentence_buffer = SentenceBuffer(initial_capacity=4)
+    sentence_buffer.append(np.array([1, 2, 3], dtype=np.float32))
+    sentence_buffer.append(np.array([4, 5], dtype=np.float32))
+
+    sentence = sentence_buffer.pop_padded(pad_samples=2)
+
+    np.testing.assert_array_equal(sentence, [0, 0, 1, 2, 3, 4, 5, 0, 0])
+    assert len(sentence_buffer) == 0
+
+
+def test_sentence_buffer_pops_front_and_keeps_the_rest():
+    buffer = SentenceBuffer(initial_capacity=8)
+    buffer.append(np.arange(10, dtype=np.float32))
+
+    segment = buffer.pop_front_padded(6, pad_samples=2)
+
+    np.testing.assert_array_equal(segment, [0, 0, 0, 1, 2, 3, 4, 5, 0, 0])
+    np.testing.assert_array_equal(buffer.view(), [6, 7, 8, 9])
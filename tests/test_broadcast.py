@@ -0,0 +1,73 @@
+import asyncio
+from src.api.broadcast import BroadcastRoom, RoomRegistry
+
+
+class FakeWebSocket:
+    """Collects sent messages; `delay` makes it a slow consumer."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.sent = []
+
+    async def send_bytes(self, data):
+        await asyncio.sleep(self.delay)
+        self.sent.append(data)
+
+    async def send_text(self, data):
+        await asyncio.sleep(self.delay)
+        self.sent.append(data)
+
+
+def test_publish_reaches_only_listeners_of_that_language():
+    async def main():
+        room = BroadcastRoom("conf", queue_size=8)
+        english, french = FakeWebSocket(), FakeWebSocket()
+        listeners = [room.subscribe(english, "eng"), room.subscribe(french, "fra")]
+        senders = [asyncio.create_task(listener.run()) for listener in listeners]
+
+        room.publish("eng", ['{"type": "translation_audio"}', b"wav-eng"])
+        room.publish("fra", [b"wav-fra"])
+        room.publish("spa", [b"nobody"])
+        await asyncio.sleep(0.01)
+        for sender in senders:
+            sender.cancel()
+        return english.sent, french.sent, sorted(room.languages())
+
+    english, french, languages = asyncio.run(main())
+
+    assert english == ['{"type": "translation_audio"}', b"wav-eng"]
+    assert french == [b"wav-fra"]
+    assert languages == ["eng", "fra"]
+
+
+def test_slow_listener_drops_oldest_outputs_without_blocking_publisher():
+    async def main():
+        room = BroadcastRoom("conf", queue_size=2)
+        slow = FakeWebSocket(delay=0.05)
+        listener = room.subscribe(slow, "eng")
+
+        # Published before the sender task runs at all: only the newest two outputs survive
+        for index in range(5):
+            room.publish("eng", [bytes([index])])
+        sender = asyncio.create_task(listener.run())
+        await asyncio.sleep(0.2)
+        sender.cancel()
+        return slow.sent, listener.dropped, room.snapshot()
+
+    sent, dropped, snapshot = asyncio.run(main())
+
+    assert sent == [bytes([3]), bytes([4])]
+    assert dropped == 3
+    assert snapshot == {"listeners": 1, "dropped": 3}
+
+
+def test_registry_keeps_room_while_anyone_is_in_it():
+    registry = RoomRegistry()
+    speaker_room = registry.join("conf")
+    listener_room = registry.join("conf")
+    assert speaker_room is listener_room
+
+    registry.leave(speaker_room)
+    assert "conf" in registry.snapshot()
+    registry.leave(listener_room)
+    assert registry.snapshot() == {}
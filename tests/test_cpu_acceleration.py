@@ -0,0 +1,90 @@
+import pytest
+import torch
+from src.core.cpu_acceleration import (
+    CPUAccelerationSettings,
+    compile_submodules,
+    convert_weights,
+    output_similarity,
+    probe_audio,
+)
+from src.core.translator_engine import TranslatorEngine
+
+
+def make_model():
+    torch.manual_seed(0)
+    return torch.nn.Sequential(torch.nn.Linear(64, 256), torch.nn.ReLU(), torch.nn.Linear(256, 64))
+
+
+def make_engine(settings):
+    """An engine around a small model whose probe output is the model's answer to fixed inputs."""
+    engine = TranslatorEngine.__new__(TranslatorEngine)
+    engine.model, engine.dtype = make_model(), torch.float32
+    engine.cpu_acceleration = settings
+    inputs = torch.randn(8, 64)
+
+    def probe(audio_np):
+        with torch.no_grad():
+            return engine.model(inputs), torch.tensor([[1, 2, 3]])
+
+    engine._probe = probe
+    return engine
+
+
+def test_int8_quantization_replaces_linear_layers_and_stays_close():
+    model = make_model()
+    inputs = torch.randn(8, 64)
+    with torch.no_grad():
+        reference = model(inputs)
+
+    model, dtype = convert_weights(model, CPUAccelerationSettings(quantization="int8"))
+    with torch.no_grad():
+        quantized = model(inputs)
+
+    assert dtype == torch.float32
+    assert not any(type(module) is torch.nn.Linear for module in model.modules())
+    assert output_similarity(reference, quantized) > 0.99
+
+
+def test_engine_converts_weights_after_a_passing_self_check():
+    engine = make_engine(CPUAccelerationSettings(quantization="int8"))
+
+    engine._accelerate_for_cpu()
+
+    assert not any(type(module) is torch.nn.Linear for module in engine.model.modules())
+    assert engine.dtype == torch.float32
+
+
+def test_engine_refuses_a_conversion_that_fails_the_self_check():
+    engine = make_engine(CPUAccelerationSettings(quantization="int8", min_similarity=1.01))
+
+    with pytest.raises(RuntimeError, match="similarity"):
+        engine._accelerate_for_cpu()
+
+
+def test_compile_wraps_only_the_engine_submodules():
+    model = torch.nn.Module()
+    model.speech_encoder, model.text_decoder = torch.nn.Linear(4, 4), torch.nn.Linear(4, 4)
+
+    model = compile_submodules(model)
+
+    assert type(model.speech_encoder) is not torch.nn.Linear
+    assert type(model.text_decoder) is torch.nn.Linear
+    assert not hasattr(model, "vocoder")
+
+
+def test_settings_from_config():
+    settings = CPUAccelerationSettings.from_config({"quantization": "int8", "compile": True})
+
+    assert settings.describe() == "int8+compile"
+    assert settings.conversion == "int8"
+    assert CPUAccelerationSettings.from_config({}).describe() == "float32"
+    with pytest.raises(ValueError):
+        CPUAccelerationSettings.from_config({"quantization": "int4"})
+
+
+def test_probe_audio_is_deterministic_and_not_clipped():
+    audio = probe_audio(1.0)
+
+    assert len(audio) == 16000
+    assert torch.equal(torch.from_numpy(audio), torch.from_numpy(probe_audio(1.0)))
+    assert 0.1 < abs(audio).max() < 1.0
@@ -0,0 +1,53 @@
+import os
+
+import numpy as np
+import soundfile as sf
+from src.core.debug_recorder import DebugRecorder
+
+
+def test_disabled_by_default():
+    assert DebugRecorder.from_config() is None
+
+
+def test_records_in_background_with_unique_names(tmp_path):
+    recorder = DebugRecorder(str(tmp_path))
+    recorder.start()
+    first, second = recorder.new_session_id(), recorder.new_session_id()
+    audio = np.zeros(1600, dtype=np.float32)
+    recorder.record(first, 1, "input.wav", audio)
+    recorder.record(second, 1, "input.wav", audio)
+    recorder.record(first, 1, "output_eng.wav", b"RIFF")
+    recorder.close()
+
+    assert first != second
+    assert sorted(os.listdir(tmp_path)) == sorted(
+        [f"{first}_00001_input.wav", f"{second}_00001_input.wav", f"{first}_00001_output_eng.wav"]
+    )
+    assert len(sf.read(tmp_path / f"{first}_00001_input.wav")[0]) == 1600
+    assert recorder.snapshot()["written"] == 3
+
+
+def test_retention_deletes_oldest_beyond_size(tmp_path):
+    (tmp_path / "old.wav").write_bytes(b"x" * 600 * 1024)
+    (tmp_path / "notes.txt").write_bytes(b"x" * 600 * 1024)
+    recorder = DebugRecorder(str(tmp_path), max_total_mb=1.0)
+    recorder.start()
+    recorder.record("s", 1, "output_eng.wav", b"x" * 600 * 1024)
+    recorder.close()
+
+    # Only recordings are subject to retention
+    assert sorted(os.listdir(tmp_path)) == ["notes.txt", "s_00001_output_eng.wav"]
+    assert recorder.snapshot()["removed"] == 1
+
+
+def test_drops_when_writer_falls_behind(tmp_path):
+    recorder = DebugRecorder(str(tmp_path), queue_size=2)  # Writer not started
+    for utterance in range(5):
+        recorder.record("s", utterance, "input.wav", b"")
+
+    assert recorder.dropped == 3
+
+
+def test_sampling():
+    assert not any(DebugRecorder("unused", sample_fraction=0.0).sample() for _ in range(100))
+    assert all(DebugRecorder("unused", sample_fraction=1.0).sample() for _ in range(100))
@@ -0,0 +1,61 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import torch
+from src.core.device_manager import CPUTopology, DeviceManager, ThreadPlan, _parse_cpu_list
+
+
+def two_socket_topology():
+    # 2 NUMA nodes x 4 physical cores x 2 SMT siblings; the sibling of cpu N is N + 8
+    cores = [[cpu, cpu + 8] for cpu in range(8)]
+    return CPUTopology(physical_cores=cores, numa_nodes=[[0, 1, 2, 3, 8, 9, 10, 11], [4, 5, 6, 7, 12, 13, 14, 15]])
+
+
+def test_parse_cpu_list():
+    assert _parse_cpu_list("0-3,8,10-11\n") == [0, 1, 2, 3, 8, 10, 11]
+
+
+def test_detected_topology_covers_the_usable_cpus():
+    topology = CPUTopology.detect()
+
+    assert topology.logical_cpus == len(os.sched_getaffinity(0))
+    assert sorted(cpu for node in topology.numa_nodes for cpu in node) == sorted(os.sched_getaffinity(0))
+
+
+def test_plan_budgets_physical_cores():
+    plan = ThreadPlan.from_config(two_socket_topology())
+
+    assert plan.vad_threads == 1
+    assert plan.translation_threads == 7  # 8 physical cores minus the VAD thread
+    assert plan.snapshot()["logical_cpus"] == 16
+
+
+def test_replicas_get_physical_cores_of_one_node():
+    plan = ThreadPlan.from_config(two_socket_topology())
+
+    assert plan.replica_cores(2) == [[0, 1, 2, 3], [4, 5, 6, 7]]
+    assert plan.replica_cores(4, cores_per_replica=2) == [[0, 1], [2, 3], [4, 5], [6, 7]]
+    plan.pin_replicas = False
+    assert plan.replica_cores(2) == [[], []]
+
+
+def test_dedicated_thread_keeps_its_own_budget():
+    previous = torch.get_num_threads()
+    DeviceManager.thread_plan = ThreadPlan.from_config(two_socket_topology())
+    DeviceManager.thread_plan.translation_threads = 3
+    vad_executor, other_executor = ThreadPoolExecutor(max_workers=1), ThreadPoolExecutor(max_workers=1)
+    try:
+        DeviceManager.dedicate_thread(vad_executor, 2)
+
+        def budget():
+            torch.ones(2).add_(1)
+            return torch.get_num_threads()
+
+        assert vad_executor.submit(budget).result() == 2
+        # Threads that start torch work later get the translation budget
+        assert other_executor.submit(budget).result() == 3
+    finally:
+        DeviceManager.thread_plan = None
+        vad_executor.shutdown()
+        other_executor.shutdown()
+        torch.set_num_threads(previous)
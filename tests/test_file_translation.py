@@ -0,0 +1,133 @@
+import asyncio
+import time
+from contextlib import aclosing
+
+import numpy as np
+import soundfile as sf
+from src.core.file_translation import (
+    FileSegmenter,
+    FileTranslationJob,
+    SpeechTimeline,
+    StreamingResampler,
+    TranslatedSegment,
+)
+from src.core.inference_scheduler import InferenceScheduler
+from src.core.vad_processor import SileroVADModel, VADStream, WINDOW_SIZE_SAMPLES
+
+
+class FakeVADModel:
+    """Uses the mean of each window as its speech probability."""
+
+    SAMPLE_RATE = 16000
+    STATE_SHAPE = (2, 1, 128)
+    context_size = 64
+    restart_after_windows = 4
+    priming_windows = 2
+
+    def create_stream(self):
+        return VADStream(self)
+
+    windows_skipped = 0
+
+    def infer(self, streams, windows):
+        return windows.mean(axis=1)
+
+    evaluate = SileroVADModel.evaluate
+    _resume = SileroVADModel._resume
+
+
+class FakeTranslator:
+    """Answers with the utterance length; the first batch is the slowest, so results finish out of order."""
+
+    concurrency = 4
+
+    def __init__(self):
+        self.batches = 0
+
+    def translate_text_batch(self, audio_batch, tgt_lang, encoded=None):
+        self.batches += 1
+        time.sleep(0.05 if self.batches == 1 else 0.0)
+        return [f"{tgt_lang}:{len(audio)}" for audio in audio_batch]
+
+
+def write_speech_file(path, speech_windows, silence_windows=40):
+    """Utterances of constant 'speech' separated by silence; the last one runs until the end of the file."""
+    pieces = []
+    for count in speech_windows:
+        pieces.append(np.zeros(silence_windows * WINDOW_SIZE_SAMPLES, dtype=np.float32))
+        pieces.append(np.ones(count * WINDOW_SIZE_SAMPLES, dtype=np.float32))
+    sf.write(path, np.concatenate(pieces), 16000, subtype="FLOAT")
+
+
+def test_streaming_resampler_matches_whole_file_interpolation():
+    audio = np.random.default_rng(0).standard_normal(44100).astype(np.float32)
+    positions = np.arange(int(len(audio) * 16000 / 44100)) * 44100 / 16000
+    expected = np.interp(positions, np.arange(len(audio)), audio)
+
+    resampler = StreamingResampler(44100)
+    resampled = np.concatenate([resampler.process(audio[start : start + 1000]) for start in range(0, len(audio), 1000)])
+
+    assert abs(len(resampled) - len(expected)) <= 1
+    length = min(len(resampled), len(expected))
+    np.testing.assert_allclose(resampled[:length], expected[:length], atol=1e-5)
+
+
+def test_job_yields_all_segments_in_file_order(tmp_path):
+    path = str(tmp_path / "input.wav")
+    write_speech_file(path, [10, 20, 30, 15])
+
+    async def main():
+        scheduler = InferenceScheduler(FakeTranslator())
+        scheduler.start()
+        # Small blocks: segments are submitted while later blocks are still being read
+        job = FileTranslationJob(FileSegmenter(path, FakeVADModel(), block_s=0.5), scheduler, "fra", speech=False)
+        job.max_in_flight = 2
+        job.segmenter.session.padding_ms = 0
+        results = [result async for result in job.results()]
+        await scheduler.stop()
+        return job, results
+
+    job, results = asyncio.run(main())
+
+    assert [result.index for result in results] == [0, 1, 2, 3]
+    assert [result.start_s for result in results] == sorted(result.start_s for result in results)
+    # The last utterance has no trailing silence and is flushed at the end of the file
+    assert results[-1].text == f"fra:{15 * WINDOW_SIZE_SAMPLES}"
+    snapshot = job.snapshot()
+    assert snapshot["state"] == "done"
+    assert snapshot["progress"] == 1.0
+    assert snapshot["segments"] == 4
+
+
+def test_consumer_that_stops_early_cancels_the_job_and_closes_the_file(tmp_path):
+    path = str(tmp_path / "input.wav")
+    write_speech_file(path, [10, 20, 30, 15])
+
+    async def main():
+        scheduler = InferenceScheduler(FakeTranslator())
+        scheduler.start()
+        job = FileTranslationJob(FileSegmenter(path, FakeVADModel(), block_s=0.5), scheduler, "fra", speech=False)
+        async with aclosing(job.results()) as results:
+            async for _ in results:
+                break
+        await scheduler.stop()
+        return job
+
+    job = asyncio.run(main())
+
+    assert job.snapshot()["state"] == "cancelled"
+    assert job.segmenter._file.closed
+    assert not job.segmenter.session.speculative
+
+
+def test_speech_timeline_keeps_source_positions():
+    timeline = SpeechTimeline()
+    speech = np.ones(8000, dtype=np.float32)
+
+    first = list(timeline.place(TranslatedSegment(0, 2.5, 3.0, "a", speech)))
+    # Starts before the previous translation ended: no gap, right after it
+    second = list(timeline.place(TranslatedSegment(1, 2.8, 3.5, "b", speech)))
+
+    assert [len(piece) for piece in first] == [16000, 16000, 8000, 8000]
+    assert [len(piece) for piece in second] == [8000]
+    assert timeline.cursor == 56000
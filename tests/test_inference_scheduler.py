@@ -0,0 +1,251 @@
+import asyncio
+import threading
+import numpy as np
+from src.core.inference_scheduler import InferenceScheduler
+from src.core.translator_engine import TranslationAudio, TranslationText
+
+
+class FakeTranslator:
+    """Records each batch call and echoes the utterance length back as the 'audio'."""
+
+    def __init__(self):
+        self.calls = []
+        self.encoded = []
+
+    def translate_batch(self, audio_batch, tgt_lang, encoded=None):
+        self.calls.append((tgt_lang, len(audio_batch)))
+        self.encoded.extend(encoded or [None] * len(audio_batch))
+        return [f"{tgt_lang}:{len(audio)}".encode() for audio in audio_batch]
+
+    def translate_text_batch(self, audio_batch, tgt_lang, encoded=None):
+        self.calls.append(("text", tgt_lang, len(audio_batch)))
+        self.encoded.extend(encoded or [None] * len(audio_batch))
+        return [f"{tgt_lang}:{len(audio)}" for audio in audio_batch]
+
+    def encode_batch(self, audio_batch):
+        self.calls.append(("encode", len(audio_batch)))
+        return [f"encoded:{len(audio)}" for audio in audio_batch]
+
+    def translate_batch_streaming(self, audio_batch, tgt_lang, emit, encoded=None):
+        self.calls.append((tgt_lang, len(audio_batch)))
+        for index, audio in enumerate(audio_batch):
+            emit(index, TranslationText(text=f"{tgt_lang}:{len(audio)}"))
+        for index, audio in enumerate(audio_batch):
+            # Two speech pieces per utterance, interleaved across the batch
+            emit(index, TranslationAudio(samples=audio[: len(audio) // 2]))
+            emit(index, TranslationAudio(samples=audio[len(audio) // 2 :]))
+
+
+def run_requests(scheduler, requests):
+    async def main():
+        scheduler.start()
+        results = await asyncio.gather(
+            *(scheduler.translate(np.zeros(length, dtype=np.float32), lang) for length, lang in requests)
+        )
+        await scheduler.stop()
+        return results
+
+    return asyncio.run(main())
+
+
+def test_batches_concurrent_requests_per_language():
+    translator = FakeTranslator()
+    scheduler = InferenceScheduler(translator)
+    scheduler.max_batch_size = 8
+    scheduler.max_wait_s = 0.05
+
+    results = run_requests(scheduler, [(100, "eng"), (200, "fra"), (300, "eng"), (400, "eng")])
+
+    # Every session gets its own result back, in order
+    assert results == [b"eng:100", b"fra:200", b"eng:300", b"eng:400"]
+    assert sorted(translator.calls) == [("eng", 3), ("fra", 1)]
+
+
+def test_respects_max_batch_size():
+    translator = FakeTranslator()
+    scheduler = InferenceScheduler(translator)
+    scheduler.max_batch_size = 2
+    scheduler.max_wait_s = 0.05
+
+    results = run_requests(scheduler, [(length, "eng") for length in (1, 2, 3, 4, 5)])
+
+    assert results == [b"eng:1", b"eng:2", b"eng:3", b"eng:4", b"eng:5"]
+    assert [size for _, size in translator.calls] == [2, 2, 1]
+
+
+def test_streaming_requests_receive_text_then_audio_pieces():
+    translator = FakeTranslator()
+    scheduler = InferenceScheduler(translator)
+    scheduler.max_batch_size = 8
+    scheduler.max_wait_s = 0.05
+
+    async def collect(length):
+        return [piece async for piece in scheduler.translate_stream(np.ones(length, dtype=np.float32), "eng")]
+
+    async def main():
+        scheduler.start()
+        results = await asyncio.gather(
+            collect(100), collect(300), scheduler.translate(np.zeros(50, dtype=np.float32), "eng")
+        )
+        await scheduler.stop()
+        return results
+
+    first, second, whole = asyncio.run(main())
+
+    # Streaming and whole-WAV requests never share a batch
+    assert sorted(translator.calls) == [("eng", 1), ("eng", 2)]
+    assert whole == b"eng:50"
+    for pieces, length in ((first, 100), (second, 300)):
+        assert pieces[0] == TranslationText(text=f"eng:{length}")
+        assert [type(piece) for piece in pieces[1:]] == [TranslationAudio, TranslationAudio]
+        assert sum(len(piece.samples) for piece in pieces[1:]) == length
+
+
+def test_speculative_encoding_is_reused_for_translation():
+    translator = FakeTranslator()
+    scheduler = InferenceScheduler(translator)
+    scheduler.max_wait_s = 0.01
+    audio = np.zeros(100, dtype=np.float32)
+
+    async def main():
+        scheduler.start()
+        encoded = await scheduler.encode(audio)
+        result = await scheduler.translate(audio, "eng", encoded)
+        # A cancelled speculation never reaches the translator
+        cancelled = asyncio.ensure_future(scheduler.encode(audio))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.sleep(0.05)
+        await scheduler.stop()
+        return result
+
+    assert asyncio.run(main()) == b"eng:100"
+    assert translator.calls == [("encode", 1), ("eng", 1)]
+    assert translator.encoded == ["encoded:100"]
+
+
+def test_fanout_encodes_once_and_reuses_encoding_per_language():
+    translator = FakeTranslator()
+    scheduler = InferenceScheduler(translator)
+    scheduler.max_wait_s = 0.01
+    audio = np.zeros(100, dtype=np.float32)
+
+    async def main():
+        scheduler.start()
+        results = await scheduler.translate_fanout(audio, ["eng", "fra", "spa"])
+        single = await scheduler.translate_fanout(audio, ["eng"])
+        await scheduler.stop()
+        return results, single
+
+    results, single = asyncio.run(main())
+
+    assert results == {"eng": b"eng:100", "fra": b"fra:100", "spa": b"spa:100"}
+    assert single == {"eng": b"eng:100"}
+    # One encoder pass for all three languages; a single target encodes inside its own batch
+    assert translator.calls[0] == ("encode", 1)
+    assert sorted(translator.calls[1:]) == [("eng", 1), ("eng", 1), ("fra", 1), ("spa", 1)]
+    assert translator.encoded == ["encoded:100"] * 3 + [None]
+
+
+def test_text_requests_batch_separately_and_skip_speech():
+    translator = FakeTranslator()
+    scheduler = InferenceScheduler(translator)
+    scheduler.max_wait_s = 0.05
+    audio = np.zeros(100, dtype=np.float32)
+
+    async def main():
+        scheduler.start()
+        speech, text, fanout = await asyncio.gather(
+            scheduler.translate(audio, "eng"),
+            scheduler.translate_text(audio, "eng"),
+            scheduler.translate_text_fanout(audio, ["eng", "fra"]),
+        )
+        await scheduler.stop()
+        return speech, text, fanout
+
+    speech, text, fanout = asyncio.run(main())
+
+    assert speech == b"eng:100"
+    assert text == "eng:100"
+    assert fanout == {"eng": "eng:100", "fra": "fra:100"}
+    # Only the speech request reached translate_batch; the three text requests went to translate_text_batch
+    assert [call for call in translator.calls if call[0] == "eng"] == [("eng", 1)]
+    assert sum(call[2] for call in translator.calls if call[0] == "text") == 3
+
+
+def test_live_requests_are_served_before_background_ones():
+    translator = FakeTranslator()
+    scheduler = InferenceScheduler(translator)
+    scheduler.max_batch_size = 2
+    scheduler.max_wait_s = 0.01
+    finished = []
+
+    async def translate(length, background):
+        text = await scheduler.translate_text(np.zeros(length, dtype=np.float32), "eng", background=background)
+        finished.append(text)
+
+    async def main():
+        background = [asyncio.create_task(translate(100, True)) for _ in range(3)]
+        await asyncio.sleep(0)  # The background requests are queued first
+        live = [asyncio.create_task(translate(200, False)) for _ in range(2)]
+        await asyncio.sleep(0)
+        assert scheduler.backlog_seconds() == 400 / 16000  # Waiting background work is not live backlog
+        scheduler.start()
+        await asyncio.gather(*background, *live)
+        await scheduler.stop()
+
+    asyncio.run(main())
+
+    assert finished == ["eng:200", "eng:200", "eng:100", "eng:100", "eng:100"]
+    # Only live requests count as demand (per second, over the first second)
+    assert abs(scheduler.load.demand() - 400 / 16000) < 1e-9
+    assert scheduler.load.rtf is not None
+
+
+def test_full_batch_of_another_language_does_not_wait_for_older_group():
+    translator = FakeTranslator()
+    scheduler = InferenceScheduler(translator)
+    scheduler.max_batch_size = 2
+    scheduler.max_wait_s = 5.0
+
+    async def main():
+        scheduler.start()
+        audio = np.zeros(10, dtype=np.float32)
+        lonely = asyncio.ensure_future(scheduler.translate(audio, "fra"))
+        await asyncio.sleep(0)
+        full = await asyncio.wait_for(
+            asyncio.gather(scheduler.translate(audio, "eng"), scheduler.translate(audio, "eng")), timeout=1.0
+        )
+        assert not lonely.done()  # Still within its max_wait_ms
+        await scheduler.stop()
+        return full
+
+    assert asyncio.run(main()) == [b"eng:10", b"eng:10"]
+    assert translator.calls == [("eng", 2)]
+
+
+def test_stop_cancels_requests_of_running_batches():
+    started = threading.Event()
+    release = threading.Event()
+
+    class SlowTranslator(FakeTranslator):
+        def translate_batch(self, audio_batch, tgt_lang, encoded=None):
+            started.set()
+            release.wait(timeout=5)
+            return super().translate_batch(audio_batch, tgt_lang, encoded)
+
+    scheduler = InferenceScheduler(SlowTranslator())
+    scheduler.max_wait_s = 0.0
+
+    async def main():
+        scheduler.start()
+        request = asyncio.ensure_future(scheduler.translate(np.zeros(10, dtype=np.float32), "eng"))
+        while not started.is_set():
+            await asyncio.sleep(0.01)
+        await scheduler.stop()
+        release.set()
+        # The caller is released instead of waiting forever
+        await asyncio.wait_for(asyncio.wait({request}), timeout=1.0)
+        return request.cancelled()
+
+    assert asyncio.run(main())
@@ -0,0 +1,60 @@
+import functools
+import io
+
+import numpy as np
+import soundfile as sf
+import torch
+from benchmarks.stub_translator import StubTranslator
+from src.core.inference_workers import InferenceWorkerPool, read_shared, write_shared
+from src.core.translator_engine import EncodedSpeech, TranslationAudio, TranslationText
+
+
+def test_shared_memory_round_trip_keeps_dtype_and_shape():
+    arrays = [np.arange(5, dtype=np.float32), np.ones((3, 7), dtype=np.float64), np.frombuffer(b"wav", dtype=np.uint8)]
+
+    block, layout = write_shared(arrays)
+    try:
+        copies = read_shared(block.name, layout)
+    finally:
+        block.close()
+        block.unlink()
+
+    for original, copy in zip(arrays, copies):
+        assert copy.dtype == original.dtype
+        np.testing.assert_array_equal(copy, original)
+
+
+class EncodingStub(StubTranslator):
+    """Returns real encodings; text reports whether an encoding came back with the batch."""
+
+    def encode_batch(self, audio_batch):
+        return [EncodedSpeech(torch.ones(len(audio) // 160, 4), torch.full((2, 3), 0.5)) for audio in audio_batch]
+
+    def translate_text_batch(self, audio_batch, tgt_lang=None, encoded=None):
+        encoded = encoded or [None] * len(audio_batch)
+        return [f"{tgt_lang}:{item.hidden_states.sum().item():.1f}" if item else f"{tgt_lang}:-" for item in encoded]
+
+
+def test_pool_serves_every_method_from_worker_processes():
+    pool = InferenceWorkerPool(2, cores_per_worker=1, factory=functools.partial(EncodingStub, real_time_factor=0.01))
+    pool.start()
+    try:
+        audio = [np.zeros(8000, dtype=np.float32), np.zeros(16000, dtype=np.float32)]
+
+        wavs = pool.translate_batch(audio, "eng")
+        pieces = []
+        pool.translate_batch_streaming(audio[:1], "spa", lambda index, piece: pieces.append((index, piece)))
+        encoded = pool.encode_batch(audio)
+        texts = pool.translate_text_batch(audio, "fra", [encoded[0], None])
+        snapshot = pool.snapshot()
+    finally:
+        pool.close()
+
+    assert [len(sf.read(io.BytesIO(wav))[0]) for wav in wavs] == [8000, 16000]
+    assert isinstance(pieces[0][1], TranslationText)
+    assert sum(len(piece.samples) for _, piece in pieces if isinstance(piece, TranslationAudio)) == 8000
+    # Encodings travel back to the API process and on to a worker with a later batch
+    assert encoded[0].input_features.shape == (50, 4)
+    assert texts == ["fra:3.0", "fra:-"]
+    assert [worker["alive"] for worker in snapshot] == [True, True]
+    assert all(worker["in_flight"] == 0 for worker in snapshot)
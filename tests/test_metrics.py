@@ -0,0 +1,68 @@
+import re
+import threading
+
+from src.core.metrics import MetricsRegistry
+
+
+def test_span_records_stage_summary_in_prometheus_format():
+    registry = MetricsRegistry(window_size=100)
+    registry.describe("pipeline_stage_seconds", "Stage time.")
+    for value in range(1, 101):
+        registry.observe("pipeline_stage_seconds", value / 1000, stage="vocoder")
+    with registry.span("vad_window", count=4):
+        pass
+
+    text = registry.render()
+
+    assert "# TYPE pipeline_stage_seconds summary" in text
+    assert 'pipeline_stage_seconds{stage="vocoder",quantile="0.5"} 0.0505' in text
+    assert 'pipeline_stage_seconds{stage="vocoder",quantile="0.99"} 0.09901' in text
+    assert 'pipeline_stage_seconds_count{stage="vocoder"} 100' in text
+    assert 'pipeline_stage_seconds_count{stage="vad_window"} 1' in text
+
+
+def test_gauges_are_read_at_render_time():
+    registry = MetricsRegistry()
+    depth = {"value": 1}
+    registry.gauge("queue_depth", "Waiting items.", lambda: {(("agg", "depth"),): depth["value"]})
+
+    depth["value"] = 7
+
+    assert 'queue_depth{agg="depth"} 7' in registry.render()
+
+
+def test_spans_reuse_their_series():
+    registry = MetricsRegistry()
+    for _ in range(1000):
+        with registry.span("send"):
+            pass
+
+    text = registry.render()
+
+    assert 'pipeline_stage_seconds_count{stage="send"} 1000' in text
+    assert text.count("pipeline_stage_seconds_count{") == 1
+
+
+def test_render_while_other_threads_add_series():
+    registry = MetricsRegistry()
+    series_per_thread = 200
+
+    def record(thread_index):
+        for index in range(series_per_thread):
+            registry.observe("pipeline_stage_seconds", 0.001, stage=f"stage_{thread_index}_{index}")
+
+    threads = [threading.Thread(target=record, args=(index,)) for index in range(4)]
+    for thread in threads:
+        thread.start()
+    try:
+        renders = [registry.render() for _ in range(20)]
+    finally:
+        for thread in threads:
+            thread.join()
+    renders.append(registry.render())
+
+    for text in renders:
+        for line in text.splitlines():
+            assert line.startswith("#") or re.fullmatch(r"pipeline_stage_seconds(_sum|_count)?\{.+\} \S+", line)
+    assert renders[-1].count("pipeline_stage_seconds_count{") == 4 * series_per_thread
+    assert 'pipeline_stage_seconds_count{stage="stage_3_199"} 1' in renders[-1]
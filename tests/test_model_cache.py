@@ -0,0 +1,98 @@
+import os
+import threading
+
+import torch
+from src.core.cpu_acceleration import CPUAccelerationSettings, convert_weights
+from src.core.model_cache import ModelCache
+
+
+def make_model():
+    torch.manual_seed(0)
+    return torch.nn.Sequential(torch.nn.Linear(64, 256), torch.nn.ReLU(), torch.nn.Linear(256, 64))
+
+
+def test_round_trip_of_a_quantized_model(tmp_path):
+    model, dtype = convert_weights(make_model(), CPUAccelerationSettings(quantization="int8"))
+    inputs = torch.randn(4, 64)
+    cache = ModelCache(str(tmp_path), "facebook/seamless-m4t-v2-large", "int8")
+    assert cache.load() is None
+
+    cache.store(model, dtype)
+    loaded, loaded_dtype = cache.load()
+
+    assert loaded_dtype == torch.float32
+    with torch.no_grad():
+        assert torch.equal(model(inputs), loaded(inputs))
+
+
+def test_entries_are_keyed_by_model_and_conversion(tmp_path):
+    paths = {
+        ModelCache(str(tmp_path), name, conversion).path
+        for name in ("facebook/seamless-m4t-v2-large", "facebook/seamless-m4t-v2-medium")
+        for conversion in ("float32", "int8")
+    }
+
+    assert len(paths) == 4
+    assert all("/" not in path[len(str(tmp_path)) + 1 :] for path in paths)
+
+
+def test_unreadable_entry_is_ignored(tmp_path):
+    cache = ModelCache(str(tmp_path), "model", "float32")
+    with open(cache.path, "wb") as f:
+        f.write(b"truncated")
+
+    assert cache.load() is None
+
+
+def test_entry_writable_by_others_is_not_unpickled(tmp_path):
+    cache = ModelCache(str(tmp_path / "prepared"), "model", "float32")
+    cache.store(make_model(), torch.float32)
+    assert cache.load() is not None
+
+    os.chmod(cache.path, 0o666)
+
+    assert cache.load() is None
+
+
+def test_refused_entry_is_not_rewritten(tmp_path):
+    cache = ModelCache(str(tmp_path / "prepared"), "model", "float32")
+    cache.store(make_model(), torch.float32)
+    os.chmod(cache.path, 0o666)
+    written = os.stat(cache.path).st_mtime_ns
+
+    assert cache.load() is None
+    cache.store(make_model(), torch.float32)
+
+    assert cache.refused
+    assert os.stat(cache.path).st_mtime_ns == written
+
+
+def test_nothing_is_stored_in_a_directory_writable_by_others(tmp_path):
+    root = tmp_path / "shared"
+    root.mkdir()
+    os.chmod(root, 0o777)
+    cache = ModelCache(str(root), "model", "float32")
+
+    cache.store(make_model(), torch.float32)
+
+    assert not cache.exists()
+
+
+def test_exclusive_lets_one_process_prepare_a_cold_entry(tmp_path):
+    first = ModelCache(str(tmp_path / "prepared"), "model", "float32")
+    second = ModelCache(str(tmp_path / "prepared"), "model", "float32")
+    events = []
+
+    def wait_for_entry():
+        with second.exclusive():
+            events.append(("loaded", second.load() is not None))
+
+    with first.exclusive():
+        waiting = threading.Thread(target=wait_for_entry)
+        waiting.start()
+        waiting.join(timeout=0.2)
+        first.store(make_model(), torch.float32)
+        events.append(("stored", True))
+    waiting.join()
+
+    assert events == [("stored", True), ("loaded", True)]
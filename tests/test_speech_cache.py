@@ -0,0 +1,80 @@
+import sqlite3
+
+from src.core.speech_cache import SpeechCache, normalize_text
+
+
+def test_phrases_match_regardless_of_case_and_punctuation():
+    assert normalize_text("  Next slide, please. ") == normalize_text("next slide please")
+    assert normalize_text("Any questions?") != normalize_text("Any questions.")
+
+
+def test_lru_eviction_by_entries_and_memory():
+    cache = SpeechCache(max_entries=2, max_mb=1.0)
+    cache.put("hello", "eng", b"a")
+    cache.put("thanks", "eng", b"b")
+    assert cache.get("Hello!", "eng") == b"a"  # Now the most recently used
+    cache.put("goodbye", "eng", b"c")
+
+    assert cache.get("thanks", "eng") is None
+    assert cache.get("hello", "fra") is None  # Keyed by target language too
+    assert cache.get("goodbye", "eng") == b"c"
+
+    cache.put("big", "eng", b"x" * 1024 * 1024)
+    snapshot = cache.snapshot()
+    assert snapshot["entries"] == 1 and snapshot["bytes"] == 1024 * 1024
+    assert (snapshot["hits"], snapshot["misses"], snapshot["hit_rate"]) == (2, 2, 0.5)
+
+
+def test_persists_across_restarts(tmp_path):
+    path = str(tmp_path / "speech.sqlite3")
+    cache = SpeechCache(max_entries=2, store_path=path)
+    for text in ("one", "two", "three"):
+        cache.put(text, "eng", text.encode())
+    cache.get("two", "eng")
+    cache.close()
+
+    restarted = SpeechCache(max_entries=1, store_path=path)
+
+    # "one" was evicted before the restart; of the rest only the most recently used fits
+    assert restarted.get("two", "eng") == b"two"
+    assert restarted.snapshot()["entries"] == 1
+    restarted.close()
+    assert SpeechCache(max_entries=2, store_path=path).get("three", "eng") is None
+
+
+def test_merge_adds_up_replicas():
+    first, second = SpeechCache(), SpeechCache()
+    first.put("hello", "eng", b"ab")
+    first.get("hello", "eng")
+    second.get("hello", "eng")
+
+    merged = SpeechCache.merge([first.snapshot(), second.snapshot()])
+
+    assert (merged["entries"], merged["bytes"], merged["hit_rate"]) == (1, 2, 0.5)
+
+
+def test_each_worker_process_persists_to_its_own_file(tmp_path):
+    cache_cfg = {"persist": True, "dir": str(tmp_path)}
+
+    paths = {
+        SpeechCache.from_config(cache_cfg, "facebook/seamless-m4t-v2-large", "int8", process_name=name).store_path
+        for name in ("MainProcess", "inference-worker-0", "inference-worker-1")
+    }
+
+    assert len(paths) == 3
+    assert str(tmp_path / "facebook_seamless-m4t-v2-large-int8.sqlite3") in paths
+
+
+def test_puts_are_committed_in_batches(tmp_path):
+    path = str(tmp_path / "speech.sqlite3")
+    cache = SpeechCache(store_path=path)
+    cache.put("one", "eng", b"1")
+    cache.put("two", "eng", b"2")
+
+    def stored():
+        with sqlite3.connect(path) as reader:
+            return reader.execute("SELECT COUNT(*) FROM speech").fetchone()[0]
+
+    assert stored() == 0  # Opening the store just committed, so both puts wait for the interval
+    cache.close()
+    assert stored() == 2
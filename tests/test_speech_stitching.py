@@ -0,0 +1,100 @@
+from types import SimpleNamespace
+
+import numpy as np
+import torch
+from transformers import SeamlessM4Tv2Config
+from transformers.models.seamless_m4t_v2.modeling_seamless_m4t_v2 import SeamlessM4Tv2CodeHifiGan
+from src.core.speech_stitching import TARGET_PEAK, SpeechStitcher
+from src.core.translator_engine import TranslatorEngine
+
+
+def tiny_vocoder():
+    """A randomly initialized unit vocoder with SeamlessM4Tv2's layout and upsampling (320 samples per frame)."""
+    config = SeamlessM4Tv2Config(
+        unit_hifi_gan_vocab_size=100,
+        unit_embed_dim=32,
+        lang_embed_dim=8,
+        spkr_embed_dim=8,
+        vocoder_num_langs=1,
+        vocoder_num_spkrs=1,
+        upsample_initial_channel=32,
+        var_pred_dropout=0.0,
+        t2u_pad_token_id=0,
+    )
+    torch.manual_seed(0)
+    vocoder = SeamlessM4Tv2CodeHifiGan(config).eval()
+    with torch.no_grad():
+        # Spread the predicted durations over several frames per unit, as in real speech
+        vocoder.dur_predictor.proj.weight.mul_(8.0)
+        vocoder.dur_predictor.proj.bias.fill_(1.0)
+    return vocoder, config
+
+
+def make_engine(vocoder, config, context_units):
+    engine = TranslatorEngine.__new__(TranslatorEngine)
+    engine.device = torch.device("cpu")
+    engine.model = SimpleNamespace(
+        vocoder=vocoder, config=config, generation_config=SimpleNamespace(vocoder_lang_code_to_id={"eng": 0})
+    )
+    engine.vocoder_chunk_units = 25
+    engine.vocoder_context_units = context_units
+    engine.normalize_window_samples = 10**9  # Compare waveforms, not gains
+    return engine
+
+
+def test_incremental_vocoding_matches_one_shot():
+    vocoder, config = tiny_vocoder()
+    unit_ids = torch.randint(1, 100, (200,))
+    engine = make_engine(vocoder, config, context_units=6)
+    with torch.no_grad():
+        one_shot = engine._vocode(unit_ids.unsqueeze(0), "eng")[0].numpy().reshape(-1)
+        incremental = np.concatenate(list(engine._vocode_incrementally(unit_ids, "eng")))
+        unstitched = np.concatenate(
+            list(make_engine(vocoder, config, context_units=0)._vocode_incrementally(unit_ids, "eng"))
+        )
+
+    def relative_error(stream):
+        length = min(len(stream), len(one_shot))
+        reference = one_shot[:length] * (TARGET_PEAK / np.max(np.abs(one_shot)))
+        return np.sqrt(np.mean((stream[:length] - reference) ** 2) / np.mean(reference**2))
+
+    assert len(incremental) == len(one_shot)
+    assert relative_error(incremental) < 0.02
+    # Without context every join is audible: the comparison is meaningful
+    assert relative_error(unstitched) > 0.1
+
+
+def stitch(signal, stitcher, error=0):
+    """Feeds `signal` in windows of 4000 samples with 800 of context on each side, like `_vocode_incrementally`."""
+    pieces = []
+    for start in range(0, len(signal), 4000):
+        first, end = max(0, start - 800), min(len(signal), start + 4000)
+        window = signal[first : min(len(signal), end + 800)]
+        final = end == len(signal)
+        # Estimated boundaries are off by `error`, alternately early and late
+        shift = error if start % 8000 else -error
+        content_start = start - first + (shift if start else 0)
+        content_end = end - first + (0 if final else shift)
+        pieces.append(stitcher.add(window, content_start, content_end, final))
+    return np.concatenate(pieces)
+
+
+def test_seams_are_found_despite_misestimated_boundaries():
+    signal = np.random.default_rng(0).uniform(-0.5, 0.5, 20000).astype(np.float32)
+    signal[100] = 1.0  # The first piece holds the peak, so one gain applies throughout
+
+    stream = stitch(signal, SpeechStitcher(normalize_window_samples=10**9), error=300)
+
+    assert len(stream) == len(signal)
+    np.testing.assert_allclose(stream, signal * TARGET_PEAK, atol=1e-5)
+
+
+def test_gain_recovers_once_a_loud_passage_leaves_the_window():
+    signal = np.full(20000, 0.1, dtype=np.float32)
+    signal[:1000] = 1.0
+
+    stream = stitch(signal, SpeechStitcher(normalize_window_samples=6000))
+
+    # While the loud start is within the window, the rest stays at its level; later it is raised
+    assert np.max(np.abs(stream[4000:6000])) < 0.1
+    assert np.max(np.abs(stream[16000:])) > 0.85
@@ -0,0 +1,43 @@
+import pytest
+from fastapi.testclient import TestClient
+from transformers import SeamlessM4Tv2ForSpeechToSpeech, SeamlessM4Tv2ForSpeechToText
+from src.api import main
+from src.api.startup import PHASE_READY, PHASE_WARMUP, StartupReport
+from src.core.translator_engine import check_transformers_internals
+
+
+def test_report_records_phases_and_only_the_first_request():
+    report = StartupReport()
+    assert not report.ready
+
+    report.enter(PHASE_WARMUP)
+    report.enter(PHASE_READY)
+    report.record_request(1.5)
+    report.record_request(0.2)
+    snapshot = report.snapshot()
+
+    assert report.ready
+    assert snapshot["cold_start_s"] >= snapshot["model_load_s"] >= 0
+    assert snapshot["warmup_s"] >= 0
+    assert snapshot["first_request_s"] == 1.5
+
+
+def test_not_ready_while_models_load():
+    # Without entering the client's context the lifespan (model loading) never runs
+    client = TestClient(main.app)
+
+    assert client.get("/health/live").status_code == 200
+    response = client.get("/health/ready")
+    assert response.status_code == 503
+    assert response.json()["ready"] is False
+    assert client.get("/status").json()["status"] == "starting"
+
+
+def test_installed_transformers_has_the_internals_the_engine_calls():
+    check_transformers_internals(SeamlessM4Tv2ForSpeechToSpeech, speech_enabled=True)
+    check_transformers_internals(SeamlessM4Tv2ForSpeechToText, speech_enabled=False)
+
+
+def test_missing_transformers_internals_fail_with_a_clear_error():
+    with pytest.raises(RuntimeError, match="object._indices_to_subwords"):
+        check_transformers_internals(object, speech_enabled=True)
@@ -0,0 +1,34 @@
+import numpy as np
+from src.api.stream_protocol import (
+    FRAME_AUDIO,
+    FRAME_END,
+    decode_frame,
+    decode_timed_frame,
+    encode_audio_frames,
+    encode_end_frame,
+    encode_timed_frame,
+)
+
+
+def test_audio_frames_round_trip_in_order():
+    samples = np.random.default_rng(0).standard_normal(4000).astype(np.float32)
+
+    frames = encode_audio_frames(samples, utterance_id=7, first_sequence=3, frame_samples=1600)
+    decoded = [decode_frame(frame) for frame in frames]
+
+    assert [len(chunk) for _, _, _, chunk in decoded] == [1600, 1600, 800]
+    assert [(frame_type, sequence, utterance_id) for frame_type, sequence, utterance_id, _ in decoded] == [
+        (FRAME_AUDIO, 3, 7),
+        (FRAME_AUDIO, 4, 7),
+        (FRAME_AUDIO, 5, 7),
+    ]
+    np.testing.assert_array_equal(np.concatenate([chunk for *_, chunk in decoded]), samples)
+
+    frame_type, sequence, utterance_id, chunk = decode_frame(encode_end_frame(7, 6))
+    assert (frame_type, sequence, utterance_id, len(chunk)) == (FRAME_END, 6, 7, 0)
+
+
+def test_timed_frame_round_trip():
+    message = encode_timed_frame(FRAME_AUDIO, 2, 70000, 9, 123456, b"\x01\x02")
+
+    assert decode_timed_frame(message) == (FRAME_AUDIO, 2, 70000 & 0xFFFF, 9, 123456, b"\x01\x02")
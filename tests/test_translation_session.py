@@ -0,0 +1,143 @@
+import asyncio
+import json
+
+import numpy as np
+from src.api.broadcast import RoomRegistry
+from src.api.translation_session import SessionOptions, TranslationSession, parse_target_languages
+from src.api.wire_session import WireMonitor
+from src.core.utterance_queue import UtteranceQueueMonitor
+
+
+class FakeVAD:
+    def set_speculative(self, enabled):
+        self.speculative = enabled
+
+
+class FakeVADPool:
+    def __init__(self):
+        self.released = []
+
+    def acquire(self):
+        return FakeVAD()
+
+    def release(self, vad):
+        self.released.append(vad)
+
+
+class FakeVADEngine:
+    def register(self, vad, on_sentence, on_draft):
+        self.on_sentence, self.on_draft = on_sentence, on_draft
+
+    async def unregister(self, vad):
+        pass
+
+
+class FakeScheduler:
+    async def encode(self, audio):
+        return "encoded"
+
+    async def translate_text_fanout(self, audio, languages, encoded):
+        return {lang: f"text in {lang}" for lang in languages}
+
+
+class FakeAdmission:
+    def __init__(self):
+        self.released = []
+
+    def update_shedding(self, admission):
+        pass
+
+    def speech_allowed(self, admission):
+        return True
+
+    def release(self, admission):
+        self.released.append(admission)
+
+
+class FakeTranslator:
+    def supports_speech(self, tgt_lang):
+        return tgt_lang != "arb"  # Text output only
+
+
+class FakeStartupReport:
+    def record_request(self, elapsed):
+        pass
+
+
+class FakeWebSocket:
+    """Speaks one sentence through the VAD engine's callback, then disconnects once it is answered."""
+
+    def __init__(self, vad_engine):
+        self.vad_engine = vad_engine
+        self.sent = []
+
+    async def receive(self):
+        self.vad_engine.on_sentence(np.zeros(16000, dtype=np.float32))
+        while not self.sent:
+            await asyncio.sleep(0.01)
+        return {"type": "websocket.disconnect"}
+
+    async def send_text(self, text):
+        self.sent.append(text)
+
+
+def make_components():
+    return {
+        "translator": FakeTranslator(),
+        "scheduler": FakeScheduler(),
+        "debug_recorder": None,
+        "vad_pool": FakeVADPool(),
+        "vad_engine": FakeVADEngine(),
+        "wire": WireMonitor(),
+        "queues": UtteranceQueueMonitor(),
+        "rooms": RoomRegistry(),
+        "admission": FakeAdmission(),
+        "startup_report": FakeStartupReport(),
+    }
+
+
+def test_target_languages_are_unique_and_ordered():
+    assert parse_target_languages(" fra,eng,fra ") == ["fra", "eng"]
+
+
+def test_sentence_reuses_only_the_encoding_of_its_own_draft():
+    async def main():
+        components = make_components()
+        session = TranslationSession(None, SessionOptions(), components)
+        draft, sentence = np.zeros(10, dtype=np.float32), np.ones(10, dtype=np.float32)
+        session.on_draft(draft)
+        session.on_sentence(sentence)  # Speech resumed after the draft, so the sentence is longer
+        session.on_draft(sentence)
+        session.on_sentence(sentence)
+        first, second = await session.queue.get(), await session.queue.get()
+        return first.encoding, await second.encoding
+
+    assert asyncio.run(main()) == (None, "encoded")
+
+
+def test_text_session_answers_each_language_and_releases_everything_on_disconnect():
+    async def main():
+        components = make_components()
+        websocket = FakeWebSocket(components["vad_engine"])
+        session = TranslationSession(websocket, SessionOptions(tgt_lang="eng,fra", output_mode="text"), components)
+        await asyncio.wait_for(session.run("admission"), timeout=5)
+        return websocket.sent, components
+
+    sent, components = asyncio.run(main())
+
+    messages = [json.loads(message) for message in sent]
+    assert [(message["utterance_id"], message["tgt_lang"]) for message in messages] == [(1, "eng"), (2, "fra")]
+    assert messages[1]["text"] == "text in fra"
+    assert len(components["vad_pool"].released) == 1
+    assert components["admission"].released == ["admission"]
+    assert components["queues"].snapshot()["sessions"] == 0
+
+
+def test_room_languages_without_speech_are_only_translated_to_text():
+    components = make_components()
+    session = TranslationSession(None, SessionOptions(tgt_lang="eng", room="hall"), components)
+    for lang in ("fra", "arb"):
+        session.room.subscribe(None, lang)
+
+    assert session.utterance_targets(speech=True) == ["eng", "fra"]
+    assert session.utterance_targets(speech=False) == ["eng", "fra", "arb"]
@@ -0,0 +1,18 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from src.core.translator_engine import TranslatorEngine
+
+
+def test_language_without_speech_output_is_rejected_before_translating():
+    engine = TranslatorEngine.__new__(TranslatorEngine)
+    engine.model_name = "seamless"
+    engine.speech_enabled = True
+    engine.speech_languages = frozenset({"eng", "fra"})
+    engine.model = SimpleNamespace()  # Any model call would fail with an AttributeError
+
+    assert engine.supports_speech("fra")
+    assert not engine.supports_speech("arb")
+    with pytest.raises(ValueError, match="arb"):
+        engine.translate_batch([np.zeros(16000, dtype=np.float32)], "arb")
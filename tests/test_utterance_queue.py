@@ -0,0 +1,81 @@
+import asyncio
+import numpy as np
+import pytest
+from src.core.utterance_queue import UtteranceQueue, UtteranceQueueMonitor
+
+
+def utterance(seconds):
+    return np.zeros(int(16000 * seconds), dtype=np.float32)
+
+
+def make_queue(policy, max_size=2, max_latency_ms=10000, max_coalesced_ms=10000):
+    return UtteranceQueue(max_size, policy, max_latency_ms, max_coalesced_ms)
+
+
+def test_block_policy_waits_for_space_until_reader_catches_up():
+    async def main():
+        queue = make_queue("block")
+        queue.put_nowait(utterance(1))
+        queue.put_nowait(utterance(1))
+
+        waiter = asyncio.ensure_future(queue.wait_for_space())
+        await asyncio.sleep(0.01)
+        blocked = not waiter.done()
+        await queue.get()
+        await asyncio.wait_for(waiter, timeout=1)
+        return blocked, queue.dropped
+
+    assert asyncio.run(main()) == (True, 0)
+
+
+def test_coalesce_policy_merges_waiting_utterances_up_to_the_cap():
+    async def main():
+        queue = make_queue("coalesce", max_size=8, max_coalesced_ms=2500)
+        encoding = asyncio.get_running_loop().create_future()
+        queue.put_nowait(utterance(1), encoding)
+        queue.put_nowait(utterance(1))
+        queue.put_nowait(utterance(1))
+        first, second = await queue.get(), await queue.get()
+        return len(first.audio), first.encoding, encoding.cancelled(), len(second.audio), queue.coalesced
+
+    merged_length, merged_encoding, cancelled, rest_length, coalesced = asyncio.run(main())
+
+    assert merged_length == 32000 and rest_length == 16000
+    # A speculative encoding doesn't describe the merged audio
+    assert merged_encoding is None and cancelled
+    assert coalesced == 1
+
+
+def test_drop_stale_policy_skips_utterances_over_the_latency_budget():
+    async def main():
+        queue = make_queue("drop_stale", max_size=2, max_latency_ms=20)
+        queue.put_nowait(utterance(1))
+        await asyncio.sleep(0.05)
+        queue.put_nowait(utterance(2))
+        fresh = await queue.get()
+        # When full, the oldest waiting utterance makes room
+        for seconds in (3, 4, 5):
+            queue.put_nowait(utterance(seconds))
+        return len(fresh.audio), queue.dropped, [len(item.audio) for item in queue._items]
+
+    assert asyncio.run(main()) == (32000, 2, [64000, 80000])
+
+
+def test_close_discards_backlog_and_wakes_reader():
+    async def main():
+        monitor = UtteranceQueueMonitor()
+        queue = monitor.create("block")
+        reader = asyncio.ensure_future(queue.get())
+        await asyncio.sleep(0)
+        monitor.close(queue)
+        return await reader, monitor.snapshot()
+
+    item, snapshot = asyncio.run(main())
+
+    assert item is None
+    assert snapshot["sessions"] == 0
+
+
+def test_monitor_rejects_unknown_policy():
+    with pytest.raises(ValueError):
+        UtteranceQueueMonitor().create("fifo")
@@ -1,6 +1,27 @@
 import numpy as np
+import pytest
 from unittest.mock import MagicMock
-from src.core.vad_processor import VADProcessor
+from src.core.vad_processor import SileroVADModel, TorchVADBackend, VADProcessor, VADSessionPool, VADStream
+
+
+class FakeVADModel:
+    """Stands in for the Silero weights where only session bookkeeping is tested (no download)."""
+
+    SAMPLE_RATE = 16000
+    STATE_SHAPE = (2, 1, 128)
+    context_size = 64
+    restart_after_windows = 4
+    priming_windows = 2
+    windows_skipped = 0
+
+    def create_stream(self):
+        return VADStream(self)
+
+    def infer(self, streams, windows):
+        return np.zeros(len(streams), dtype=np.float32)
+
+    evaluate = SileroVADModel.evaluate
+    _resume = SileroVADModel._resume
 
 
 def test_vad_logic_with_mock():
@@ -53,7 +74,7 @@ def test_vad_logic_with_mock():
 
 def test_set_min_silence():
     vad = VADProcessor()
-    
+
     # Test valid update
     vad.set_min_silence(1000)
     assert vad.min_silence_ms == 1000
@@ -67,6 +88,105 @@ def test_set_min_silence():
     assert vad.min_silence_ms == 1000  # Should remain unchanged
 
 
+def test_session_pool_isolates_and_recycles_sessions():
+    pool = VADSessionPool(FakeVADModel())
+    session_a = pool.acquire()
+    session_b = pool.acquire()
+
+    # Sessions share the weights but not their stream state
+    assert session_a.model is session_b.model
+    assert session_a.stream is not session_b.stream
+
+    session_a.process(np.zeros(700, dtype=np.float32).tobytes())
+    session_a.set_min_silence(1000)
+    assert len(session_a.processing_buffer) == 700 - 512
+    assert len(session_b.processing_buffer) == 0
+
+    # A released session comes back clean, with the configured sensitivity restored
+    pool.release(session_a)
+    reused = pool.acquire()
+    assert reused is session_a
+    assert len(reused.processing_buffer) == 0
+    assert reused.min_silence_ms == reused.default_min_silence_ms
+
+
+def test_onnx_backend_matches_torch_backend():
+    rng = np.random.default_rng(0)
+    t = np.arange(20 * 512) / 16000
+    # Silence, a voiced burst, silence again
+    audio = (rng.standard_normal(len(t)) * 0.002).astype(np.float32)
+    audio[5 * 512 : 15 * 512] += (0.3 * np.sin(2 * np.pi * 160 * t[: 10 * 512])).astype(np.float32)
+    windows = audio.reshape(20, 512)
+
+    probs = {}
+    for backend in ("torch", "onnx"):
+        model = SileroVADModel("onnx")
+        if backend == "torch":
+            model.backend = TorchVADBackend()
+        # Two streams in one batch: the second one starts five windows later
+        streams = [model.create_stream(), model.create_stream()]
+        probs[backend] = np.array(
+            [model.infer(streams, np.stack([windows[i], windows[max(0, i - 5)]])) for i in range(20)]
+        )
+        assert model.snapshot()["backend"] == backend
+
+    np.testing.assert_allclose(probs["onnx"], probs["torch"], atol=1e-4)
+
+
+def vowel(seconds, f0, formants):
+    """A voiced sound Silero takes for speech: harmonics of `f0` shaped by (frequency, width) formants, in syllables."""
+    t = np.arange(int(seconds * 16000)) / 16000
+    phase = 2 * np.pi * np.cumsum(f0 * (1 + 0.08 * np.sin(2 * np.pi * 2.5 * t))) / 16000
+    gains = [sum(np.exp(-(((k * f0 - freq) / width) ** 2)) for freq, width in formants) + 0.05 for k in range(1, 30)]
+    signal = sum(gain * np.sin(k * phase) / np.sqrt(k) for k, gain in enumerate(gains, start=1))
+    signal *= 0.5 + 0.5 * np.abs(np.sin(2 * np.pi * 3 * t))
+    return 0.3 * signal / np.max(np.abs(signal))
+
+
+def test_pre_gate_detects_speech_starts_like_the_ungated_network():
+    # "oo", three seconds of silence, "ee", all over quiet room noise (skipped by the pre-gate outside speech)
+    audio = np.concatenate(
+        [
+            np.zeros(8000),
+            vowel(1.0, 130, [(320, 100), (800, 150), (2400, 300)]),
+            np.zeros(48000),
+            vowel(1.0, 200, [(300, 100), (2300, 250), (3000, 300)]),
+            np.zeros(16000),
+        ]
+    )
+    audio = (audio + np.random.default_rng(0).standard_normal(len(audio)) * 0.002).astype(np.float32)
+
+    starts = {}
+    for gated in (False, True):
+        session = VADProcessor(SileroVADModel("onnx"))
+        session.gate.enabled = gated
+        session.append_audio(audio)
+        starts[gated] = []
+        for index in range(len(audio) // 512):
+            recording = session.is_recording
+            session.step()
+            if session.is_recording and not recording:
+                starts[gated].append(index)
+
+    assert len(starts[False]) == 2
+    assert starts[True] == starts[False]
+    # Most of the silence did skip the network
+    assert session.model.windows_skipped > 48000 // 512
+
+
+def test_torch_backend_refuses_a_model_without_the_inner_network():
+    with pytest.raises(RuntimeError, match="silero-vad"):
+        TorchVADBackend(object())
+
+
+def test_pre_gate_is_off_unless_configured():
+    assert not VADProcessor(FakeVADModel()).gate.enabled
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        SileroVADModel("tensorrt")
+
+
 if __name__ == "__main__":
     test_vad_logic_with_mock()
-
@@ -0,0 +1,179 @@
+import asyncio
+import numpy as np
+from src.core.vad_engine import VADEngine
+from src.core.vad_processor import SileroVADModel, SilenceGate, VADProcessor, VADStream, WINDOW_SIZE_SAMPLES
+
+
+class FakeVADModel:
+    """Uses the mean of each window as its speech probability and counts forward passes."""
+
+    SAMPLE_RATE = 16000
+    STATE_SHAPE = (2, 1, 128)
+    context_size = 64
+    restart_after_windows = 4
+    priming_windows = 2
+
+    def __init__(self):
+        self.batch_sizes = []
+        self.windows_skipped = 0
+
+    def create_stream(self):
+        return VADStream(self)
+
+    def infer(self, streams, windows):
+        self.batch_sizes.append(len(streams))
+        return windows.mean(axis=1)
+
+    evaluate = SileroVADModel.evaluate
+    _resume = SileroVADModel._resume
+
+
+def utterance(speech_windows, silence_windows):
+    speech = np.ones(speech_windows * WINDOW_SIZE_SAMPLES, dtype=np.float32)
+    silence = np.zeros(silence_windows * WINDOW_SIZE_SAMPLES, dtype=np.float32)
+    return np.concatenate([speech, silence])
+
+
+def make_session(model):
+    session = VADProcessor(model)
+    session.padding_ms = 0
+    return session
+
+
+def test_batched_run_matches_per_stream_path():
+    model = FakeVADModel()
+    audio_per_stream = [utterance(speech_windows, 20) for speech_windows in (3, 5, 8)]
+
+    reference = []
+    for audio in audio_per_stream:
+        session = make_session(model)
+        reference.append(session.process(audio.tobytes()))
+
+    model.batch_sizes.clear()
+    engine = VADEngine(model)
+    sessions = [make_session(model) for _ in audio_per_stream]
+    for session, audio in zip(sessions, audio_per_stream):
+        # Every window takes part in a forward pass (see the pre-gate test below)
+        session.gate.enabled = False
+        session.append_audio(audio.tobytes())
+    sentences = engine.run(sessions)
+
+    for session, expected in zip(sessions, reference):
+        assert len(sentences[session]) == 1
+        np.testing.assert_array_equal(sentences[session][0], expected)
+    # Streams share forward passes: one pass per window of the longest stream
+    assert len(model.batch_sizes) == max(len(audio) for audio in audio_per_stream) // WINDOW_SIZE_SAMPLES
+    assert sum(model.batch_sizes) == sum(len(audio) for audio in audio_per_stream) // WINDOW_SIZE_SAMPLES
+
+
+def test_worker_delivers_sentences_per_session():
+    model = FakeVADModel()
+    engine = VADEngine(model)
+    sessions = [make_session(model) for _ in range(4)]
+    audio = utterance(3, 20)
+    delivered = {session: [] for session in sessions}
+
+    async def main():
+        for session in sessions:
+            engine.register(session, delivered[session].append)
+        for start in range(0, len(audio), 1365):
+            for session in sessions:
+                await engine.submit(session, audio[start : start + 1365].tobytes())
+        while any(len(sentences) == 0 for sentences in delivered.values()):
+            await asyncio.sleep(0.01)
+        for session in sessions:
+            await engine.unregister(session)
+
+    asyncio.run(main())
+    engine.close()
+
+    expected = make_session(model).process(audio.tobytes())
+    for sentences in delivered.values():
+        assert len(sentences) == 1
+        np.testing.assert_array_equal(sentences[0], expected)
+
+
+def test_speculative_draft_becomes_the_sentence_unless_speech_resumes():
+    model = FakeVADModel()
+    engine = VADEngine(model)
+    session = make_session(model)
+    session.set_speculative(True)
+    # A short pause (5 windows, below min silence) inside the sentence, then the real end
+    first_part = utterance(5, 5)
+    second_part = utterance(3, 20)
+
+    session.append_audio(first_part.tobytes())
+    assert engine.run([session]) == {}
+    paused_draft = session.pop_draft()
+    assert len(paused_draft) == 6 * WINDOW_SIZE_SAMPLES  # Speech plus the first silent window
+
+    session.append_audio(second_part.tobytes())
+    sentences = engine.run([session])[session]
+    final_draft = session.pop_draft()
+
+    # Speech resumed after the first draft, so only the second one is the sentence
+    assert len(sentences) == 1
+    assert sentences[0] is final_draft
+    reference = make_session(model).process(np.concatenate([first_part, second_part]).tobytes())
+    assert len(final_draft) == 14 * WINDOW_SIZE_SAMPLES
+    np.testing.assert_array_equal(final_draft, reference[: len(final_draft)])
+    assert not reference[len(final_draft) :].any()  # Only trailing silence is dropped
+
+
+def test_long_speech_is_split_at_the_quietest_window():
+    model = FakeVADModel()
+    audio = utterance(100, 20)
+    # Two softer windows (still speech) are the natural split points
+    for quiet_window in (35, 75):
+        audio[quiet_window * WINDOW_SIZE_SAMPLES : (quiet_window + 1) * WINDOW_SIZE_SAMPLES] = 0.6
+
+    reference = make_session(model)
+    reference.max_segment_samples = 0
+    expected = reference.process(audio.tobytes())
+
+    session = make_session(model)
+    session.max_segment_samples = 40 * WINDOW_SIZE_SAMPLES
+    session.split_search_samples = 10 * WINDOW_SIZE_SAMPLES
+    session.append_audio(audio.tobytes())
+    segments = VADEngine(model).run([session])[session]
+
+    assert [len(segment) // WINDOW_SIZE_SAMPLES for segment in segments[:2]] == [36, 40]
+    assert all(len(segment) <= session.max_segment_samples for segment in segments[:2])
+    np.testing.assert_array_equal(np.concatenate(segments), expected)
+
+
+def test_silence_gate_flags_quiet_noise_but_not_quiet_voice():
+    gate = SilenceGate(silence_dbfs=-60, noise_dbfs=-50, noise_zcr=0.3)
+    t = np.arange(4 * WINDOW_SIZE_SAMPLES) / 16000
+    noise = np.random.default_rng(0).standard_normal(len(t)).astype(np.float32)
+    voice = np.sin(2 * np.pi * 150 * t).astype(np.float32)
+
+    assert gate.classify(np.zeros(len(t), dtype=np.float32)).all()
+    assert gate.classify(noise * 0.002).all()  # -54 dBFS room noise
+    assert not gate.classify(noise * 0.05).any()  # Loud noise is left to the network
+    assert not gate.classify(voice * 0.005).any()  # -49 dBFS, but voiced: few zero crossings
+
+
+def test_pre_gate_skips_the_network_outside_speech_only():
+    audio = np.concatenate([np.zeros(10 * WINDOW_SIZE_SAMPLES, dtype=np.float32), utterance(5, 20), utterance(3, 30)])
+    audio += np.random.default_rng(0).standard_normal(len(audio)).astype(np.float32) * 0.002
+
+    results = {}
+    for gated in (False, True):
+        model = FakeVADModel()
+        session = make_session(model)
+        session.gate.enabled = gated
+        session.append_audio(audio.tobytes())
+        results[gated] = (VADEngine(model).run([session])[session], model)
+
+    sentences, gated_model = results[True]
+    # Same sentences, i.e. speech started and ended on the same windows
+    assert len(sentences) == 2
+    for sentence, expected in zip(sentences, results[False][0]):
+        np.testing.assert_array_equal(sentence, expected)
+    # Leading silence and the silence after each detected end skip the network, the pauses inside speech don't.
+    # The last few skipped windows before each utterance prime the restarted state.
+    total_windows = len(audio) // WINDOW_SIZE_SAMPLES
+    assert gated_model.windows_skipped >= 10 + (30 - 16) - 2 * gated_model.priming_windows
+    assert sum(gated_model.batch_sizes) + gated_model.windows_skipped == total_windows
+    assert results[False][1].windows_skipped == 0
@@ -0,0 +1,77 @@
+import asyncio
+import io
+
+import numpy as np
+import soundfile as sf
+from src.api.audio_formats import AUDIO_FORMATS, available_formats
+from src.api.stream_protocol import FRAME_AUDIO, FRAME_END, decode_timed_frame, encode_timed_frame
+from src.api.wire_session import WireSession
+
+
+def speech(seconds=1.0):
+    t = np.arange(int(16000 * seconds)) / 16000
+    return (0.3 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+
+def wav(samples):
+    buffer = io.BytesIO()
+    sf.write(buffer, samples, 16000, format="WAV")
+    return buffer.getvalue()
+
+
+def test_formats_round_trip():
+    samples = speech()
+    for name in available_formats():
+        audio_format = AUDIO_FORMATS[name]
+        decoded = audio_format.decode(audio_format.encode(samples))
+
+        assert len(decoded) == len(samples), name
+        # Lossy codecs only approximate the waveform; compare energy
+        assert abs(np.sqrt(np.mean(decoded**2)) - np.sqrt(np.mean(samples**2))) < 0.05, name
+
+
+def test_negotiation_rejects_unknown_formats():
+    wire = WireSession()
+
+    ack = wire.negotiate("pcm16", "mp9")
+
+    assert ack["type"] == "config_ack" and "mp9" in ack["error"]
+    assert (ack["input_format"], ack["output_format"]) == ("float32", "wav")
+    assert wire.negotiate("pcm16", "flac")["output_format"] == "flac"
+
+
+def test_receive_decodes_timed_frames_and_counts_losses():
+    wire = WireSession()
+    wire.negotiate(input_format="pcm16")
+    samples = speech(0.1)
+    pcm16 = AUDIO_FORMATS["pcm16"]
+
+    received = [wire.receive(encode_timed_frame(FRAME_AUDIO, pcm16.code, 0, 0, 0, pcm16.encode(samples)))]
+    received.append(wire.receive(encode_timed_frame(FRAME_AUDIO, pcm16.code, 3, 0, 100, pcm16.encode(samples))))
+
+    payload, decode = received[0]
+    np.testing.assert_allclose(decode(payload), samples, atol=1e-4)
+    assert wire.lost_frames == 2  # Sequence numbers 1 and 2 never arrived
+    assert wire.snapshot()["bytes_in"] == 2 * (12 + 2 * len(samples))
+
+
+def test_raw_float32_stays_unframed():
+    wire = WireSession()
+    chunk = speech(0.1).tobytes()
+
+    assert wire.receive(chunk) == (chunk, None)
+    assert asyncio.run(wire.utterance_messages(b"RIFF", 1)) == [b"RIFF"]
+
+
+def test_utterances_are_reencoded_off_the_loop():
+    wire = WireSession()
+    wire.negotiate(output_format="opus")
+    wav_bytes = wav(speech(2.0))
+
+    messages = asyncio.run(wire.utterance_messages(wav_bytes, 4))
+    frames = [decode_timed_frame(message) for message in messages]
+
+    assert [(frame[0], frame[2], frame[3]) for frame in frames] == [(FRAME_AUDIO, 0, 4), (FRAME_END, 1, 4)]
+    assert len(frames[0][5]) * 8 < len(wav_bytes)
+    wire.sent(messages[0])
+    assert wire.bytes_out == len(messages[0])